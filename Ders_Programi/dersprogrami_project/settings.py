@@ -133,3 +133,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom Admin Interface Settings
 ADMIN_SITE_HEADER = "Kocaeli Sağlık ve Teknoloji Üniversitesi"
+
+# Admin panelinden tetiklenen ders programı oluşturma için süre bütçesi (saniye).
+# Bütçe dolarsa en iyi kısmi program ve yerleşmeyen dersler kaydedilir. None: sınırsız.
+SCHEDULE_GENERATION_TIME_LIMIT = 60
+
+# generate_schedule komutunun --report verilmediğinde çalıştırma raporlarını yazdığı dizin
+RUN_REPORT_DIR = BASE_DIR / 'run_reports'
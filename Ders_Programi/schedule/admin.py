@@ -4,7 +4,7 @@ from django.shortcuts import redirect # redirect import edelim
 from django.utils.html import format_html # Buton için HTML formatlama
 from .models import (
     Bolum, OgretimUyesi, Ogrenci, Derslik, Ders, 
-    OgretimUyesiKisiti, DersProgramiSlotu, GlobalKisiti
+    OgretimUyesiKisiti, DersProgramiSlotu, GlobalKisiti, GenerationJob
 )
 from .views import import_courses_view # View'ı import edelim (gerçi doğrudan URL kullanacağız)
 from .forms import GlobalKisitiAdminForm # Global formunu import et
@@ -102,8 +102,24 @@ class DersProgramiSlotuAdmin(admin.ModelAdmin):
         view_schedule_url = reverse('schedule:view_schedule')
         extra_context['show_view_schedule_button'] = True
         extra_context['view_schedule_url'] = view_schedule_url
+        # Son program oluşturma işi: sayfa bitene kadar durumunu yoklar
+        son_is = GenerationJob.objects.first()
+        if son_is is not None:
+            extra_context['son_is'] = son_is
+            extra_context['son_is_status_url'] = reverse('schedule:generation_job_status', args=[son_is.id])
+            extra_context['son_is_events_url'] = reverse('schedule:generation_job_events', args=[son_is.id])
         return super().changelist_view(request, extra_context=extra_context)
 
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'durum', 'asama', 'yerlesen_ders', 'toplam_ders', 'node_count', 'olusturulma', 'bitis')
+    list_filter = ('durum',)
+    readonly_fields = ('durum', 'asama', 'ayarlar', 'node_count', 'derinlik', 'yerlestirme_hizi', 'yerlesen_ders',
+                       'toplam_ders', 'yukleme_istatistikleri', 'mesaj', 'rapor', 'olusturulma', 'baslangic', 'bitis')
+
+    def has_add_permission(self, request):
+        return False # İşler yalnızca program oluşturma butonundan eklenir
+
 @admin.register(GlobalKisiti)
 class GlobalKisitiAdmin(admin.ModelAdmin):
     form = GlobalKisitiAdminForm # Özel formu kullan
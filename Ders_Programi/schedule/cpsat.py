@@ -0,0 +1,148 @@
+# schedule/cpsat.py
+
+# OR-Tools CP-SAT motoru: BacktrackingScheduler ile aynı modeli (sınıf/derslik/hoca çakışmaları,
+# LAB ve kapasite kuralları, genel ve hoca özel kısıtları, blokların ardışık koşuları ve aynı dersin
+# bloklarının farklı günlerde olması) bir kısıt programı olarak çözer.
+# Veri yükleme, aday alanları, sabit yerleşimler ve kayıt BacktrackingScheduler'dan devralınır;
+# yalnızca arama (search) değişir.
+# ortools isteğe bağlı bir bağımlılıktır ve yalnızca bu motor çalıştırıldığında import edilir.
+
+from collections import defaultdict
+
+from .scheduler import BacktrackingScheduler, RUN_MASKS, TIME_SLOTS, mask_slots
+
+class CpSatScheduler(BacktrackingScheduler):
+    """Aynı problemi CP-SAT ile çok iş parçacıklı çözen motor.
+
+    Bütçe (time_limit) yoksa her ders tam bir kez yerleşmek zorundadır; çözücü çözüm bulur ya da
+    çözümsüzlüğü kanıtlar. Bütçe verilirse yerleşen ders sayısı en büyüklenir ve süre dolduğunda
+    en iyi (kısmi) atama döner.
+    """
+
+    def __init__(self, threads=None, **ayarlar):
+        super().__init__(**ayarlar)
+        self.threads = threads # None: OR-Tools tüm çekirdekleri kullanır
+
+    def subproblem_settings(self):
+        return dict(super().subproblem_settings(), threads=self.threads)
+
+    def search(self):
+        """Yüklenmiş veriler (ve varsa sabit yerleşimler) üzerinde CP-SAT modelini kurar ve çözer."""
+        try:
+            from ortools.sat.python import cp_model
+        except ImportError as exc:
+            raise ImportError(
+                "CP-SAT motoru için OR-Tools kurulu olmalı (pip install ortools)."
+            ) from exc
+
+        print("CP-SAT ile ders programı oluşturuluyor...")
+        # Sabit yerleşimleri doluluk maskelerine işler ve sayaçları sıfırlar
+        self.start_search()
+
+        model = cp_model.CpModel()
+        # Değişkenler: x[ders, slot, hoca] (ders bu slotta bu hocayla) ve y[ders, slot, derslik].
+        # Her (ders, slot) için seçilen hoca sayısı seçilen derslik sayısına eşittir. slot bloğun
+        # koşusunun ilk slotudur; değişken koşunun kapladığı her slotun çakışma listesine girer.
+        hoca_degiskenleri = [] # (x, ders, slot_no, hoca)
+        derslik_degiskenleri = {} # (ders_id, slot_no) -> [(y, derslik)]
+        hoca_slotlari = defaultdict(list) # (hoca_id, slot_no) -> [x]
+        derslik_slotlari = defaultdict(list) # (derslik_id, slot_no) -> [y]
+        sinif_slotlari = defaultdict(list) # ((bolum_id, sinif), slot_no) -> [x]
+        ders_gunleri = defaultdict(list) # (ders_id, gun_no) -> [x] (aynı dersin blokları farklı günlerde)
+        aranan_dersler = []
+        tum_secimler = []
+
+        for ders in self.dersler_listesi:
+            if not self.ders_hocalari[ders.id]:
+                print(f"Uyarı: {ders} için atanabilecek hoca bulunamadı, atlanıyor.")
+                self.yerlesmeyen_dersler_rapor.append(ders)
+                continue
+            aranan_dersler.append(ders)
+            sinif_key = (ders.bolum_id, ders.sinif)
+            ipucu = self.ipuclari.get(ders.id) # Sıcak başlangıç: önceki yerleşim çözücüye ipucu olarak verilir
+            kosular = RUN_MASKS[ders.blok_saati]
+            secimler = []
+            for adaylar in self.ders_adaylari[ders.id]:
+                for slot_no, slot_hocalari in adaylar:
+                    bit = kosular[slot_no]
+                    if (self.sinif_programi.get(sinif_key, 0) | self.ders_gunleri.get(ders.ders_id, 0)) & bit:
+                        continue
+                    hocalar = [h for h in slot_hocalari if not self.hoca_programi.get(h.id, 0) & bit]
+                    derslikler = [d for d in self.ders_derslikleri[ders.id] if not self.derslik_programi.get(d.id, 0) & bit]
+                    if not hocalar or not derslikler:
+                        continue
+
+                    kapsanan = mask_slots(bit)
+                    slot_hoca = []
+                    for hoca in hocalar:
+                        x = model.NewBoolVar(f"x_{ders.id}_{slot_no}_{hoca.id}")
+                        hoca_degiskenleri.append((x, ders, slot_no, hoca))
+                        for t in kapsanan:
+                            hoca_slotlari[(hoca.id, t)].append(x)
+                        slot_hoca.append(x)
+                        if ipucu is not None and ipucu[0] == slot_no and ipucu[2] == hoca.id:
+                            model.AddHint(x, 1)
+                    slot_derslik = []
+                    for derslik in derslikler:
+                        y = model.NewBoolVar(f"y_{ders.id}_{slot_no}_{derslik.id}")
+                        for t in kapsanan:
+                            derslik_slotlari[(derslik.id, t)].append(y)
+                        slot_derslik.append((y, derslik))
+                        if ipucu is not None and ipucu[0] == slot_no and ipucu[1] == derslik.id:
+                            model.AddHint(y, 1)
+                    derslik_degiskenleri[(ders.id, slot_no)] = slot_derslik
+                    model.Add(sum(slot_hoca) == sum(y for y, _ in slot_derslik))
+                    for t in kapsanan:
+                        sinif_slotlari[(sinif_key, t)].extend(slot_hoca)
+                    ders_gunleri[(ders.ders_id, slot_no // len(TIME_SLOTS))].extend(slot_hoca)
+                    secimler.extend(slot_hoca)
+
+            if self.anytime:
+                model.AddAtMostOne(secimler)
+            else:
+                model.AddExactlyOne(secimler) # Aday yoksa model doğrudan çözümsüzdür
+            tum_secimler.extend(secimler)
+
+        # Çakışmazlık: her hoca, derslik ve sınıf bir slotta en fazla bir derste; her dersin bir günde en fazla bir bloğu
+        for gruplar in (hoca_slotlari, derslik_slotlari, sinif_slotlari, ders_gunleri):
+            for degiskenler in gruplar.values():
+                if len(degiskenler) > 1:
+                    model.AddAtMostOne(degiskenler)
+        if self.anytime:
+            model.Maximize(sum(tum_secimler))
+
+        solver = cp_model.CpSolver()
+        if self.time_limit is not None:
+            solver.parameters.max_time_in_seconds = self.time_limit
+        if self.threads:
+            solver.parameters.num_workers = self.threads
+        if self.seed is not None:
+            solver.parameters.random_seed = self.seed
+        durum = solver.Solve(model)
+        self.node_count = solver.NumBranches()
+        self.asama_sureleri['arama'] += solver.WallTime()
+        print(f"CP-SAT durumu: {solver.StatusName(durum)}, {solver.WallTime():.2f} sn, "
+              f"{solver.NumBranches()} dal, {solver.NumConflicts()} çatışma.")
+
+        if durum not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            if durum == cp_model.INFEASIBLE:
+                print("Model çözümsüz: tüm dersleri yerleştiren bir program yok (kanıtlandı).")
+            else:
+                self.butce_doldu = True
+                print("Uyarı: Süre doldu, CP-SAT çözüm bulamadı.")
+            self.yerlesmeyen_dersler_rapor.extend(aranan_dersler)
+            return False
+
+        for x, ders, slot_no, hoca in hoca_degiskenleri:
+            if solver.Value(x):
+                derslik = next(d for y, d in derslik_degiskenleri[(ders.id, slot_no)] if solver.Value(y))
+                self._place(ders, slot_no, derslik, hoca)
+        yerlesmeyenler = [d for d in aranan_dersler if d.id not in self.program_state]
+        self.yerlesmeyen_dersler_rapor.extend(yerlesmeyenler)
+        if yerlesmeyenler:
+            # Yalnızca bütçeli modda olabilir: en iyi kısmi atama kaydedilmek üzere işaretlenir
+            self.butce_doldu = durum != cp_model.OPTIMAL
+            self.kismi_cozum = True
+            print(f"En iyi kısmi çözüm: {len(aranan_dersler) - len(yerlesmeyenler)}/{len(aranan_dersler)} ders yerleşti.")
+            return False
+        return True
@@ -0,0 +1,211 @@
+# schedule/decomposition.py
+
+# Çatışma grafiği ayrıştırması: hoca ve (bölüm, sınıf) paylaşmayan dersler birbirini hiç
+# etkilemez. Bu kenarlarla oluşan bağlı bileşenler ayrı süreçlerde bağımsız olarak çözülür.
+# Derslikler bileşenler arasında paylaşılır (zayıf bağ); grafiğe kenar olarak eklenmez,
+# sonuçlar birleştirildikten sonra derslik çakışmaları onarılır.
+# Not: Bu modül üst düzeyde model import etmez; 'spawn' ile başlayan süreçler önce Django'yu kurar.
+
+import multiprocessing
+import random
+from collections import defaultdict
+
+from django.db import connections
+
+def build_components(scheduler):
+    """Veri yüklenmiş (load_data + compile_domains) scheduler için bağımsız ders bileşenlerini döner.
+
+    Aynı hocaya atanabilen veya aynı (bölüm, sınıf) grubundaki dersler aynı bileşene düşer.
+    Sonuç, büyükten küçüğe sıralı ders_id listeleridir.
+    """
+    ebeveyn = {ders.id: ders.id for ders in scheduler.dersler_listesi}
+
+    def bul(ders_id):
+        while ebeveyn[ders_id] != ders_id:
+            ebeveyn[ders_id] = ebeveyn[ebeveyn[ders_id]] # Yol kısaltma
+            ders_id = ebeveyn[ders_id]
+        return ders_id
+
+    ilk_ders = {} # ('h', hoca_id) / ('s', (bolum_id, sinif)) -> bu kaynağı kullanan ilk ders
+    for ders in scheduler.dersler_listesi:
+        anahtarlar = [('s', (ders.bolum_id, ders.sinif))]
+        anahtarlar += [('h', hoca.id) for hoca in scheduler.ders_hocalari[ders.id]]
+        for anahtar in anahtarlar:
+            diger = ilk_ders.setdefault(anahtar, ders.id)
+            kok_a, kok_b = bul(ders.id), bul(diger)
+            if kok_a != kok_b:
+                ebeveyn[kok_a] = kok_b
+
+    bilesenler = defaultdict(list)
+    for ders in scheduler.dersler_listesi:
+        bilesenler[bul(ders.id)].append(ders.id)
+    return sorted(bilesenler.values(), key=len, reverse=True)
+
+_problem = None # Havuz süreçlerinde paylaşılan derlenmiş problem örneği (bkz. _init_worker)
+
+def _init_worker(problem):
+    """Havuz süreçlerinde Django'yu kurar ('spawn' ile başlatılan süreçler için) ve problem örneğini saklar."""
+    global _problem
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    _problem = problem
+
+def _component_worker(gorev):
+    """Tek bir bileşeni kendi ders alt kümesiyle çözer ve sonucu döner."""
+    from .scheduler import BacktrackingScheduler
+
+    bilesen_no, ders_idleri, ayarlar = gorev
+    try:
+        scheduler = BacktrackingScheduler(ders_idleri=ders_idleri, problem=_problem, **ayarlar)
+        scheduler.load_data()
+        # Bileşenler aynı derslikleri paylaşır: derslik sırasını döndürerek her bileşenin
+        # farklı dersliklerden başlamasını ve birleştirmedeki çakışmaların azalmasını sağla
+        if scheduler.derslikler:
+            kayma = bilesen_no % len(scheduler.derslikler)
+            scheduler.derslikler = scheduler.derslikler[kayma:] + scheduler.derslikler[:kayma]
+        scheduler.compile_domains()
+        if scheduler.warm_start:
+            scheduler.load_hints()
+        success = scheduler.search()
+        return {
+            'bilesen': bilesen_no,
+            'success': success,
+            'node_count': scheduler.node_count,
+            'sayaclar': scheduler.counters(),
+            'kismi_cozum': scheduler.kismi_cozum,
+            'program_state': scheduler.program_state if success or scheduler.kismi_cozum else {},
+            'yerlesmeyen_ders_idleri': [d.id for d in scheduler.yerlesmeyen_dersler_rapor],
+            'ret_izi': (scheduler.ret_izi.gorulen, list(scheduler.ret_izi.kayitlar)) if scheduler.ret_izi is not None else None,
+        }
+    except Exception as e:
+        return {'bilesen': bilesen_no, 'success': False, 'error': str(e)}
+    finally:
+        connections.close_all()
+
+def _repair_rooms(scheduler, program_state):
+    """Birleştirilmiş programdaki derslik çakışmalarını aynı saatte boş uygun bir derslikle giderir.
+
+    Derslik seçeneği az olan dersler önce işlenir ve mevcut dersliklerini korur; sabit yerleşimlerin
+    derslikleri dolu sayılır.
+    Boş derslik bulunamayan derslerin id listesi döner (program_state'ten çıkarılırlar).
+    """
+    from .scheduler import RUN_INDEX, RUN_MASKS
+
+    derslik_programi = defaultdict(int)
+    for ders, slot_no, derslik, _ in scheduler.sabit_yerlesimler:
+        derslik_programi[derslik.id] |= RUN_MASKS[ders.blok_saati][slot_no]
+    catisanlar = []
+    for ders_id in sorted(program_state, key=lambda i: len(scheduler.ders_derslikleri[i])):
+        gun, saat_tuple, derslik_id, hoca_id = program_state[ders_id]
+        bit = RUN_INDEX[(gun, saat_tuple)][1] # Bloğun koşusunun tüm saatleri
+        if derslik_programi[derslik_id] & bit:
+            bos = next((d for d in scheduler.ders_derslikleri[ders_id] if not derslik_programi[d.id] & bit), None)
+            if bos is None:
+                catisanlar.append(ders_id)
+                continue
+            derslik_id = bos.id
+            program_state[ders_id] = (gun, saat_tuple, derslik_id, hoca_id)
+        derslik_programi[derslik_id] |= bit
+
+    for ders_id in catisanlar:
+        del program_state[ders_id]
+    return catisanlar
+
+def solve_decomposed(scheduler, workers, base_seed=None):
+    """Dersleri bağımsız bileşenlere ayırıp workers süreçte çözer; birleşik sonucu scheduler'a aktarır.
+
+    Bir bileşen çözümsüzse tüm problem çözümsüzdür (False). Derslik onarımı yetmezse
+    kalan dersler diğer yerleşimler sabitken yeniden aranır; bu da başarısız olursa
+    tüm problem tek aramada çözülür. Bütçe scheduler ayarlarından her bileşene ayrı uygulanır.
+    """
+    from .scheduler import RUN_INDEX
+
+    scheduler.load_data()
+    scheduler.compile_domains()
+    if scheduler.warm_start:
+        # Manuel satırlar her bileşende sabittir; bileşenlere yalnızca aranacak dersler girer
+        scheduler.load_hints()
+    if scheduler.precheck and not scheduler.run_precheck():
+        return False
+    bilesenler = build_components(scheduler)
+    if len(bilesenler) <= 1:
+        print("Çatışma grafiği tek bileşenli, ayrıştırma yapılmadan çözülüyor.")
+        return scheduler.search()
+    print(f"Çatışma grafiği: {len(bilesenler)} bağımsız bileşen (en büyüğü {len(bilesenler[0])} ders).")
+
+    if base_seed is None:
+        base_seed = random.randrange(1 << 30)
+    # Bileşenler kullanıcının seçtiği ayarlarla kurulur; problem örneği havuz başlatılırken bir kez aktarılır
+    ayarlar = dict(scheduler.subproblem_settings(), semester=scheduler.semester, progress_callback=None,
+                   precheck=False) # Ön kontrol ana süreçte tüm problem için yapıldı
+    del ayarlar['problem']
+    gorevler = [(no, ders_idleri, dict(ayarlar, seed=base_seed + no)) for no, ders_idleri in enumerate(bilesenler)]
+
+    # Süreçler ana sürecin veritabanı bağlantısını paylaşmamalı
+    connections.close_all()
+    with multiprocessing.Pool(processes=max(workers, 1), initializer=_init_worker,
+                              initargs=(scheduler.problem,)) as havuz:
+        sonuclar = list(havuz.imap_unordered(_component_worker, gorevler))
+
+    ders_map = {ders.id: ders for ders in scheduler.dersler_listesi}
+    sabitler = list(scheduler.sabit_yerlesimler)
+    sabit_idler = {ders.id for ders, _, _, _ in sabitler}
+    program_state = {}
+    yerlesmeyen_idler = []
+    cozumsuz = False
+    kismi = False
+    for sonuc in sonuclar:
+        if sonuc.get('error'):
+            print(f"Uyarı: Bileşen {sonuc['bilesen']} hata verdi: {sonuc['error']}")
+            cozumsuz = True
+            continue
+        program_state.update((ders_id, yer) for ders_id, yer in sonuc['program_state'].items() if ders_id not in sabit_idler)
+        yerlesmeyen_idler += sonuc['yerlesmeyen_ders_idleri']
+        if not sonuc['success']:
+            if sonuc['kismi_cozum']:
+                kismi = True
+            else:
+                cozumsuz = True
+    scheduler.node_count = sum(sonuc.get('node_count', 0) for sonuc in sonuclar)
+    for sonuc in sonuclar:
+        if 'sayaclar' in sonuc:
+            # Düğümler node_count'a aktarıldı; statik elemeler ana süreçte tüm problem için sayıldı
+            scheduler.merge_counters(dict(sonuc['sayaclar'], dugum=0))
+        if scheduler.ret_izi is not None and sonuc.get('ret_izi') is not None:
+            scheduler.ret_izi.merge(*sonuc['ret_izi'])
+
+    if cozumsuz:
+        # Bileşenler bağımsız olduğundan biri çözümsüzse tüm problem çözümsüzdür
+        scheduler.program_state = {}
+        scheduler.yerlesmeyen_dersler_rapor = [ders_map[i] for i in yerlesmeyen_idler if i in ders_map]
+        return False
+
+    catisanlar = _repair_rooms(scheduler, program_state)
+    if catisanlar and kismi:
+        # Bütçe zaten doldu: çakışan dersler yerleşmeyenlere eklenir
+        yerlesmeyen_idler += catisanlar
+    elif catisanlar:
+        print(f"{len(catisanlar)} ders için derslik çakışması kaldı, diğer yerleşimler sabitken yeniden aranıyor...")
+        tum_dersler = scheduler.dersler_listesi
+        hoca_map = {hoca.id: hoca for hocalar in scheduler.ders_hocalari.values() for hoca in hocalar}
+        derslik_map = {derslik.id: derslik for derslik in scheduler.derslikler}
+        scheduler.sabit_yerlesimler = sabitler + [
+            (ders_map[ders_id], RUN_INDEX[(gun, saat_tuple)][0], derslik_map[derslik_id], hoca_map[hoca_id])
+            for ders_id, (gun, saat_tuple, derslik_id, hoca_id) in program_state.items()
+        ]
+        scheduler.dersler_listesi = [ders_map[i] for i in catisanlar]
+        success = scheduler.search()
+        scheduler.sabit_yerlesimler = sabitler
+        scheduler.dersler_listesi = tum_dersler
+        if success:
+            return True
+        # Sabit yerleşimler onarımı engelliyor olabilir: tüm problemi tek aramada çöz
+        print("Onarım başarısız, tüm dersler tek aramada yeniden çözülüyor...")
+        return scheduler.search()
+
+    scheduler.program_state = program_state
+    scheduler.yerlesmeyen_dersler_rapor = [ders_map[i] for i in yerlesmeyen_idler if i in ders_map]
+    scheduler.kismi_cozum = kismi
+    return not kismi
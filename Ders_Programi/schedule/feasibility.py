@@ -0,0 +1,200 @@
+# schedule/feasibility.py
+
+# Arama öncesi uygulanabilirlik kontrolü: derlenmiş aday alanları üzerinde polinom zamanlı sayım
+# ve Hall teoremi (iki parçalı eşleştirme) sınırları çalıştırılır. Bu koşullar gereklidir ama
+# yeterli değildir: bir darboğaz bulunursa hiçbir tam program yoktur ve üstel aramaya girmeden
+# sorunun kaynağı olan sınıf, hoca veya derslik grubu raporlanır.
+# Çok saatlik bloklar gevşetilerek sayılır: bir blok, aday koşularının en kısası kadar (slot
+# başına bir) birim talep eder ve bu birimler koşularının kapladığı herhangi bir slota eşleşebilir.
+# Gevşetme yalnızca kapasiteyi büyütür; bulunan her darboğaz yine kesindir.
+
+from .scheduler import DAY_MASKS, RUN_MASKS, SLOT_BITS, TIME_SLOTS, mask_slots
+
+class Darbogaz:
+    """Tam programı imkânsız kılan bir kaynak: ihtiyac adet ders saati (ya da blok) en fazla kapasite yere sığmalıdır."""
+    __slots__ = ('tur', 'varlik', 'ihtiyac', 'kapasite', 'dersler')
+
+    def __init__(self, tur, varlik, ihtiyac, kapasite, dersler):
+        self.tur = tur # 'ders', 'sinif', 'hoca' veya 'derslik'
+        self.varlik = varlik # Okunabilir kaynak adı
+        self.ihtiyac = ihtiyac
+        self.kapasite = kapasite
+        self.dersler = dersler # Darboğazı oluşturan ders (blok) kayıtları
+
+    def ders_kodlari(self):
+        """Darboğazdaki derslerin kodları (aynı dersin blokları bir kez)."""
+        return list(dict.fromkeys(d.ders_kodu for d in self.dersler))
+
+    def __str__(self):
+        kodlar = self.ders_kodlari()
+        metin = ", ".join(kodlar[:10])
+        if len(kodlar) > 10:
+            metin += f", ... (+{len(kodlar) - 10})"
+        return f"{self.varlik}: {self.ihtiyac} yerleşim için yalnızca {self.kapasite} uygun yer var ({metin})"
+
+    def as_dict(self):
+        return {'tur': self.tur, 'varlik': self.varlik, 'ihtiyac': self.ihtiyac, 'kapasite': self.kapasite,
+                'dersler': self.ders_kodlari()}
+
+def _hall_violator(birimler, komsular):
+    """birimler'i komsular[birim] yerlerinden farklı birer yere eşleştirmeye çalışır (Kuhn).
+
+    Eşleşme tam ise None döner. Değilse Hall koşulunu ihlal eden birim kümesini S ve komşu
+    yer sayısını |N(S)| < |S| olarak (S, |N(S)|) döner: eşleşmemiş birimlerden alternatif
+    yollarla ulaşılan birimler.
+    """
+    slot_sahibi = {}
+
+    def arttir(birim, ziyaret):
+        for slot_no in komsular[birim]:
+            if slot_no in ziyaret:
+                continue
+            ziyaret.add(slot_no)
+            if slot_no not in slot_sahibi or arttir(slot_sahibi[slot_no], ziyaret):
+                slot_sahibi[slot_no] = birim
+                return True
+        return False
+
+    eslesmeyenler = [birim for birim in birimler if not arttir(birim, set())]
+    if not eslesmeyenler:
+        return None
+    kume = set(eslesmeyenler)
+    slotlar = set()
+    sira = list(eslesmeyenler)
+    while sira:
+        birim = sira.pop()
+        for slot_no in komsular[birim]:
+            if slot_no not in slotlar:
+                slotlar.add(slot_no)
+                sahip = slot_sahibi.get(slot_no)
+                if sahip is not None and sahip not in kume:
+                    kume.add(sahip)
+                    sira.append(sahip)
+    return kume, len(slotlar)
+
+def _slot_birimleri(grup, aday_kosulari, dolu):
+    """Grubun bloklarını slot birimlerine açar: ({(blok_id, i): komşu slotlar}, blok_id -> blok).
+
+    Bir blok, dolu ile çakışmayan aday koşularının en kısası kadar birimdir; her birim bu
+    koşuların kapladığı slotlara eşleşebilir. Geçerli koşusu olmayan blok tek, komşusuz bir birimdir.
+    """
+    komsular = {}
+    bloklar = {}
+    for ders in grup:
+        kosular = [maske for maske in aday_kosulari[ders.id] if not dolu & maske]
+        slotlar = 0
+        for maske in kosular:
+            slotlar |= maske
+        birim_sayisi = min((maske.bit_count() for maske in kosular), default=1)
+        for i in range(birim_sayisi):
+            komsular[(ders.id, i)] = mask_slots(slotlar)
+        bloklar[ders.id] = ders
+    return komsular, bloklar
+
+def find_bottlenecks(scheduler):
+    """Derlenmiş (compile_domains) scheduler için darboğazların listesini döner; boşsa sınırlar aşılmıyordur.
+
+    Sabit yerleşimlerin doldurduğu sınıf/hoca/derslik slotları kapasiteden düşülür. Hocası
+    olmayan dersler arama tarafından zaten atlandığı için hesaba katılmaz.
+    """
+    s = scheduler
+    darbogazlar = []
+    dersler = [ders for ders in s.dersler_listesi if s.ders_hocalari[ders.id]]
+
+    sinif_dolu = {}
+    hoca_dolu = {}
+    derslik_dolu = {}
+    gun_dolu = {} # ders_id -> sabit bloklarının günleri
+    for ders, slot_no, derslik, hoca in s.sabit_yerlesimler:
+        bit = RUN_MASKS[ders.blok_saati][slot_no]
+        anahtar = (ders.bolum_id, ders.sinif)
+        sinif_dolu[anahtar] = sinif_dolu.get(anahtar, 0) | bit
+        hoca_dolu[hoca.id] = hoca_dolu.get(hoca.id, 0) | bit
+        if derslik is not None:
+            derslik_dolu[derslik.id] = derslik_dolu.get(derslik.id, 0) | bit
+        gun_dolu[ders.ders_id] = gun_dolu.get(ders.ders_id, 0) | DAY_MASKS[slot_no // len(TIME_SLOTS)]
+
+    aday_slotlari = {}
+    aday_kosulari = {} # blok id -> aday koşularının maskeleri
+    ders_bloklari = {}
+    for ders in dersler:
+        aday_slotlari[ders.id] = [slot_no for adaylar in s.ders_adaylari[ders.id] for slot_no, _ in adaylar]
+        aday_kosulari[ders.id] = [RUN_MASKS[ders.blok_saati][slot_no] for slot_no in aday_slotlari[ders.id]]
+        ders_bloklari.setdefault(ders.ders_id, []).append(ders)
+
+    # 1. Tek başına yerleşemeyen dersler: uygun derslik ya da uygun (slot, hoca) adayı yok.
+    # Ders bir kez raporlanır; ihtiyaç yerleşemeyen blok sayısıdır
+    for grup in ders_bloklari.values():
+        dersliksiz = [ders for ders in grup if not s.ders_derslikleri[ders.id]]
+        saatsiz = [ders for ders in grup if s.ders_derslikleri[ders.id] and not aday_slotlari[ders.id]]
+        if dersliksiz:
+            darbogazlar.append(Darbogaz('ders', f"{grup[0].ders_kodu} (tip/kapasite uygun derslik yok)",
+                                        len(dersliksiz), 0, dersliksiz))
+        elif saatsiz:
+            darbogazlar.append(Darbogaz('ders', f"{grup[0].ders_kodu} (hocaları için uygun saat yok)",
+                                        len(saatsiz), 0, saatsiz))
+
+    # 2. Ders başına: aynı dersin blokları aday koşusu olan farklı günlere eşleşebilmeli (Hall)
+    for ders_id, grup in ders_bloklari.items():
+        dolu = gun_dolu.get(ders_id, 0)
+        komsular = {ders.id: sorted({n // len(TIME_SLOTS) for n in aday_slotlari[ders.id] if not dolu & SLOT_BITS[n]})
+                    for ders in grup}
+        ihlal = _hall_violator([ders.id for ders in grup], komsular)
+        if ihlal is not None and all(aday_slotlari[ders.id] for ders in grup):
+            kume, kapasite = ihlal
+            darbogazlar.append(Darbogaz('ders', f"{grup[0].ders_kodu} (blokları için yeterli gün yok)", len(kume),
+                                        kapasite, [ders for ders in grup if ders.id in kume]))
+
+    # 3. Sınıf başına: aynı sınıfın dersleri farklı slotlara eşleşebilmeli (Hall)
+    sinif_dersleri = {}
+    for ders in dersler:
+        sinif_dersleri.setdefault((ders.bolum_id, ders.sinif), []).append(ders)
+    for (bolum_id, sinif), grup in sinif_dersleri.items():
+        komsular, bloklar = _slot_birimleri(grup, aday_kosulari, sinif_dolu.get((bolum_id, sinif), 0))
+        ihlal = _hall_violator(list(komsular), komsular)
+        if ihlal is not None:
+            kume, kapasite = ihlal
+            darbogazlar.append(Darbogaz('sinif', f"Sınıf {grup[0].bolum_kodu} - {sinif}", len(kume), kapasite,
+                                        [bloklar[blok_id] for blok_id in dict.fromkeys(b for b, _ in kume)]))
+
+    # 4. Hoca başına: yalnızca bu hocaya atanabilen dersler hocanın farklı boş slotlarına eşleşebilmeli
+    hoca_dersleri = {}
+    for ders in dersler:
+        hocalar = s.ders_hocalari[ders.id]
+        if len(hocalar) == 1:
+            hoca_dersleri.setdefault(hocalar[0].id, (hocalar[0], []))[1].append(ders)
+    for hoca_id, (hoca, grup) in hoca_dersleri.items():
+        komsular, bloklar = _slot_birimleri(grup, aday_kosulari, hoca_dolu.get(hoca_id, 0))
+        ihlal = _hall_violator(list(komsular), komsular)
+        if ihlal is not None:
+            kume, kapasite = ihlal
+            darbogazlar.append(Darbogaz('hoca', f"Hoca {hoca}", len(kume), kapasite,
+                                        [bloklar[blok_id] for blok_id in dict.fromkeys(b for b, _ in kume)]))
+
+    # 5. Derslik türü başına: kontenjanı k'dan büyük derslerin saatleri kapasitesi yeten derslik-slot
+    # çiftlerine sığmalı. Uygun derslik kümeleri eşik boyunca iç içe olduğundan Hall koşulu eşik başına bir sayımdır.
+    serbest_slot_sayisi = sum(1 for bit in SLOT_BITS if not s.global_kisitlari & bit)
+    derslik_yeri = {derslik.id: serbest_slot_sayisi - (derslik_dolu.get(derslik.id, 0) & ~s.global_kisitlari).bit_count()
+                    for derslik in s.derslikler}
+    for tur_adi, yalniz_lab in (("LAB derslikleri", True), ("Tüm derslikler", False)):
+        # Uygun dersliği olmayan bloklar 1. adımda raporlandı
+        talepler = sorted((ders for ders in dersler
+                           if s.ders_derslikleri[ders.id] and (ders.tip == 'LAB' or not yalniz_lab)),
+                          key=lambda d: -d.kontenjan)
+        en_kotu = None
+        ihtiyac = 0
+        for i, ders in enumerate(talepler):
+            # Blok, en kısa aday koşusu kadar derslik-saat kullanır
+            ihtiyac += min((maske.bit_count() for maske in aday_kosulari[ders.id]), default=1)
+            if i + 1 < len(talepler) and talepler[i + 1].kontenjan == ders.kontenjan:
+                continue # Aynı eşikteki tüm dersler birlikte sayılır
+            esik = ders.kontenjan
+            kapasite = sum(derslik_yeri[derslik.id] for derslik in s.derslikler
+                           if derslik.kapasite >= esik and (derslik.statu == 'LAB' or not yalniz_lab))
+            if ihtiyac > kapasite and (en_kotu is None or ihtiyac - kapasite > en_kotu[0]):
+                en_kotu = (ihtiyac - kapasite, esik, i + 1, ihtiyac, kapasite)
+        if en_kotu is not None:
+            _, esik, ders_sayisi, ihtiyac, kapasite = en_kotu
+            darbogazlar.append(Darbogaz('derslik', f"{tur_adi} (kapasite >= {esik}, derslik x saat)",
+                                        ihtiyac, kapasite, talepler[:ders_sayisi]))
+    return darbogazlar
@@ -0,0 +1,174 @@
+# schedule/instance.py
+
+# Derlenmiş problem örneği: veritabanı bir kez okunur ve arama motorlarının kullandığı bilgiler
+# (ders talepleri, derslik kapasite/statüleri, hoca uygunluk maskeleri, sınıf anahtarları)
+# ORM'den bağımsız, __slots__ kullanan düz kayıtlara dönüştürülür. Kayıtlar model nesneleriyle
+# aynı alan adlarını taşır; arama döngüsü ORM nesnesine hiç dokunmaz. Örnek pickle edilebilir,
+# paralel süreçlere veritabanı sorgusu yapmadan aktarılır.
+
+from .models import Ders, Derslik, OgretimUyesi, OgretimUyesiKisiti, GlobalKisiti
+from .scheduler import DAYS, TIME_SLOTS, SLOT_BITS, split_blocks
+
+class HocaKaydi:
+    """Öğretim üyesinin arama için gereken alanları."""
+    __slots__ = ('id', 'ad_soyad')
+
+    def __init__(self, id, ad_soyad):
+        self.id = id
+        self.ad_soyad = ad_soyad
+
+    def __str__(self):
+        return self.ad_soyad
+
+class DerslikKaydi:
+    """Dersliğin arama için gereken alanları."""
+    __slots__ = ('id', 'derslik_adi', 'statu', 'kapasite')
+
+    def __init__(self, id, derslik_adi, statu, kapasite):
+        self.id = id
+        self.derslik_adi = derslik_adi
+        self.statu = statu
+        self.kapasite = kapasite
+
+    def __str__(self):
+        return f"{self.derslik_adi} (Kapasite: {self.kapasite}, Statü: {self.statu})"
+
+class DersKaydi:
+    """Dersin arama için gereken alanları; hocalar atanabilecek HocaKaydi'larıdır."""
+    __slots__ = ('id', 'ders_kodu', 'ders_adi', 'tip', 'kontenjan', 'bolum_id', 'bolum_kodu',
+                 'sinif', 'donem', 'haftalik_saat', 'hocalar')
+
+    def __init__(self, id, ders_kodu, ders_adi, tip, kontenjan, bolum_id, bolum_kodu, sinif, donem,
+                 haftalik_saat, hocalar):
+        self.id = id
+        self.ders_kodu = ders_kodu
+        self.ders_adi = ders_adi
+        self.tip = tip
+        self.kontenjan = kontenjan
+        self.bolum_id = bolum_id
+        self.bolum_kodu = bolum_kodu
+        self.sinif = sinif
+        self.donem = donem
+        self.haftalik_saat = haftalik_saat
+        self.hocalar = hocalar
+
+    # Kayıtlı bir satır sabit yerleşim olarak süresinden bağımsız tek slot kaplar (bkz. scheduler.RUN_MASKS[0])
+    blok_saati = 0
+
+    @property
+    def ders_id(self):
+        return self.id
+
+    def __str__(self):
+        return f"{self.ders_kodu} - {self.ders_adi} ({self.bolum_kodu} - Sınıf {self.sinif})"
+
+class DersBlogu:
+    """Dersin haftalık saatinden bir blok (bkz. scheduler.split_blocks); aramanın değişkeni budur.
+
+    id (ders_id, blok_no) çiftidir. Blok aynı gün blok_saati süren ardışık slotlara (bkz.
+    scheduler.RUN_MASKS) tek derslik ve tek hocayla yerleşir; aynı dersin blokları farklı günlere konur.
+    Aramanın kullandığı ders alanları dersten kopyalanır.
+    """
+    __slots__ = ('id', 'ders_id', 'blok_no', 'blok_saati', 'blok_sayisi', 'ders_kodu', 'ders_adi', 'tip',
+                 'kontenjan', 'bolum_id', 'bolum_kodu', 'sinif', 'donem', 'hocalar')
+
+    def __init__(self, ders, blok_no, blok_saati, blok_sayisi):
+        self.id = (ders.id, blok_no)
+        self.ders_id = ders.id
+        self.blok_no = blok_no
+        self.blok_saati = blok_saati
+        self.blok_sayisi = blok_sayisi
+        self.ders_kodu = ders.ders_kodu
+        self.ders_adi = ders.ders_adi
+        self.tip = ders.tip
+        self.kontenjan = ders.kontenjan
+        self.bolum_id = ders.bolum_id
+        self.bolum_kodu = ders.bolum_kodu
+        self.sinif = ders.sinif
+        self.donem = ders.donem
+        self.hocalar = ders.hocalar
+
+    def __str__(self):
+        metin = f"{self.ders_kodu} - {self.ders_adi} ({self.bolum_kodu} - Sınıf {self.sinif})"
+        if self.blok_sayisi > 1 or self.blok_saati > 1:
+            metin += f" [{self.blok_no + 1}/{self.blok_sayisi}. blok, {self.blok_saati} saat]"
+        return metin
+
+def _kisit_maskesi(kisit):
+    """Kısıtın [başlangıç, bitiş) aralığıyla çakışan slotların bit maskesini döner.
+
+    Saat değeri boşsa AttributeError, gün tanımsızsa ValueError fırlatır.
+    """
+    kisit_start_tuple = (kisit.baslangic_saati.hour, kisit.baslangic_saati.minute)
+    kisit_end_tuple = (kisit.bitis_saati.hour, kisit.bitis_saati.minute)
+    gun_no = DAYS.index(kisit.gun)
+    maske = 0
+    # Tanımlı TIME_SLOTS üzerinde dönerek kısıt aralığı ile çakışanları bul
+    for saat_no, (slot_start, slot_end) in enumerate(TIME_SLOTS):
+        # Çakışma kontrolü: (KısıtBaşlangıç < SlotBitiş) VE (KısıtBitiş > SlotBaşlangıç)
+        if kisit_start_tuple < (slot_end.hour, slot_end.minute) and kisit_end_tuple > (slot_start.hour, slot_start.minute):
+            maske |= SLOT_BITS[gun_no * len(TIME_SLOTS) + saat_no]
+    return maske
+
+class ProblemInstance:
+    """Veritabanından bir kez derlenen, değişmez problem verisi.
+
+    dersler/derslikler/hocalar kayıt listeleri ve id -> kayıt sözlükleridir. bloklar derslerin haftalık
+    saatine göre bölündüğü DersBlogu'larıdır (blok_map: blok id -> blok, ders_bloklari: ders id -> bloklar).
+    hoca_kisitlari hoca_id -> uygun olmayan slotların bit maskesi, global_kisitlari ise genel kısıtlı
+    slotların maskesidir (bkz. scheduler.SLOTS).
+    """
+    __slots__ = ('dersler', 'derslikler', 'hocalar', 'ders_map', 'derslik_map', 'hoca_map',
+                 'bloklar', 'blok_map', 'ders_bloklari', 'hoca_kisitlari', 'global_kisitlari')
+
+    def __init__(self, dersler, derslikler, hocalar, hoca_kisitlari, global_kisitlari):
+        self.dersler = dersler
+        self.derslikler = derslikler
+        self.hocalar = hocalar
+        self.ders_map = {ders.id: ders for ders in dersler}
+        self.derslik_map = {derslik.id: derslik for derslik in derslikler}
+        self.hoca_map = {hoca.id: hoca for hoca in hocalar}
+        self.ders_bloklari = {}
+        for ders in dersler:
+            sureler = split_blocks(ders.haftalik_saat)
+            self.ders_bloklari[ders.id] = [DersBlogu(ders, blok_no, blok_saati, len(sureler))
+                                           for blok_no, blok_saati in enumerate(sureler)]
+        self.bloklar = [blok for bloklar in self.ders_bloklari.values() for blok in bloklar]
+        self.blok_map = {blok.id: blok for blok in self.bloklar}
+        self.hoca_kisitlari = hoca_kisitlari
+        self.global_kisitlari = global_kisitlari
+
+    @classmethod
+    def from_database(cls):
+        """Tüm dersleri, derslikleri, hocaları ve kısıtları okuyup kayıtlara dönüştürür."""
+        hocalar = [HocaKaydi(h.id, h.ad_soyad) for h in OgretimUyesi.objects.all()]
+        hoca_map = {hoca.id: hoca for hoca in hocalar}
+        dersler = []
+        for ders in Ders.objects.select_related('bolum').prefetch_related('ogretim_uyeleri'):
+            dersler.append(DersKaydi(
+                ders.id, ders.ders_kodu, ders.ders_adi, ders.tip, ders.kontenjan, ders.bolum_id,
+                ders.bolum.bolum_kodu, ders.sinif, ders.donem, ders.haftalik_saat,
+                tuple(hoca_map[h.id] for h in ders.ogretim_uyeleri.all()),
+            ))
+        derslikler = [DerslikKaydi(d.id, d.derslik_adi, d.statu, d.kapasite) for d in Derslik.objects.all()]
+
+        # Öğretim Üyesi Özel Kısıtları
+        hoca_kisitlari = {}
+        for kisit in OgretimUyesiKisiti.objects.all():
+            try: # Saat dönüşümünde hata olursa atla
+                maske = _kisit_maskesi(kisit)
+            except (AttributeError, ValueError):
+                # Eğer başlangıç veya bitiş saati None ise (veritabanında null ise) bu hatayı alabiliriz.
+                print(f"Uyarı: Kısıt ID {kisit.id} için geçersiz saat değeri, atlanıyor.")
+                continue
+            hoca_kisitlari[kisit.ogretim_uyesi_id] = hoca_kisitlari.get(kisit.ogretim_uyesi_id, 0) | maske
+
+        # Genel Kısıtlar
+        global_kisitlari = 0
+        for kisit in GlobalKisiti.objects.all():
+            try:
+                global_kisitlari |= _kisit_maskesi(kisit)
+            except (AttributeError, ValueError):
+                print(f"Uyarı: Global Kısıt ID {kisit.id} için geçersiz saat değeri, atlanıyor.")
+
+        return cls(dersler, derslikler, hocalar, hoca_kisitlari, global_kisitlari)
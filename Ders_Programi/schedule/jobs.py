@@ -0,0 +1,156 @@
+# schedule/jobs.py
+
+# Arka plan program oluşturma işleri: admin görünümü yalnızca bir GenerationJob kaydı oluşturup
+# hemen döner; run_generation_jobs komutuyla çalışan yerel süreç işleri sırayla alıp çalıştırır.
+# Harici bir kuyruk/broker gerekmez, işler ve ilerlemeleri veritabanı üzerinden paylaşılır.
+
+import time
+
+from django.utils import timezone
+
+from .models import GenerationJob
+from .scheduler import BacktrackingScheduler
+
+ILERLEME_ARALIGI = 1.0 # saniye: ilerlemenin veritabanına en sık yazılma aralığı
+AKIS_OMRU = 30.0 # saniye: bir SSE bağlantısının en uzun süresi (tarayıcı yeniden bağlanır)
+
+def enqueue_job(**ayarlar):
+    """Yeni bir işi kuyruğa ekler. ayarlar: workers, time_limit, incremental."""
+    return GenerationJob.objects.create(ayarlar=ayarlar)
+
+def claim_next_job():
+    """Bekleyen en eski işi alıp 'CALISIYOR' durumuna geçirir; iş yoksa None döner.
+
+    Durum koşullu bir UPDATE ile değiştirildiği için aynı işi iki süreç alamaz.
+    """
+    for job_id in GenerationJob.objects.filter(durum='BEKLIYOR').order_by('olusturulma').values_list('id', flat=True)[:10]:
+        alindi = GenerationJob.objects.filter(id=job_id, durum='BEKLIYOR').update(
+            durum='CALISIYOR', baslangic=timezone.now())
+        if alindi:
+            return GenerationJob.objects.get(id=job_id)
+    return None
+
+class _IlerlemeYazici:
+    """Scheduler ilerleme olaylarını işin satırına yazar (ilerleme en fazla ILERLEME_ARALIGI'nda bir)."""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.son_yazma = 0.0
+        self.son_node_count = 0
+
+    def __call__(self, olay, bilgi):
+        if olay == 'asama':
+            GenerationJob.objects.filter(id=self.job_id).update(asama=bilgi['asama'])
+        elif olay == 'yukleme':
+            GenerationJob.objects.filter(id=self.job_id).update(yukleme_istatistikleri=bilgi)
+        elif olay == 'ilerleme':
+            simdi = time.monotonic()
+            gecen = simdi - self.son_yazma
+            if gecen < ILERLEME_ARALIGI:
+                return
+            # Her düğüm bir ders yerleştirmesidir; hız son yazmadan bu yana ölçülür
+            # (yeniden başlayan alt aramalarda sayaç sıfırlanabilir)
+            hiz = max(0, bilgi['node_count'] - self.son_node_count) / gecen if self.son_yazma else 0.0
+            self.son_yazma, self.son_node_count = simdi, bilgi['node_count']
+            GenerationJob.objects.filter(id=self.job_id).update(
+                node_count=bilgi['node_count'], derinlik=bilgi['derinlik'], yerlestirme_hizi=round(hiz, 1),
+                yerlesen_ders=bilgi['yerlesen'], toplam_ders=bilgi['toplam'])
+
+def run_job(job):
+    """İşi ayarlarına göre çalıştırır ve sonucunu işin satırına yazar."""
+    ayarlar = job.ayarlar or {}
+    scheduler = BacktrackingScheduler(time_limit=ayarlar.get('time_limit'),
+                                      progress_callback=_IlerlemeYazici(job.id))
+    try:
+        if ayarlar.get('incremental'):
+            success = scheduler.reschedule_and_save()
+        else:
+            success = scheduler.generate_and_save(workers=ayarlar.get('workers', 1))
+    except Exception as e:
+        durum, mesaj = 'HATA', f"Program oluşturma sırasında beklenmedik bir hata oluştu: {e}"
+    else:
+        if success:
+            durum, mesaj = 'TAMAMLANDI', "Ders programı başarıyla oluşturuldu ve kaydedildi!"
+        elif scheduler.kismi_cozum:
+            yerlesmeyen = ", ".join(d.ders_kodu for d in scheduler.yerlesmeyen_dersler_rapor)
+            durum, mesaj = 'KISMI', (f"Süre bütçesi doldu: kısmi program kaydedildi. "
+                                     f"Yerleşmeyen dersler ({len(scheduler.yerlesmeyen_dersler_rapor)}): {yerlesmeyen}")
+        elif scheduler.darbogazlar:
+            durum, mesaj = 'BASARISIZ', ("Tüm dersleri yerleştiren bir program yok. Darboğazlar: "
+                                         + "; ".join(str(darbogaz) for darbogaz in scheduler.darbogazlar))
+        else:
+            durum, mesaj = 'BASARISIZ', "Ders programı oluşturulamadı veya tamamlanamadı."
+
+    GenerationJob.objects.filter(id=job.id).update(
+        durum=durum,
+        mesaj=mesaj,
+        rapor=scheduler.run_report(),
+        bitis=timezone.now(),
+        node_count=scheduler.node_count,
+        yerlesen_ders=len(scheduler.program_state),
+        toplam_ders=len(scheduler.program_state) + len(scheduler.yerlesmeyen_dersler_rapor),
+    )
+    return durum
+
+def job_status(job):
+    """İşin durumunu JSON'a uygun bir sözlük olarak döner.
+
+    butce_kalan_saniye süre bütçesinden (time_limit) kalan süredir, bir bitiş tahmini değildir: arama
+    daha erken bitebilir. Yalnızca çalışan ve süre bütçesi olan işler için hesaplanır.
+    """
+    butce_kalan = None
+    time_limit = (job.ayarlar or {}).get('time_limit')
+    if job.durum == 'CALISIYOR' and time_limit and job.baslangic:
+        gecen = (timezone.now() - job.baslangic).total_seconds()
+        butce_kalan = max(0.0, round(time_limit - gecen, 1))
+    return {
+        'id': job.id,
+        'durum': job.durum,
+        'durum_adi': job.get_durum_display(),
+        'bitti': job.bitti,
+        'asama': job.asama,
+        'node_count': job.node_count,
+        'derinlik': job.derinlik,
+        'yerlestirme_hizi': job.yerlestirme_hizi,
+        'yerlesen_ders': job.yerlesen_ders,
+        'toplam_ders': job.toplam_ders,
+        'butce_kalan_saniye': butce_kalan,
+        'mesaj': job.mesaj,
+        'yukleme_istatistikleri': job.yukleme_istatistikleri,
+        'olusturulma': job.olusturulma.isoformat(),
+        'baslangic': job.baslangic.isoformat() if job.baslangic else None,
+        'bitis': job.bitis.isoformat() if job.bitis else None,
+    }
+
+def iter_job_events(job_id, aralik=ILERLEME_ARALIGI, omur=None):
+    """İşin satırını aralik saniyede bir okuyup değişiklikleri (olay, veri) çiftleri olarak üretir.
+
+    Olaylar: 'yukleme' (Kısıtlama Analizi, bir kez), 'asama', 'ilerleme' (düğüm, derinlik,
+    yerleştirme/sn, yerleşen ders) ve iş bitince 'sonuc' (son durum sözlüğü); ardından biter.
+    omur verilirse iş bitmemiş olsa da omur saniye sonra biter.
+    """
+    son = {}
+    bitis = time.monotonic() + omur if omur is not None else None
+    while True:
+        try:
+            job = GenerationJob.objects.get(id=job_id)
+        except GenerationJob.DoesNotExist:
+            return
+        durum = job_status(job)
+        if durum['yukleme_istatistikleri'] and 'yukleme' not in son:
+            son['yukleme'] = durum['yukleme_istatistikleri']
+            yield 'yukleme', durum['yukleme_istatistikleri']
+        if durum['asama'] != son.get('asama'):
+            son['asama'] = durum['asama']
+            yield 'asama', {'asama': durum['asama'], 'durum': durum['durum']}
+        ilerleme = {anahtar: durum[anahtar] for anahtar in
+                    ('node_count', 'derinlik', 'yerlestirme_hizi', 'yerlesen_ders', 'toplam_ders', 'butce_kalan_saniye')}
+        if job.durum == 'CALISIYOR' and ilerleme != son.get('ilerleme'):
+            son['ilerleme'] = ilerleme
+            yield 'ilerleme', ilerleme
+        if job.bitti:
+            yield 'sonuc', durum
+            return
+        if bitis is not None and time.monotonic() + aralik > bitis:
+            return
+        time.sleep(aralik)
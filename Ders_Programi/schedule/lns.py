@@ -0,0 +1,139 @@
+# schedule/lns.py
+
+# Büyük komşuluk araması (LNS) ile onarım: mevcut (eksik ya da bozulmuş) bir programdan başlar,
+# her adımda yerleşmemiş bir dersin etrafındaki küçük bir ders kümesini (bir sınıfın bir günü,
+# bir hocanın haftası veya dersin hedeflediği slotu dolduranlar) serbest bırakır ve yalnızca bu
+# kümeyi, geri kalan yerleşimler sabitken backtracking aramasıyla yeniden yerleştirir.
+# Her adım birkaç düzine değişkene dokunduğundan tam aramanın tıkandığı kalabalık örneklerde ölçeklenir.
+
+import random
+import time
+
+from .scheduler import SLOTS, DAYS, RUN_INDEX, RUN_MASKS
+
+class ScheduleRepairer:
+    """program_state'teki atamayı LNS ile tam yerleşime doğru onarır.
+
+    scheduler verisi yüklenmiş (load_data + compile_domains) olmalıdır. sabit_yerlesimler
+    hiçbir zaman serbest bırakılmaz. Alt aramalar scheduler'ın kendi stratejisi ve ayarlarıyla,
+    neighbourhood_size ders ve node_limit düğümle sınırlı olarak yapılır.
+    """
+
+    def __init__(self, scheduler, time_limit=30.0, neighbourhood_size=30, node_limit=5000, seed=None):
+        self.scheduler = scheduler
+        self.time_limit = time_limit
+        self.neighbourhood_size = neighbourhood_size
+        self.node_limit = node_limit
+        self.rng = random.Random(seed)
+
+        if not scheduler.ders_adaylari:
+            # Portföy sonrası ana süreçte aday alanları henüz derlenmemiş olabilir
+            scheduler.load_data()
+            scheduler.compile_domains()
+        self.ders_map = {ders.id: ders for ders in scheduler.dersler_listesi}
+        self.derslik_map = {derslik.id: derslik for derslik in scheduler.derslikler}
+        self.hoca_map = {hoca.id: hoca for hocalar in scheduler.ders_hocalari.values() for hoca in hocalar}
+        self.iterasyon_sayisi = 0
+        self.kabul_sayisi = 0
+
+    def _komsuluk(self, hedef, yerlesim):
+        """Hedef ders için serbest bırakılacak yerleşik derslerin id listesini seçer."""
+        s = self.scheduler
+        tur = self.rng.randrange(3)
+        if tur == 0:
+            # Hedefin sınıfının rastgele bir günü
+            gun = self.rng.choice(DAYS)
+            sinif_key = (hedef.bolum_id, hedef.sinif)
+            adaylar = [ders_id for ders_id, (g, _, _, _) in yerlesim.items()
+                       if g == gun and (self.ders_map[ders_id].bolum_id, self.ders_map[ders_id].sinif) == sinif_key]
+        elif tur == 1:
+            # Hedefin hocalarından birinin tüm haftası
+            hoca_id = self.rng.choice(s.ders_hocalari[hedef.id]).id
+            adaylar = [ders_id for ders_id, (_, _, _, h) in yerlesim.items() if h == hoca_id]
+        else:
+            # Hedefin aday koşularından birinin saatlerini (sınıf, hoca veya derslik olarak) dolduranlar
+            # ve o günü tutan kardeş bloklar
+            tum_adaylar = [aday for adaylar in s.ders_adaylari[hedef.id] for aday in adaylar]
+            if not tum_adaylar:
+                return []
+            slot_no, hocalar = self.rng.choice(tum_adaylar)
+            gun = SLOTS[slot_no][0]
+            kapsam = RUN_MASKS[hedef.blok_saati][slot_no]
+            sinif_key = (hedef.bolum_id, hedef.sinif)
+            hoca_idleri = {h.id for h in hocalar}
+            derslik_idleri = {d.id for d in s.ders_derslikleri[hedef.id]}
+            adaylar = [ders_id for ders_id, (g, saat, derslik_id, hoca_id) in yerlesim.items()
+                       if g == gun and (self.ders_map[ders_id].ders_id == hedef.ders_id
+                                        or RUN_INDEX[(g, saat)][1] & kapsam
+                                        and ((self.ders_map[ders_id].bolum_id, self.ders_map[ders_id].sinif) == sinif_key
+                                             or hoca_id in hoca_idleri or derslik_id in derslik_idleri))]
+        if len(adaylar) > self.neighbourhood_size:
+            adaylar = self.rng.sample(adaylar, self.neighbourhood_size)
+        return adaylar
+
+    def repair(self):
+        """LNS döngüsünü time_limit saniye veya tüm dersler yerleşene kadar çalıştırır.
+
+        Sonuç scheduler.program_state'e yazılır; yerleşmeyenler yerlesmeyen_dersler_rapor'a
+        eklenir ve kismi_cozum buna göre ayarlanır. Tüm dersler yerleştiyse True döner.
+        """
+        s = self.scheduler
+        baslangic = time.monotonic()
+        sabitler = list(s.sabit_yerlesimler)
+        sabit_idler = {ders.id for ders, _, _, _ in sabitler}
+        tum_dersler = s.dersler_listesi
+        ayarlar = (s.anytime, s.time_limit, s.node_limit)
+
+        s.drop_invalid_placements()
+        yerlesim = {ders_id: yer for ders_id, yer in s.program_state.items() if ders_id not in sabit_idler}
+        sabit_program = {ders_id: yer for ders_id, yer in s.program_state.items() if ders_id in sabit_idler}
+        # Hocası veya uygun dersliği olmayan dersler hiçbir komşulukla yerleşemez
+        yerlesebilir = [ders for ders in tum_dersler
+                        if ders.id not in sabit_idler and s.ders_hocalari[ders.id] and s.ders_derslikleri[ders.id]]
+        ilk_eksik = sum(1 for ders in tum_dersler if ders.id not in sabit_idler and ders.id not in yerlesim)
+        print(f"LNS onarımı başlıyor: {ilk_eksik} ders yerleşmemiş.")
+
+        try:
+            while True:
+                eksikler = [ders for ders in yerlesebilir if ders.id not in yerlesim]
+                kalan_sure = self.time_limit - (time.monotonic() - baslangic)
+                if not eksikler or kalan_sure <= 0:
+                    break
+                self.iterasyon_sayisi += 1
+                hedef = self.rng.choice(eksikler)
+                serbest = self._komsuluk(hedef, yerlesim)
+
+                s.sabit_yerlesimler = sabitler + [
+                    (self.ders_map[ders_id], RUN_INDEX[(gun, saat_tuple)][0], self.derslik_map[derslik_id], self.hoca_map[hoca_id])
+                    for ders_id, (gun, saat_tuple, derslik_id, hoca_id) in yerlesim.items() if ders_id not in serbest
+                ]
+                s.dersler_listesi = [hedef] + [self.ders_map[ders_id] for ders_id in serbest]
+                s.anytime, s.time_limit, s.node_limit = True, kalan_sure, self.node_limit
+                s.start_search()
+                sonuc = s.run_with_budget()
+                yeni = s.program_state if sonuc is True else s.en_iyi_program
+
+                # Serbest bırakılanların hepsi önceden yerleşikti; en az o kadar ders yerleşmeliyse kabul
+                # (eşit durumları kabul etmek aramanın platolarda gezinmesini sağlar)
+                alt_kume = [ders.id for ders in s.dersler_listesi]
+                if sum(1 for ders_id in alt_kume if ders_id in yeni) < len(serbest):
+                    continue
+                self.kabul_sayisi += 1
+                for ders_id in alt_kume:
+                    if ders_id in yeni:
+                        yerlesim[ders_id] = yeni[ders_id]
+                    else:
+                        yerlesim.pop(ders_id, None)
+        finally:
+            s.sabit_yerlesimler = sabitler
+            s.dersler_listesi = tum_dersler
+            s.anytime, s.time_limit, s.node_limit = ayarlar
+
+        s.program_state = {**sabit_program, **yerlesim}
+        s.yerlesmeyen_dersler_rapor = [ders for ders in tum_dersler
+                                       if ders.id not in s.program_state and ders.id not in sabit_idler]
+        s.kismi_cozum = bool(s.yerlesmeyen_dersler_rapor)
+        sure = time.monotonic() - baslangic
+        print(f"LNS onarımı: {self.iterasyon_sayisi} adım, {self.kabul_sayisi} kabul, "
+              f"yerleşmeyen {ilk_eksik} -> {len(s.yerlesmeyen_dersler_rapor)} ders, {sure:.2f} sn.")
+        return not s.yerlesmeyen_dersler_rapor
@@ -1,21 +1,213 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from schedule.scheduler import BacktrackingScheduler # Scheduler sınıfımızı import ediyoruz
+from schedule.scheduler import BacktrackingScheduler, SEMESTERS, STRATEGIES, STRATEGY_CHRONOLOGICAL # Scheduler sınıfımızı import ediyoruz
+from schedule.cpsat import CpSatScheduler
+from datetime import datetime
+from pathlib import Path
+import json
 import time
 
 class Command(BaseCommand):
     help = 'Otomatik olarak ders programını oluşturur ve veritabanına kaydeder.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--engine',
+            choices=('backtracking', 'cpsat'),
+            default='backtracking',
+            help="Çözücü motoru: 'backtracking' (yerleşik arama) veya 'cpsat' (OR-Tools CP-SAT, --workers iş parçacığı; "
+                 "arama seçenekleri ve --decompose yok sayılır).",
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=STRATEGIES,
+            default=STRATEGY_CHRONOLOGICAL,
+            help="Arama stratejisi: 'chronological' (sabit sıra) veya 'mrv' (en az aday kalan ders önce + ileri kontrol).",
+        )
+        parser.add_argument(
+            '--backjumping',
+            action='store_true',
+            help="Çatışma yönelimli geri sıçrama ve nogood öğrenmeyi açar (yalnızca 'chronological' ile).",
+        )
+        parser.add_argument(
+            '--restarts',
+            action='store_true',
+            help="Luby dizisine göre rastgele yeniden başlatmaları açar; takılan aramalar farklı bir sırayla baştan denenir.",
+        )
+        parser.add_argument(
+            '--room-matching',
+            action='store_true',
+            help="Derslikleri aramada dallanmak yerine her saat diliminde iki parçalı eşleştirme ile atar.",
+        )
+        parser.add_argument(
+            '--symmetry-breaking',
+            action='store_true',
+            help="Aynı statü/kapasitedeki derslikler ve aynı derslere atanabilen hocalardan her slotta yalnızca birini dener.",
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help="1'den büyükse farklı tohum/stratejilerle paralel portföy çözümü yapılır; ilk biten çözüm kaydedilir.",
+        )
+        parser.add_argument(
+            '--decompose',
+            action='store_true',
+            help="Dersleri çatışma grafiğinin bağımsız bileşenlerine ayırır ve her bileşeni ayrı süreçte çözer (--workers süreç).",
+        )
+        parser.add_argument(
+            '--optimize',
+            type=float,
+            default=None,
+            metavar='SANIYE',
+            help="Bulunan programı kaydetmeden önce bu kadar saniye tavlama benzetimiyle iyileştirir "
+                 "(boş saatler, hoca gün sayısı, akşam dersleri).",
+        )
+        parser.add_argument(
+            '--warm-start',
+            action='store_true',
+            help="Kayıtlı programdaki yerleşimleri ilk denenecek değerler olarak kullanır; manuel ayarlanan satırlar sabit kalır.",
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help="Programı baştan kurmak yerine yalnızca değişiklikten etkilenen (geçersizleşen veya kaydı olmayan) "
+                 "dersleri yeniden yerleştirir; diğer satırlar ve manuel ayarlananlar korunur.",
+        )
+        parser.add_argument(
+            '--lns',
+            type=float,
+            default=None,
+            metavar='SANIYE',
+            help="Arama kısmi bir programla biterse yerleşmeyen dersleri bu kadar saniye büyük komşuluk "
+                 "aramasıyla (LNS) yerleştirmeye çalışır (--incremental ile varsayılan 10).",
+        )
+        parser.add_argument(
+            '--time-limit',
+            type=float,
+            default=None,
+            help="Arama için saniye cinsinden süre bütçesi. Dolarsa en iyi kısmi program ve yerleşmeyen dersler kaydedilir.",
+        )
+        parser.add_argument(
+            '--node-limit',
+            type=int,
+            default=None,
+            help="Arama için düğüm (yerleştirme denemesi) bütçesi.",
+        )
+        parser.add_argument(
+            '--semester',
+            choices=SEMESTERS,
+            default=None,
+            help="Yalnızca bu dönemin derslerini çözer ve yalnızca bu dönemin satırlarını değiştirir "
+                 "(varsayılan: her dönem ayrı bir problem olarak paralel çözülür).",
+        )
+        parser.add_argument(
+            '--single-grid',
+            action='store_true',
+            help="Dönemlere ayırmadan tüm dersleri tek bir haftalık ızgarada çözer (Güz ve Bahar dersleri çakışamaz).",
+        )
+        parser.add_argument(
+            '--academic-year',
+            default=None,
+            help="Kaydedilen satırların akademik yılı (ör. 2025-2026); verilirse yalnızca bu yılın satırları değişir.",
+        )
+        parser.add_argument(
+            '--no-precheck',
+            action='store_true',
+            help="Arama öncesi uygulanabilirlik kontrolünü (sınıf/hoca/derslik darboğazları) atlar.",
+        )
+        parser.add_argument(
+            '--report',
+            default=None,
+            metavar='DOSYA',
+            help="Çalıştırma raporunu (düğüm/geri dönüş sayıları, en büyük derinlik, kısıt türüne göre retler, "
+                 "aşama süreleri) JSON olarak bu dosyaya yazar; '-' verilirse standart çıktıya basar. Verilmezse "
+                 "rapor RUN_REPORT_DIR ayarındaki (varsayılan: proje dizininde run_reports/) zaman damgalı bir dosyaya yazılır.",
+        )
+        parser.add_argument(
+            '--trace',
+            type=int,
+            default=0,
+            metavar='N',
+            help="Aramadaki son N kısıt reddini (ders, slot, sebep) bir halka tamponda tutar ve çalıştırma sonunda "
+                 "yazdırır (--workers ile kazanan sürecin, --decompose ile her bileşenin, dönemlere ayrılan çözümde "
+                 "her dönemin izi).",
+        )
+        parser.add_argument(
+            '--trace-sample',
+            type=int,
+            default=1,
+            metavar='K',
+            help="--trace ile her K. reddi kaydeder (varsayılan 1: hepsi).",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Ders programı oluşturma işlemi başlatılıyor...")
         start_time = time.time()
         
-        scheduler = BacktrackingScheduler()
-        success = scheduler.generate_and_save()
+        if options['engine'] == 'cpsat':
+            # CP-SAT kendi içinde paralel çalışır: --workers iş parçacığı sayısı olarak kullanılır
+            scheduler = CpSatScheduler(
+                threads=options['workers'] if options['workers'] > 1 else None,
+                time_limit=options['time_limit'],
+                warm_start=options['warm_start'],
+                semester=options['semester'],
+                academic_year=options['academic_year'],
+            )
+            success = scheduler.generate_and_save(optimize_time=options['optimize'], lns_time=options['lns'],
+                                                  by_semester=not options['single_grid'])
+        else:
+            scheduler = BacktrackingScheduler(
+                strategy=options['strategy'],
+                backjumping=options['backjumping'],
+                time_limit=options['time_limit'],
+                node_limit=options['node_limit'],
+                restarts=options['restarts'],
+                room_matching=options['room_matching'],
+                symmetry_breaking=options['symmetry_breaking'],
+                warm_start=options['warm_start'],
+                trace_size=options['trace'],
+                trace_sample=options['trace_sample'],
+                precheck=not options['no_precheck'],
+                semester=options['semester'],
+                academic_year=options['academic_year'],
+            )
+            if options['incremental']:
+                success = scheduler.reschedule_and_save(lns_time=options['lns'] if options['lns'] is not None else 10.0,
+                                                        by_semester=not options['single_grid'])
+            else:
+                success = scheduler.generate_and_save(workers=options['workers'], decompose=options['decompose'],
+                                                      optimize_time=options['optimize'], lns_time=options['lns'],
+                                                      by_semester=not options['single_grid'])
         
         end_time = time.time()
         duration = end_time - start_time
         
         if success:
             self.stdout.write(self.style.SUCCESS(f'Ders programı başarıyla oluşturuldu ve kaydedildi! Süre: {duration:.2f} saniye'))
+        elif scheduler.kismi_cozum:
+            self.stdout.write(self.style.WARNING(
+                f'Bütçe doldu: kısmi program kaydedildi, {len(scheduler.yerlesmeyen_dersler_rapor)} ders yerleşmedi. Süre: {duration:.2f} saniye'))
+        else:
+            self.stdout.write(self.style.ERROR('Ders programı oluşturulamadı veya tamamlanamadı. Detaylar için loglara bakın. Süre: {duration:.2f} saniye'))
+
+        if scheduler.ret_izi is not None:
+            self.stdout.write(f"--- Ret izi (görülen {scheduler.ret_izi.gorulen} ret, son {len(scheduler.ret_izi.kayitlar)} örnek) ---")
+            for satir in scheduler.ret_izi.dump(scheduler.problem.blok_map if scheduler.problem is not None else None):
+                self.stdout.write(satir)
+
+        rapor_dosyasi = options['report']
+        if rapor_dosyasi is None:
+            # Her çalıştırmanın raporu saklanır: varsayılan olarak zaman damgalı bir dosyaya yazılır
+            rapor_dizini = Path(getattr(settings, 'RUN_REPORT_DIR', None) or Path(settings.BASE_DIR) / 'run_reports')
+            rapor_dizini.mkdir(parents=True, exist_ok=True)
+            rapor_dosyasi = rapor_dizini / f"generate_schedule_{datetime.now():%Y%m%d_%H%M%S}.json"
+        rapor = dict(scheduler.run_report(), toplam_sure=round(duration, 4))
+        rapor_json = json.dumps(rapor, ensure_ascii=False, indent=2)
+        if rapor_dosyasi == '-':
+            self.stdout.write(rapor_json)
         else:
-            self.stdout.write(self.style.ERROR('Ders programı oluşturulamadı veya tamamlanamadı. Detaylar için loglara bakın. Süre: {duration:.2f} saniye')) 
\ No newline at end of file
+            with open(rapor_dosyasi, 'w', encoding='utf-8') as f:
+                f.write(rapor_json)
+            self.stdout.write(f"Çalıştırma raporu yazıldı: {rapor_dosyasi}")
+
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from schedule.optimizer import ScheduleOptimizer
+from schedule.scheduler import BacktrackingScheduler
+from schedule.instance import ProblemInstance
+from schedule.semesters import semester_names
+import time
+
+class Command(BaseCommand):
+    help = 'Mevcut ders programını (DersProgramiSlotu) arama yapmadan yerel aramayla iyileştirir.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--time-limit',
+            type=float,
+            default=10.0,
+            help="Her dönemin iyileştirmesi için saniye cinsinden süre (varsayılan 10).",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help="Tekrarlanabilir sonuçlar için rastgele tohum.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Ders programı iyileştirme işlemi başlatılıyor...")
+        start_time = time.time()
+
+        # Dönemler ayrı ızgaralardır: her dönemin programı kendi içinde iyileştirilir
+        problem = ProblemInstance.from_database()
+        for semester in semester_names(problem):
+            scheduler = BacktrackingScheduler(seed=options['seed'], problem=problem, semester=semester)
+            scheduler.load_data()
+            scheduler.compile_domains()
+
+            hareketli_satirlar = scheduler.load_saved_program()
+
+            if not hareketli_satirlar:
+                self.stdout.write(self.style.WARNING(f"{semester}: İyileştirilecek (manuel ayarlanmamış) slot bulunamadı."))
+                continue
+
+            optimizer = ScheduleOptimizer(scheduler, time_limit=options['time_limit'], seed=options['seed'])
+            baslangic_maliyeti, son_maliyet = optimizer.optimize()
+
+            degisen_sayisi = scheduler.save_program_changes(hareketli_satirlar)
+            self.stdout.write(self.style.SUCCESS(
+                f'{semester}: Program iyileştirildi: maliyet {baslangic_maliyeti} -> {son_maliyet}, {degisen_sayisi} slot değişti.'))
+
+        duration = time.time() - start_time
+        self.stdout.write(f'Süre: {duration:.2f} saniye')
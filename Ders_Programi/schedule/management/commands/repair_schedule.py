@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from schedule.lns import ScheduleRepairer
+from schedule.scheduler import BacktrackingScheduler, STRATEGIES, STRATEGY_CHRONOLOGICAL
+from schedule.instance import ProblemInstance
+from schedule.semesters import semester_names
+import time
+
+class Command(BaseCommand):
+    help = 'Kayıtlı eksik veya bozulmuş ders programını (DersProgramiSlotu) büyük komşuluk aramasıyla (LNS) onarır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--time-limit',
+            type=float,
+            default=30.0,
+            help="Her dönemin onarımı için saniye cinsinden süre (varsayılan 30).",
+        )
+        parser.add_argument(
+            '--neighbourhood-size',
+            type=int,
+            default=30,
+            help="Her adımda serbest bırakılacak en fazla ders sayısı (varsayılan 30).",
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=STRATEGIES,
+            default=STRATEGY_CHRONOLOGICAL,
+            help="Alt aramalarda kullanılacak arama stratejisi.",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help="Tekrarlanabilir sonuçlar için rastgele tohum.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Ders programı onarım işlemi başlatılıyor...")
+        start_time = time.time()
+
+        # Dönemler ayrı ızgaralardır: her dönemin programı kendi içinde onarılır
+        problem = ProblemInstance.from_database()
+        for semester in semester_names(problem):
+            scheduler = BacktrackingScheduler(strategy=options['strategy'], seed=options['seed'], problem=problem,
+                                              semester=semester)
+            scheduler.load_data()
+            scheduler.compile_domains()
+            satirlar = scheduler.load_saved_program()
+
+            repairer = ScheduleRepairer(scheduler, time_limit=options['time_limit'],
+                                        neighbourhood_size=options['neighbourhood_size'], seed=options['seed'])
+            success = repairer.repair()
+            degisen_sayisi = scheduler.save_program_changes(satirlar)
+
+            if success:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{semester}: Program onarıldı: tüm dersler yerleşti, {degisen_sayisi} ders değişti.'))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f'{semester}: Program kısmen onarıldı: {len(scheduler.yerlesmeyen_dersler_rapor)} ders yerleşmedi, '
+                    f'{degisen_sayisi} ders değişti.'))
+                for d in scheduler.yerlesmeyen_dersler_rapor:
+                    self.stdout.write(f"- {d.ders_kodu} ({d.ders_adi})")
+
+        duration = time.time() - start_time
+        self.stdout.write(f'Süre: {duration:.2f} saniye')
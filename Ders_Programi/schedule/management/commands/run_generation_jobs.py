@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from schedule.jobs import claim_next_job, run_job
+import time
+
+class Command(BaseCommand):
+    help = 'Admin panelinden kuyruğa alınan ders programı oluşturma işlerini (GenerationJob) sırayla çalıştırır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Bekleyen işleri bitirince çık (varsayılan: yeni işleri beklemeye devam et).",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help="Kuyruk boşken yeni iş kontrolleri arasındaki saniye (varsayılan 2).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Program oluşturma işçisi başlatıldı, kuyruk dinleniyor...")
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"İş #{job.id} başlatıldı ({job.ayarlar}).")
+            start_time = time.time()
+            durum = run_job(job)
+            duration = time.time() - start_time
+            style = self.style.SUCCESS if durum == 'TAMAMLANDI' else self.style.WARNING
+            self.stdout.write(style(f"İş #{job.id} bitti: {durum}. Süre: {duration:.2f} saniye"))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0003_alter_dersprogramislotu_academic_year_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('durum', models.CharField(choices=[('BEKLIYOR', 'Bekliyor'), ('CALISIYOR', 'Çalışıyor'), ('TAMAMLANDI', 'Tamamlandı'), ('KISMI', 'Kısmi Program'), ('BASARISIZ', 'Başarısız'), ('HATA', 'Hata')], default='BEKLIYOR', max_length=10, verbose_name='Durum')),
+                ('asama', models.CharField(blank=True, max_length=50, verbose_name='Aşama')),
+                ('ayarlar', models.JSONField(blank=True, default=dict, verbose_name='Ayarlar')),
+                ('node_count', models.BigIntegerField(default=0, verbose_name='Denenen Düğüm')),
+                ('yerlesen_ders', models.IntegerField(default=0, verbose_name='Yerleşen Ders')),
+                ('toplam_ders', models.IntegerField(default=0, verbose_name='Toplam Ders')),
+                ('mesaj', models.TextField(blank=True, verbose_name='Mesaj')),
+                ('olusturulma', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma')),
+                ('baslangic', models.DateTimeField(blank=True, null=True, verbose_name='Başlangıç')),
+                ('bitis', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş')),
+            ],
+            options={
+                'verbose_name': 'Program Oluşturma İşi',
+                'verbose_name_plural': 'Program Oluşturma İşleri',
+                'ordering': ['-olusturulma'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0004_generationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='derinlik',
+            field=models.IntegerField(default=0, verbose_name='Arama Derinliği'),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='yerlestirme_hizi',
+            field=models.FloatField(default=0, verbose_name='Yerleştirme/sn'),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='yukleme_istatistikleri',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Kısıtlama Analizi'),
+        ),
+    ]
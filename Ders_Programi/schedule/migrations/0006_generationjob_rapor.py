@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0005_generationjob_progress_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='rapor',
+            field=models.JSONField(blank=True, null=True, verbose_name='Çalıştırma Raporu'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 07:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0006_generationjob_rapor'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='dersprogramislotu',
+            unique_together={('bolum', 'sinif', 'gun', 'baslangic_saati', 'academic_year', 'semester'), ('derslik', 'gun', 'baslangic_saati', 'academic_year', 'semester'), ('ogretim_uyesi', 'gun', 'baslangic_saati', 'academic_year', 'semester')},
+        ),
+    ]
@@ -138,10 +138,47 @@ class DersProgramiSlotu(models.Model):
         # Çakışmaları önlemek için unique constraintler eklenebilir
         # Örneğin: Aynı anda aynı hocanın başka dersi olamaz, aynı anda aynı sınıfın başka dersi olamaz, aynı anda aynı derslik dolu olamaz
         unique_together = [
-            ('ogretim_uyesi', 'gun', 'baslangic_saati'),
-            ('derslik', 'gun', 'baslangic_saati'),
-            ('bolum', 'sinif', 'gun', 'baslangic_saati'),
+            ('ogretim_uyesi', 'gun', 'baslangic_saati', 'academic_year', 'semester'),
+            ('derslik', 'gun', 'baslangic_saati', 'academic_year', 'semester'),
+            ('bolum', 'sinif', 'gun', 'baslangic_saati', 'academic_year', 'semester'),
         ]
 
     def __str__(self):
         return f"{self.gun} {self.baslangic_saati}-{self.bitis_saati} | {self.ders.ders_kodu} ({self.ogretim_uyesi}) @ {self.derslik}"
+
+class GenerationJob(models.Model):
+    """Arka planda (run_generation_jobs komutu) çalıştırılan ders programı oluşturma işi."""
+    DURUM_CHOICES = [
+        ('BEKLIYOR', 'Bekliyor'),
+        ('CALISIYOR', 'Çalışıyor'),
+        ('TAMAMLANDI', 'Tamamlandı'),
+        ('KISMI', 'Kısmi Program'),
+        ('BASARISIZ', 'Başarısız'),
+        ('HATA', 'Hata'),
+    ]
+    durum = models.CharField(max_length=10, choices=DURUM_CHOICES, default='BEKLIYOR', verbose_name="Durum")
+    asama = models.CharField(max_length=50, blank=True, verbose_name="Aşama")
+    ayarlar = models.JSONField(default=dict, blank=True, verbose_name="Ayarlar") # workers, time_limit, incremental
+    node_count = models.BigIntegerField(default=0, verbose_name="Denenen Düğüm")
+    yerlesen_ders = models.IntegerField(default=0, verbose_name="Yerleşen Ders")
+    toplam_ders = models.IntegerField(default=0, verbose_name="Toplam Ders")
+    derinlik = models.IntegerField(default=0, verbose_name="Arama Derinliği")
+    yerlestirme_hizi = models.FloatField(default=0, verbose_name="Yerleştirme/sn")
+    yukleme_istatistikleri = models.JSONField(default=dict, blank=True, verbose_name="Kısıtlama Analizi") # ders/derslik sayısı, gün bazında kısıtlı slotlar
+    mesaj = models.TextField(blank=True, verbose_name="Mesaj")
+    rapor = models.JSONField(null=True, blank=True, verbose_name="Çalıştırma Raporu") # BacktrackingScheduler.run_report()
+    olusturulma = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma")
+    baslangic = models.DateTimeField(null=True, blank=True, verbose_name="Başlangıç")
+    bitis = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş")
+
+    class Meta:
+        verbose_name = "Program Oluşturma İşi"
+        verbose_name_plural = "Program Oluşturma İşleri"
+        ordering = ['-olusturulma']
+
+    def __str__(self):
+        return f"#{self.id} {self.get_durum_display()} ({self.olusturulma:%Y-%m-%d %H:%M})"
+
+    @property
+    def bitti(self):
+        return self.durum not in ('BEKLIYOR', 'CALISIYOR')
@@ -0,0 +1,238 @@
+# schedule/optimizer.py
+
+# Program kalitesi için yerel arama: tüm sert kısıtları sağlayan bir programı tavlama benzetimi
+# (simulated annealing) ile iyileştirir. Yumuşak hedefler: sınıfların gün içindeki boş saatleri,
+# hocaların ders verdiği gün sayısı ve akşam saatlerinin kullanımı.
+# Bir hamlenin maliyet farkı yalnızca etkilenen (sınıf, gün) ve (hoca, gün) çiftlerinden sabit
+# sürede hesaplanır; program hiçbir zaman yeniden puanlanmaz ve arama yeniden çalıştırılmaz.
+
+import datetime
+import math
+import random
+import time
+from collections import defaultdict
+
+from .scheduler import TIME_SLOTS, DAYS, DAY_MASKS, RUN_MASKS, RUN_INDEX, RUN_SPANS, mask_slots
+
+SAAT_SAYISI = len(TIME_SLOTS)
+GUN_MASKESI = (1 << SAAT_SAYISI) - 1
+
+# Yumuşak hedef ağırlıkları
+BOSLUK_AGIRLIGI = 3 # Bir sınıfın gün içinde iki dersi arasındaki her boş saat
+HOCA_GUN_AGIRLIGI = 2 # Bir hocanın ders verdiği her gün
+AKSAM_AGIRLIGI = 5 # 17:00 ve sonrasında başlayan her ders saati dilimi
+AKSAM_BASLANGICI = datetime.time(17, 0)
+SAAT_CEZALARI = [AKSAM_AGIRLIGI if start >= AKSAM_BASLANGICI else 0 for start, _ in TIME_SLOTS]
+# Koşu maskesi -> koşunun slotlarının akşam cezaları toplamı (bkz. scheduler.RUN_SPANS)
+KOSU_CEZALARI = {maske: sum(SAAT_CEZALARI[slot_no % SAAT_SAYISI] for slot_no in mask_slots(maske)) for maske in RUN_SPANS}
+
+def _bosluk(gunluk):
+    """Bir günün saat maskesinde ilk ve son ders arasındaki boş saat sayısı."""
+    if not gunluk:
+        return 0
+    ilk = (gunluk & -gunluk).bit_length() - 1
+    return gunluk.bit_length() - ilk - gunluk.bit_count()
+
+class ScheduleOptimizer:
+    """scheduler.program_state üzerindeki programı yumuşak hedeflere göre iyileştirir.
+
+    Hamleler: bir dersi (bloğu) aday (slot, hoca, derslik) üçlülerinden birine taşımak veya aynı
+    sınıfın iki dersinin saatlerini değiştirmek. Sert kısıtlar (çakışmalar, genel/hoca kısıtları,
+    LAB/kapasite, aynı dersin bloklarının farklı günlerde olması) compile_domains adayları ve
+    doluluk maskeleriyle korunur.
+    scheduler.sabit_yerlesimler (ör. manuel ayarlanan slotlar) yerinden oynatılmaz, yalnızca
+    doluluk olarak hesaba katılır.
+    """
+
+    def __init__(self, scheduler, time_limit=5.0, seed=None):
+        self.scheduler = scheduler
+        self.time_limit = time_limit # saniye
+        self.rng = random.Random(seed) if seed is not None else random
+
+        self.yerlesim = {} # ders_id -> (slot_no, derslik_id, hoca_id)
+        self.sinif_maskeleri = defaultdict(int) # (bolum_id, sinif) -> dolu slotların bit maskesi
+        self.hoca_maskeleri = defaultdict(int)
+        self.derslik_maskeleri = defaultdict(int)
+        self.sinif_anahtari = {} # ders_id -> (bolum_id, sinif)
+        self.kosular = {} # ders_id -> {başlangıç slot_no: koşu maskesi} (bkz. scheduler.RUN_MASKS)
+        self.ust_ders = {} # blok id -> dersin id'si
+        self.gun_maskeleri = defaultdict(int) # dersin id'si -> bloklarının yerleştiği günlerin maskesi
+        self.sinif_dersleri = defaultdict(list) # (bolum_id, sinif) -> [hareket edebilen ders_id]
+        self.adaylar = {} # ders_id -> [(slot_no, hoca_id)]
+        self.izinli = {} # ders_id -> {(slot_no, hoca_id)}
+        self.derslik_adaylari = {} # ders_id -> [derslik_id]
+        self.maliyet = 0
+        self.iterasyon = 0
+        self.kabul = 0
+
+    def _kur(self):
+        """Durumu program_state'ten kurar ve başlangıç maliyetini hesaplar."""
+        scheduler = self.scheduler
+        if not scheduler.ders_adaylari:
+            # Portföy/ayrıştırma sonrası ana süreçte aday alanları henüz derlenmemiş olabilir
+            scheduler.load_data()
+            scheduler.compile_domains()
+        ders_map = {ders.id: ders for ders in scheduler.dersler_listesi}
+
+        # Sabit yerleşimler yalnızca doluluk olarak işlenir
+        sabit_idler = set()
+        for ders, slot_no, derslik, hoca in scheduler.sabit_yerlesimler:
+            bit = RUN_MASKS[ders.blok_saati][slot_no]
+            self.sinif_maskeleri[(ders.bolum_id, ders.sinif)] |= bit
+            self.hoca_maskeleri[hoca.id] |= bit
+            self.derslik_maskeleri[derslik.id] |= bit
+            self.gun_maskeleri[ders.ders_id] |= DAY_MASKS[slot_no // SAAT_SAYISI]
+            sabit_idler.add(ders.id)
+
+        for ders_id, (gun, saat_tuple, derslik_id, hoca_id) in scheduler.program_state.items():
+            ders = ders_map.get(ders_id)
+            if ders_id in sabit_idler or ders is None:
+                continue
+            self.sinif_anahtari[ders_id] = (ders.bolum_id, ders.sinif)
+            self.kosular[ders_id] = RUN_MASKS[ders.blok_saati]
+            self.ust_ders[ders_id] = ders.ders_id
+            self._ekle(ders_id, (RUN_INDEX[(gun, saat_tuple)][0], derslik_id, hoca_id))
+            adaylar = [(slot_no, hoca.id) for gunluk in scheduler.ders_adaylari[ders_id] for slot_no, hocalar in gunluk for hoca in hocalar]
+            self.adaylar[ders_id] = adaylar
+            self.izinli[ders_id] = set(adaylar)
+            self.derslik_adaylari[ders_id] = [d.id for d in scheduler.ders_derslikleri[ders_id]]
+            self.sinif_dersleri[self.sinif_anahtari[ders_id]].append(ders_id)
+
+        self.maliyet = sum(self.maliyet_dokumu().values())
+
+    def maliyet_dokumu(self):
+        """Toplam maliyeti hedef bazında döner (raporlama için)."""
+        bosluk = sum(_bosluk((maske >> (gun_no * SAAT_SAYISI)) & GUN_MASKESI)
+                     for maske in self.sinif_maskeleri.values() for gun_no in range(len(DAYS)))
+        hoca_gun = sum(1 for maske in self.hoca_maskeleri.values() for gun_no in range(len(DAYS))
+                       if (maske >> (gun_no * SAAT_SAYISI)) & GUN_MASKESI)
+        aksam = sum(KOSU_CEZALARI[self.kosular[ders_id][slot_no]] for ders_id, (slot_no, _, _) in self.yerlesim.items())
+        return {'bosluk': BOSLUK_AGIRLIGI * bosluk, 'hoca_gun': HOCA_GUN_AGIRLIGI * hoca_gun, 'aksam': aksam}
+
+    def _ekle(self, ders_id, deger):
+        slot_no, derslik_id, hoca_id = deger
+        bit = self.kosular[ders_id][slot_no]
+        self.yerlesim[ders_id] = deger
+        self.sinif_maskeleri[self.sinif_anahtari[ders_id]] |= bit
+        self.hoca_maskeleri[hoca_id] |= bit
+        self.derslik_maskeleri[derslik_id] |= bit
+        self.gun_maskeleri[self.ust_ders[ders_id]] |= DAY_MASKS[slot_no // SAAT_SAYISI]
+
+    def _kaldir(self, ders_id):
+        slot_no, derslik_id, hoca_id = self.yerlesim.pop(ders_id)
+        bit = self.kosular[ders_id][slot_no]
+        self.sinif_maskeleri[self.sinif_anahtari[ders_id]] ^= bit
+        self.hoca_maskeleri[hoca_id] ^= bit
+        self.derslik_maskeleri[derslik_id] ^= bit
+        self.gun_maskeleri[self.ust_ders[ders_id]] ^= DAY_MASKS[slot_no // SAAT_SAYISI]
+
+    def _bos_mu(self, ders_id, deger):
+        slot_no, derslik_id, hoca_id = deger
+        bit = self.kosular[ders_id][slot_no]
+        return not ((self.sinif_maskeleri[self.sinif_anahtari[ders_id]] | self.hoca_maskeleri[hoca_id]
+                     | self.derslik_maskeleri[derslik_id] | self.gun_maskeleri[self.ust_ders[ders_id]]) & bit)
+
+    def _yerel_maliyet(self, sinif_gunleri, hoca_gunleri):
+        """Yalnızca verilen (sınıf, gün) ve (hoca, gün) çiftlerinin maliyeti."""
+        toplam = 0
+        for key, gun_no in sinif_gunleri:
+            toplam += BOSLUK_AGIRLIGI * _bosluk((self.sinif_maskeleri[key] >> (gun_no * SAAT_SAYISI)) & GUN_MASKESI)
+        for hoca_id, gun_no in hoca_gunleri:
+            if (self.hoca_maskeleri[hoca_id] >> (gun_no * SAAT_SAYISI)) & GUN_MASKESI:
+                toplam += HOCA_GUN_AGIRLIGI
+        return toplam
+
+    def _uygula(self, degisiklikler):
+        """[(ders_id, yeni_deger)] değişikliklerini uygular ve maliyet farkını döner.
+
+        Sert kısıt ihlali varsa hiçbir şey değiştirmeden None döner.
+        """
+        sinif_gunleri = set()
+        hoca_gunleri = set()
+        eskiler = []
+        fark = 0
+        for ders_id, yeni in degisiklikler:
+            eski = self.yerlesim[ders_id]
+            eskiler.append((ders_id, eski))
+            for slot_no, _, hoca_id in (eski, yeni):
+                sinif_gunleri.add((self.sinif_anahtari[ders_id], slot_no // SAAT_SAYISI))
+                hoca_gunleri.add((hoca_id, slot_no // SAAT_SAYISI))
+            kosular = self.kosular[ders_id]
+            fark += KOSU_CEZALARI[kosular[yeni[0]]] - KOSU_CEZALARI[kosular[eski[0]]]
+
+        once = self._yerel_maliyet(sinif_gunleri, hoca_gunleri)
+        for ders_id, _ in degisiklikler:
+            self._kaldir(ders_id)
+        eklenen = []
+        for ders_id, yeni in degisiklikler:
+            if not self._bos_mu(ders_id, yeni):
+                for geri_id in eklenen:
+                    self._kaldir(geri_id)
+                for geri_id, eski in eskiler:
+                    self._ekle(geri_id, eski)
+                return None
+            self._ekle(ders_id, yeni)
+            eklenen.append(ders_id)
+        return fark + self._yerel_maliyet(sinif_gunleri, hoca_gunleri) - once
+
+    def _hamle_sec(self):
+        """Rastgele bir taşıma veya aynı sınıf içinde saat değişimi hamlesi üretir."""
+        ders_id = self.rng.choice(self.hareketli)
+        slot_no, derslik_id, hoca_id = self.yerlesim[ders_id]
+        if self.rng.random() < 0.5:
+            diger_id = self.rng.choice(self.sinif_dersleri[self.sinif_anahtari[ders_id]])
+            if diger_id != ders_id:
+                diger_slot, diger_derslik, diger_hoca = self.yerlesim[diger_id]
+                if (diger_slot, hoca_id) in self.izinli[ders_id] and (slot_no, diger_hoca) in self.izinli[diger_id]:
+                    return [(ders_id, (diger_slot, derslik_id, hoca_id)), (diger_id, (slot_no, diger_derslik, diger_hoca))]
+        yeni_slot, yeni_hoca = self.rng.choice(self.adaylar[ders_id])
+        # Derslik çoğunlukla korunur; bazen başka uygun bir derslik denenir
+        if self.rng.random() < 0.5 or derslik_id not in self.derslik_adaylari[ders_id]:
+            derslik_id = self.rng.choice(self.derslik_adaylari[ders_id])
+        return [(ders_id, (yeni_slot, derslik_id, yeni_hoca))]
+
+    def optimize(self):
+        """Tavlama benzetimini time_limit boyunca çalıştırır; en iyi programı program_state'e yazar.
+
+        (başlangıç maliyeti, son maliyet) döner.
+        """
+        self._kur()
+        baslangic_maliyeti = self.maliyet
+        self.hareketli = [ders_id for ders_id in self.adaylar if self.adaylar[ders_id] and self.derslik_adaylari[ders_id]]
+        if not self.hareketli:
+            return baslangic_maliyeti, baslangic_maliyeti
+        en_iyi = dict(self.yerlesim)
+        en_iyi_maliyet = self.maliyet
+
+        baslangic_sicakligi = float(max(BOSLUK_AGIRLIGI, HOCA_GUN_AGIRLIGI, AKSAM_AGIRLIGI))
+        sicaklik = baslangic_sicakligi
+        baslangic = time.monotonic()
+        while True:
+            if self.iterasyon % 256 == 0:
+                gecen = time.monotonic() - baslangic
+                if gecen >= self.time_limit:
+                    break
+                # Doğrusal soğutma; sona doğru neredeyse yalnızca iyileştiren hamleler kabul edilir
+                sicaklik = baslangic_sicakligi * (1 - gecen / self.time_limit) + 0.01
+            self.iterasyon += 1
+
+            degisiklikler = self._hamle_sec()
+            eskiler = [(ders_id, self.yerlesim[ders_id]) for ders_id, _ in degisiklikler]
+            fark = self._uygula(degisiklikler)
+            if fark is None:
+                continue
+            if fark <= 0 or self.rng.random() < math.exp(-fark / sicaklik):
+                self.kabul += 1
+                self.maliyet += fark
+                if self.maliyet < en_iyi_maliyet:
+                    en_iyi_maliyet = self.maliyet
+                    en_iyi = dict(self.yerlesim)
+            else:
+                self._uygula(eskiler) # Eski yerleşim her zaman geçerlidir
+
+        for ders_id, (slot_no, derslik_id, hoca_id) in en_iyi.items():
+            gun, saat_tuple = RUN_SPANS[self.kosular[ders_id][slot_no]]
+            self.scheduler.program_state[ders_id] = (gun, saat_tuple, derslik_id, hoca_id)
+        print(f"Optimizasyon: maliyet {baslangic_maliyeti} -> {en_iyi_maliyet} "
+              f"({self.iterasyon} hamle, {self.kabul} kabul).")
+        return baslangic_maliyeti, en_iyi_maliyet
@@ -0,0 +1,142 @@
+# schedule/portfolio.py
+
+# Paralel çözücü portföyü: aynı problemi farklı tohum ve stratejilerle birden fazla süreçte
+# çözer, ilk tam çözümü alır ve diğer süreçleri sonlandırır.
+# Not: Bu modül üst düzeyde model import etmez; 'spawn' ile başlayan süreçler önce Django'yu kurar.
+
+import multiprocessing
+import queue
+import random
+
+from django.db import connections
+
+# Portföydeki süreçlere sırayla dağıtılan (strateji, geri sıçrama, yeniden başlatma) yapılandırmaları
+PORTFOLIO_CONFIGS = [
+    ('mrv', False, False),
+    ('chronological', True, True),
+    ('chronological', False, True),
+    ('chronological', False, False),
+]
+
+def _portfolio_worker(worker_no, ayarlar, sonuc_kuyrugu):
+    """Tek bir portföy sürecinde çözücüyü ayarlar (kurucu argümanları) ile çalıştırır ve sonucu kuyruğa yazar."""
+    import django
+    from django.apps import apps
+    if not apps.ready: # 'spawn' ile başlatılan süreçlerde Django henüz kurulmamıştır
+        django.setup()
+    from .scheduler import BacktrackingScheduler
+
+    try:
+        scheduler = BacktrackingScheduler(**ayarlar)
+        success = scheduler.solve()
+        sonuc_kuyrugu.put({
+            'worker': worker_no,
+            'success': success,
+            'strategy': scheduler.strategy,
+            'backjumping': scheduler.backjumping,
+            'restarts': scheduler.restarts,
+            'seed': scheduler.seed,
+            'node_count': scheduler.node_count,
+            'sayaclar': scheduler.counters(),
+            'kismi_cozum': scheduler.kismi_cozum,
+            'program_state': scheduler.program_state if success or scheduler.kismi_cozum else {},
+            'yerlesmeyen_ders_idleri': [d.id for d in scheduler.yerlesmeyen_dersler_rapor],
+            'ret_izi': (scheduler.ret_izi.gorulen, list(scheduler.ret_izi.kayitlar)) if scheduler.ret_izi is not None else None,
+        })
+    except Exception as e:
+        sonuc_kuyrugu.put({'worker': worker_no, 'success': False, 'error': str(e)})
+    finally:
+        connections.close_all()
+
+def solve_portfolio(scheduler, workers, base_seed=None, time_limit=None, node_limit=None):
+    """workers adet süreçle portföy çözümü yapar; kazanan çözümü scheduler'a aktarır.
+
+    Herhangi bir süreç çözüm bulduğunda diğerleri sonlandırılır. Tüm süreçler çözümsüz
+    biterse False döner; bütçe verilmişse en çok dersi yerleştiren kısmi çözüm aktarılır.
+    """
+    from .instance import ProblemInstance
+
+    if scheduler.problem is None:
+        # Veritabanı bir kez okunur; süreçler derlenmiş örneği sorgu yapmadan kullanır
+        scheduler.problem = ProblemInstance.from_database()
+    if scheduler.precheck:
+        # Darboğaz varsa süreç başlatmadan (bütçe yoksa) başarısız olunur
+        scheduler.load_data()
+        scheduler.compile_domains()
+        if scheduler.warm_start:
+            scheduler.load_hints()
+        if not scheduler.run_precheck():
+            return False
+    if base_seed is None:
+        base_seed = random.randrange(1 << 30)
+
+    # Süreçler ana sürecin veritabanı bağlantısını paylaşmamalı
+    connections.close_all()
+
+    sonuc_kuyrugu = multiprocessing.Queue()
+    surecler = []
+    for worker_no in range(workers):
+        strategy, backjumping, restarts = PORTFOLIO_CONFIGS[worker_no % len(PORTFOLIO_CONFIGS)]
+        # Süreçler kullanıcının seçtiği ayarlarla kurulur; yalnızca portföy yapılandırması değişir.
+        # İlerleme bildirimi süreçlere aktarılmaz (aynı anda çalışan aramalar aynı işi güncellerdi).
+        ayarlar = dict(scheduler.subproblem_settings(), strategy=strategy, backjumping=backjumping, restarts=restarts,
+                       seed=base_seed + worker_no, time_limit=time_limit, node_limit=node_limit,
+                       semester=scheduler.semester, progress_callback=None,
+                       precheck=False) # Ön kontrol ana süreçte bir kez yapıldı
+        surec = multiprocessing.Process(
+            target=_portfolio_worker,
+            args=(worker_no, ayarlar, sonuc_kuyrugu),
+            daemon=True,
+        )
+        surec.start()
+        surecler.append(surec)
+    print(f"Portföy başlatıldı: {workers} süreç (taban tohum {base_seed}).")
+
+    kazanan = None
+    son_sonuc = None
+    en_iyi_kismi = None
+    bekleyen = workers
+    try:
+        while bekleyen and kazanan is None:
+            try:
+                sonuc = sonuc_kuyrugu.get(timeout=1)
+            except queue.Empty:
+                # Kuyruğa yazamadan ölen süreçleri say
+                if not any(surec.is_alive() for surec in surecler) and sonuc_kuyrugu.empty():
+                    break
+                continue
+            bekleyen -= 1
+            son_sonuc = sonuc
+            if sonuc.get('error'):
+                print(f"Uyarı: Portföy süreci {sonuc['worker']} hata verdi: {sonuc['error']}")
+            elif sonuc['success']:
+                kazanan = sonuc
+            elif sonuc['kismi_cozum'] and (en_iyi_kismi is None or
+                                           len(sonuc['program_state']) > len(en_iyi_kismi['program_state'])):
+                en_iyi_kismi = sonuc
+    finally:
+        # Kazanan bulundu (veya hepsi bitti): kalan süreçleri iptal et
+        for surec in surecler:
+            if surec.is_alive():
+                surec.terminate()
+        for surec in surecler:
+            surec.join()
+
+    sonuc = kazanan or en_iyi_kismi or son_sonuc
+    if sonuc is None or sonuc.get('error'):
+        return False
+
+    if kazanan:
+        print(f"Portföy kazananı: süreç {kazanan['worker']} ({kazanan['strategy']}"
+              f"{', backjumping' if kazanan['backjumping'] else ''}"
+              f"{', restarts' if kazanan['restarts'] else ''}, tohum {kazanan['seed']}), "
+              f"{kazanan['node_count']} düğüm.")
+    scheduler.program_state = dict(sonuc['program_state'])
+    scheduler.kismi_cozum = kazanan is None and sonuc['kismi_cozum']
+    # Raporda aktarılan çözümü üreten sürecin sayaçları yer alır (aday alanları o süreçte derlendi)
+    scheduler.merge_counters(sonuc['sayaclar'], statik=True)
+    blok_map = scheduler.problem.blok_map
+    scheduler.yerlesmeyen_dersler_rapor = [blok_map[i] for i in sonuc['yerlesmeyen_ders_idleri'] if i in blok_map]
+    if scheduler.ret_izi is not None and sonuc['ret_izi'] is not None:
+        scheduler.ret_izi.merge(*sonuc['ret_izi'])
+    return kazanan is not None
@@ -1,11 +1,13 @@
 # schedule/scheduler.py
 
-from .models import Ders, OgretimUyesi, Derslik, OgretimUyesiKisiti, DersProgramiSlotu, Bolum, GlobalKisiti
+from .models import DersProgramiSlotu
 from django.db import transaction
-from collections import defaultdict
+from django.db.models import Q
+from collections import defaultdict, deque
 import datetime
 import copy # Durumu kopyalamak için
 import random
+import time
 
 # Zaman aralıkları ve günler (views.py'deki ile aynı veya ortak bir yerden alınabilir)
 # Sabit olarak burada tanımlayalım
@@ -15,271 +17,1769 @@ TIME_SLOTS = (
 )
 DAYS = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma']
 
+# Gün x saat ızgarası: her (gün, saat_tuple) çifti tek bir bit pozisyonuna karşılık gelir.
+# Hoca/derslik/sınıf doluluğu bu pozisyonlarla indekslenen tamsayı bit maskeleri olarak tutulur.
+SLOTS = [(gun, saat_tuple) for gun in DAYS for saat_tuple in TIME_SLOTS]
+SLOT_INDEX = {slot: i for i, slot in enumerate(SLOTS)}
+SLOT_BITS = [1 << i for i in range(len(SLOTS))]
+# Her günün tüm saatlerini kapsayan maske (günlük sayım/analiz için)
+DAY_MASKS = [((1 << len(TIME_SLOTS)) - 1) << (i * len(TIME_SLOTS)) for i in range(len(DAYS))]
+
+def split_blocks(haftalik_saat):
+    """Haftalık ders saatini farklı günlere konacak blok sürelerine böler: 1 -> [1], 3 -> [2, 1], 4 -> [2, 2].
+
+    Bloklar 2 saattir; blok sayısı gün sayısını aşacaksa bloklar uzatılır. Saati girilmemiş
+    dersler için blok yoktur (ders programa konmaz).
+    """
+    if not haftalik_saat:
+        return []
+    uzunluk = max(2, -(-haftalik_saat // len(DAYS)))
+    bloklar = [uzunluk] * (haftalik_saat // uzunluk)
+    if haftalik_saat % uzunluk:
+        bloklar.append(haftalik_saat % uzunluk)
+    return bloklar
+
+def mask_slots(maske):
+    """Maskedeki slot numaralarını küçükten büyüğe döner."""
+    slotlar = []
+    while maske:
+        en_dusuk = maske & -maske
+        slotlar.append(en_dusuk.bit_length() - 1)
+        maske ^= en_dusuk
+    return slotlar
+
+def _build_runs():
+    """Gün içindeki ardışık slot koşularının tablolarını kurar (bkz. RUN_MASKS).
+
+    Bir blok süresi için koşu, bir slottan başlayıp aynı gün bitişik slotlarla toplam süresi tam
+    olarak blok süresi olan slot dizisidir: 2 saatlik blok 09-10 + 10-11'e ya da tek başına 17-19'a
+    yerleşir, 1 saatlik blok 17-19'a yerleşemez. Böyle koşusu olmayan bir sürenin bloğu yerleşemez.
+    Anahtar 0, kayıtlı satırların (sabit yerleşimler) süresinden bağımsız tek slotluk koşularıdır.
+    """
+    saat_sayisi = len(TIME_SLOTS)
+    dakikalar = [(bitis.hour * 60 + bitis.minute) - (bas.hour * 60 + bas.minute) for bas, bitis in TIME_SLOTS]
+    gunluk_saat = sum(dakikalar) // 60
+    maskeler = {blok_saati: {} for blok_saati in range(gunluk_saat + 1)}
+    indeks = {}
+    for gun_no, gun in enumerate(DAYS):
+        for ilk in range(saat_sayisi):
+            maske = 0
+            toplam = 0
+            for son in range(ilk, saat_sayisi):
+                if son > ilk and TIME_SLOTS[son - 1][1] != TIME_SLOTS[son][0]:
+                    break # Arada boşluk var: koşu bitişik değil
+                maske |= SLOT_BITS[gun_no * saat_sayisi + son]
+                toplam += dakikalar[son]
+                if son == ilk:
+                    maskeler[0][gun_no * saat_sayisi + ilk] = maske
+                if toplam % 60 == 0:
+                    maskeler[toplam // 60][gun_no * saat_sayisi + ilk] = maske
+                indeks[(gun, (TIME_SLOTS[ilk][0], TIME_SLOTS[son][1]))] = (gun_no * saat_sayisi + ilk, maske)
+    kapsayanlar = {}
+    for blok_saati, kosular in maskeler.items():
+        tablo = [0] * len(SLOTS)
+        for ilk, maske in kosular.items():
+            for slot_no in mask_slots(maske):
+                tablo[slot_no] |= SLOT_BITS[ilk]
+        kapsayanlar[blok_saati] = tablo
+    return maskeler, indeks, kapsayanlar
+
+# Ardışık slot koşuları (bloklar için):
+# RUN_MASKS[blok_saati] = {ilk slot_no: koşunun kapladığı slotların maskesi} (her gün için önceden hesaplanır),
+# RUN_INDEX[(gun, (başlangıç, bitiş))] = (ilk slot_no, maske), RUN_SPANS[maske] = (gun, (başlangıç, bitiş)),
+# RUN_COVERS[blok_saati][slot_no] = koşusu bu slotu kaplayan başlangıç slotlarının maskesi.
+# Koşuların süresi blok süresine eşittir; RUN_MASKS[0][n] == SLOT_BITS[n] (bkz. instance.DersKaydi).
+RUN_MASKS, RUN_INDEX, RUN_COVERS = _build_runs()
+RUN_SPANS = {maske: slot for slot, (_, maske) in RUN_INDEX.items()}
+
+def match_saved_runs(bloklar, satirlar):
+    """Bir dersin kayıtlı [(slot_no, satır)] listesini ardışık koşulara ayırıp dersin bloklarıyla eşleştirir.
+
+    Aynı gün bitişik, aynı derslik ve hocalı satırlar tek koşudur; her blok (uzundan kısaya)
+    kendi süresindeki koşuya (bkz. RUN_MASKS) birebir uyan ilk koşuyu alır.
+    ({blok_id: (ilk slot_no, [satırlar])}, tüm satırlar ve bloklar eşleşti mi) döner.
+    """
+    kosular = [] # [(ilk slot_no, maske, [satırlar])]
+    onceki = None
+    for slot_no, satir in sorted(satirlar, key=lambda kayit: kayit[0]):
+        if (onceki is not None and slot_no == onceki[0] + 1 and slot_no % len(TIME_SLOTS) != 0
+                and onceki[1].bitis_saati == satir.baslangic_saati
+                and (onceki[1].derslik_id, onceki[1].ogretim_uyesi_id) == (satir.derslik_id, satir.ogretim_uyesi_id)):
+            ilk, maske, kosu_satirlari = kosular[-1]
+            kosular[-1] = (ilk, maske | SLOT_BITS[slot_no], kosu_satirlari + [satir])
+        else:
+            kosular.append((slot_no, SLOT_BITS[slot_no], [satir]))
+        onceki = (slot_no, satir)
+
+    eslesme = {}
+    kullanilan = set()
+    for blok in sorted(bloklar, key=lambda b: -b.blok_saati):
+        blok_kosulari = RUN_MASKS.get(blok.blok_saati, {})
+        for i, (ilk, maske, kosu_satirlari) in enumerate(kosular):
+            if i not in kullanilan and blok_kosulari.get(ilk) == maske:
+                kullanilan.add(i)
+                eslesme[blok.id] = (ilk, kosu_satirlari)
+                break
+    return eslesme, len(kullanilan) == len(kosular) and len(eslesme) == len(bloklar)
+
+# Kayıt sırasında tek sorguda eklenecek en fazla satır (bulk_create parti boyutu)
+KAYIT_PARTI_BOYUTU = 1000
+
+# Dönemler: güz ve bahar dersleri aynı anda yapılmaz, her dönem ayrı bir problem olarak çözülür
+SEMESTER_GUZ = 'Güz'
+SEMESTER_BAHAR = 'Bahar'
+SEMESTER_BILINMIYOR = 'Bilinmiyor' # Dönemi girilmemiş dersler
+SEMESTERS = (SEMESTER_GUZ, SEMESTER_BAHAR, SEMESTER_BILINMIYOR)
+DEFAULT_ACADEMIC_YEAR = "DEFAULT_YEAR"
+
+def semester_name(donem):
+    """Ders.donem (1-8) değerinin dönem adını döner: tekler Güz, çiftler Bahar."""
+    if not donem:
+        return SEMESTER_BILINMIYOR
+    return SEMESTER_GUZ if donem % 2 != 0 else SEMESTER_BAHAR
+
+# Arama stratejileri
+STRATEGY_CHRONOLOGICAL = 'chronological' # Sabit (karıştırılmış) ders sırası ile klasik backtracking
+STRATEGY_MRV = 'mrv' # En az aday değeri kalan ders önce + ileri kontrol (forward checking)
+STRATEGIES = (STRATEGY_CHRONOLOGICAL, STRATEGY_MRV)
+
+# Çalıştırma raporundaki ret (kısıt ihlali) türleri. Statik türler compile_domains'te aday
+# alanlarından elenen çiftler olarak bir kez sayılır; diğerleri aramada her redde artırılır.
+RED_TURLERI = ('global', 'hoca_kisiti', 'hoca_dolu', 'derslik_dolu', 'derslik_tipi', 'kapasite', 'sinif_dolu',
+               'blok_gunu', 'ileri_kontrol')
+STATIK_RED_TURLERI = ('global', 'hoca_kisiti', 'derslik_tipi', 'kapasite')
+
+def luby(i):
+    """Luby dizisinin i. elemanını (1'den başlayarak) döner: 1, 1, 2, 1, 1, 2, 4, 1, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        # i, 2^(k-1)-1 uzunluğundaki önceki bloğun tekrarına düşer
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+class RejectionTrace:
+    """Örneklenmiş ret izi: her ornekleme'inci reddi ham (tür, ders_id, slot_no, kaynak_id) olarak
+    en fazla boyut kayıtlık bir halka tamponda tutar.
+
+    Aramada hiçbir metin oluşturulmaz; satırlar yalnızca dump() çağrılınca biçimlenir.
+    """
+    __slots__ = ('kayitlar', 'ornekleme', 'gorulen')
+
+    def __init__(self, boyut, ornekleme=1):
+        self.kayitlar = deque(maxlen=boyut)
+        self.ornekleme = max(1, ornekleme)
+        self.gorulen = 0 # Örneklenmeden önce görülen toplam ret
+
+    def record(self, tur, ders_id, slot_no, kaynak_id=None):
+        self.gorulen += 1
+        if self.gorulen % self.ornekleme == 0:
+            self.kayitlar.append((tur, ders_id, slot_no, kaynak_id))
+
+    def merge(self, gorulen, kayitlar):
+        """Başka bir süreçteki izin (gorulen, kayitlar) özetini bu ize ekler."""
+        self.gorulen += gorulen
+        self.kayitlar.extend(kayitlar)
+
+    def dump(self, ders_map=None):
+        """Tampondaki kayıtları okunabilir satırlar olarak döner (en eskiden en yeniye)."""
+        satirlar = []
+        for tur, ders_id, slot_no, kaynak_id in self.kayitlar:
+            gun, (start_time, end_time) = SLOTS[slot_no]
+            ders = ders_map.get(ders_id) if ders_map else None
+            ders_adi = ders.ders_kodu if ders is not None else f"Ders #{ders_id}"
+            satir = f"[Kısıt İhlali | {ders_adi} @ {gun} {start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}] {tur}"
+            if kaynak_id is not None:
+                satir += f" (#{kaynak_id})"
+            satirlar.append(satir)
+        return satirlar
+
+class _Karar:
+    """Arama yığınındaki tek bir karar seviyesi: bir ders ve onun değer imleci.
+
+    Rekürsif sürümdeki iç içe döngülerin durumunu (gün/saat/derslik/hoca pozisyonları)
+    açıkça tutar; böylece arama incelenebilir ve istenen noktada askıya alınabilir.
+    """
+    __slots__ = ('ders', 'gunler', 'gun_pos', 'aday_pos', 'derslik_pos', 'hoca_pos',
+                 'yerlesim', 'iz_uzunlugu', 'atlandi', 'catisma', 'denenen_derslikler', 'denenen_hocalar',
+                 'ipucu_denendi')
+
+    def __init__(self, ders):
+        self.ders = ders
+        self.gunler = list(range(len(DAYS)))
+        self.gun_pos = 0
+        self.aday_pos = 0
+        self.derslik_pos = 0
+        self.hoca_pos = 0
+        self.yerlesim = None # Şu anki (slot_no, derslik, hoca) yerleştirmesi
+        self.iz_uzunlugu = 0 # Yerleştirme öncesi budama_izi uzunluğu
+        self.atlandi = False # Hocası olmadığı için atlanan ders
+        self.catisma = set() # Geri sıçrama için: bu seviyenin değerlerini eleyen seviyeler
+        self.denenen_derslikler = set() # Simetri kırma: bu slotta denenmiş derslik sınıfları
+        self.denenen_hocalar = set() # Simetri kırma: bu slot/derslikte denenmiş hoca sınıfları
+        self.ipucu_denendi = False # Sıcak başlangıç: önceki yerleşim denendi mi?
+
 class BacktrackingScheduler:
-    def __init__(self):
+    def __init__(self, strategy=STRATEGY_CHRONOLOGICAL, backjumping=False, seed=None,
+                 time_limit=None, node_limit=None, restarts=False, restart_base=100, ders_idleri=None,
+                 room_matching=False, symmetry_breaking=False, warm_start=False, problem=None,
+                 progress_callback=None, trace_size=0, trace_sample=1, precheck=True, semester=None,
+                 academic_year=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Bilinmeyen arama stratejisi: {strategy}")
+        if backjumping and strategy != STRATEGY_CHRONOLOGICAL:
+            # İleri kontrol budamalarının suçluları izlenmediği için çatışma kümeleri eksik kalır
+            raise ValueError("Geri sıçrama (backjumping) yalnızca 'chronological' stratejisiyle kullanılabilir.")
+        self.strategy = strategy
+        self.backjumping = backjumping
+        # Ders/gün karıştırmaları için örneğe özel rastgele üreteç (paralel çözücüler farklı tohum kullanır).
+        # Tohum verilmezse modül düzeyindeki üreteç kullanılır.
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
+
+        # Zaman/düğüm bütçesi (anytime mod): bütçe dolarsa en iyi kısmi çözüm kaydedilir
+        self.time_limit = time_limit # saniye
+        self.node_limit = node_limit
+        self.anytime = time_limit is not None or node_limit is not None
+
+        # Yeniden başlatma: her çalıştırmanın geri dönüş sınırı Luby dizisi x restart_base
+        self.restarts = restarts
+        self.restart_base = restart_base
+
+        # Derslik eşleştirme modu: arama yalnızca (slot, hoca) üzerinde dallanır; derslikler her
+        # slotta artırımlı iki parçalı eşleştirme (augmenting path) ile atanır (bkz. _oda_ara)
+        self.room_matching = room_matching
+
+        # Simetri kırma: bir slotta birbirinin yerine geçebilen derslik/hocalardan yalnızca biri denenir
+        self.symmetry_breaking = symmetry_breaking
+
+        # Sıcak başlangıç: kayıtlı programdaki yerleşimler ilk denenecek değerlerdir,
+        # manuel ayarlanan satırlar sabitlenir (bkz. load_hints)
+        self.warm_start = warm_start
+        self.ipuclari = {} # ders_id -> önceki (slot_no, derslik_id, hoca_id)
+
+        # İlerleme bildirimi: progress_callback(olay, bilgi) aşama değişimlerinde ('asama'), veri
+        # yüklenince ('yukleme'), aramada her dilimde (en fazla 2048 düğümde bir, 'ilerleme') ve
+        # kayıttan sonra ('sonuc') çağrılır; iç döngüye hiçbir ek iş eklemez (bkz. _bildir)
+        self.progress_callback = progress_callback
+
         # Veri yükleme için
+        self.problem = problem # Derlenmiş ProblemInstance; verilmezse load_data veritabanından derler
+        self.ders_idleri = ders_idleri # Verilirse yalnızca bu dersler yüklenir (alt problem çözümü)
+        # Verilirse yalnızca bu dönemin dersleri yüklenir ve yalnızca bu dönemin (ve akademik yılın)
+        # kayıtlı satırları okunur/yazılır; None ise generate_and_save dönemlere ayırarak çözer
+        self.semester = semester
+        self.academic_year = academic_year
         self.dersler_listesi = []
         self.derslikler = []
-        self.hoca_kisitlari = defaultdict(set)
-        self.global_kisitlari = set() # Yeni: Global kısıtlar için set [(gun, saat_tuple)]
+        self.hoca_kisitlari = defaultdict(int) # hoca_kisitlari[hoca_id] = uygun olmayan slotların bit maskesi
+        self.global_kisitlari = 0 # Global kısıtlı slotların bit maskesi
         
-        # Backtracking durumu için
-        self.program_state = {} # Anahtar: (ders_id), Değer: (gun, saat_tuple, derslik_id, hoca_id)
-        self.hoca_programi = defaultdict(set) # hoca_programi[hoca_id] = set([(gun, saat_tuple)])
-        self.derslik_programi = defaultdict(set) # derslik_programi[derslik_id] = set([(gun, saat_tuple)])
-        self.sinif_programi = defaultdict(set) # sinif_programi[(bolum_id, sinif)] = set([(gun, saat_tuple)])
+        # Backtracking durumu için (bit maskeleri, bkz. SLOTS)
+        # Anahtar: blok id (ders_id, blok_no) ya da sabit satırlarda ders_id, Değer: (gun, (başlangıç, bitiş), derslik_id, hoca_id)
+        self.program_state = {}
+        self.hoca_programi = defaultdict(int) # hoca_programi[hoca_id] = dolu slotların bit maskesi
+        self.derslik_programi = defaultdict(int) # derslik_programi[derslik_id] = dolu slotların bit maskesi
+        self.sinif_programi = defaultdict(int) # sinif_programi[(bolum_id, sinif)] = dolu slotların bit maskesi
+        self.ders_gunleri = defaultdict(int) # ders_gunleri[ders_id] = dersin bloklarının yerleştiği günlerin maskesi
+        self.oda_eslesmesi = defaultdict(dict) # Eşleştirme modu: slot_no -> {ders_id: derslik_id}
+        self.oda_sahibi = defaultdict(dict) # Eşleştirme modu: slot_no -> {derslik_id: ders_id}
         
         self.yerlesmeyen_dersler_rapor = [] # Sadece raporlama için
+        # Önceden sabitlenmiş (ders, slot_no, derslik, hoca) yerleşimleri; arama bunların etrafında yapılır.
+        # Statik kısıt gibi davranırlar: geri alınmazlar ve çatışma kümelerine girmezler.
+        self.sabit_yerlesimler = []
+
+        # Ders bazında önceden derlenmiş aday alanları (bkz. compile_domains)
+        self.ders_hocalari = {} # ders_id -> [OgretimUyesi]
+        self.ders_derslikleri = {} # ders_id -> tip/kapasite açısından uygun [Derslik]
+        self.ders_adaylari = {} # ders_id -> gün bazında [(slot_no, [uygun hocalar])] listeleri
+
+        # MRV + ileri kontrol için (bkz. _init_mrv)
+        self.alan_maskeleri = {} # ders_id -> hâlâ denenebilir slotların bit maskesi
+        self.budama_izi = [] # (ders_id, eski_maske) - geri almada alanları geri yüklemek için
+        self.sinif_dersleri = defaultdict(list) # (bolum_id, sinif) -> [Ders]
+        self.hoca_dersleri = defaultdict(list) # hoca_id -> [Ders]
+        self.derslik_gruplari = {} # aynı uygun derslik kümesine sahip dersler: (derslik_id, ...) -> [Ders]
+        self.derslik_grup_indeksi = defaultdict(list) # derslik_id -> içinde geçtiği derslik grupları
+
+        # Simetri kırma için eşdeğerlik sınıfları (bkz. compile_domains)
+        self.derslik_sinifi = {} # derslik_id -> (statu, kapasite) sınıf no
+        self.hoca_sinifi = {} # hoca_id -> atanabildiği ders kümesine göre sınıf no
+
+        # Açık yığınlı arama motoru (bkz. start_search/run)
+        self.arama_yigini = [] # [_Karar] - derinlik = yığın uzunluğu
+        self.node_count = 0 # Denenen yerleştirme (düğüm) sayısı
+        self.arama_sonucu = None # True: çözüm, False: çözüm yok, None: sürüyor/askıda
+
+        # Çatışma yönelimli geri sıçrama (CBJ) ve nogood öğrenme için
+        self.doluluk_sahibi = {} # ('s'|'d'|'h', anahtar, slot_no) ve ('g', ders_id, gun_no) -> o kaynağı dolduran seviye
+        self.aktif_yerlesimler = {} # ders_id -> (yerleşim anahtarı, seviye)
+        self.tekil_nogoodlar = set() # Hiçbir çözümde yer alamayacak yerleşim anahtarları
+        self.ikili_nogoodlar = defaultdict(set) # anahtar -> birlikte olamayacağı yerleşim anahtarları
+        self.backjump_count = 0
+
+        # Anytime mod için: aramada görülen en kapsamlı atama
+        self.en_iyi_program = {}
+        self.butce_doldu = False # Arama bütçe dolduğu için kesildi mi?
+        self.kismi_cozum = False # program_state en iyi kısmi çözümü mü tutuyor?
+
+        # Yeniden başlatmalar için
+        self.backtrack_count = 0 # Tükenen (çıkmaz sokağa giren) karar sayısı
+        self.backtrack_limit = None # run() bu sayıya ulaşınca askıya alınır
+        self.restart_count = 0
+        self.aktivite = defaultdict(int) # ders_id -> çıkmaz sokağa girme sayısı (yeniden başlatmalarda korunur)
+
+        # Çalıştırma raporu için (bkz. run_report); start_search'te sıfırlanmazlar, tüm çalıştırmayı kapsarlar
+        self.red_sayilari = dict.fromkeys(RED_TURLERI, 0) # ret türü -> sayı
+        self.toplam_sayaclar = {'dugum': 0, 'geri_donus': 0, 'geri_sicrama': 0, 'yeniden_baslatma': 0} # biten aramalar
+        self.max_derinlik = 0
+        self.asama_sureleri = defaultdict(float) # aşama -> duvar saati süresi (sn)
+        self.sonuc_bilgisi = None # Son 'sonuc' olayının bilgisi
+        # İsteğe bağlı ret izi: trace_size > 0 ise her trace_sample'ıncı ret kaydedilir (bkz. RejectionTrace)
+        self.ret_izi = RejectionTrace(trace_size, trace_sample) if trace_size else None
+
+        # Arama öncesi uygulanabilirlik kontrolü: tam programı imkânsız kılan darboğazlar
+        # (bkz. feasibility.find_bottlenecks) bütçesiz aramada üstel aramaya girmeden raporlanır
+        self.precheck = precheck
+        self.darbogazlar = [] # [feasibility.Darbogaz]
+
+    def _bildir(self, olay, **bilgi):
+        """progress_callback tanımlıysa olayı bildirir."""
+        if self.progress_callback is not None:
+            self.progress_callback(olay, bilgi)
+
+    def _ilerleme(self):
+        """Aramanın anlık durumunu 'ilerleme' olayı olarak bildirir."""
+        self._bildir('ilerleme', node_count=self.node_count, derinlik=self.depth, yerlesen=len(self.program_state),
+                     toplam=len(self.dersler_listesi) + len(self.sabit_yerlesimler))
+
+    def _sonuc(self, success):
+        """Çalıştırmanın sonucunu 'sonuc' olayı olarak bildirir ve success'i aynen döner."""
+        self.sonuc_bilgisi = {
+            'basarili': bool(success),
+            'kismi': bool(self.kismi_cozum) and not success,
+            'node_count': self.node_count,
+            'yerlesen': len(self.program_state),
+            'yerlesmeyen': [d.ders_kodu for d in self.yerlesmeyen_dersler_rapor] if not success else [],
+        }
+        self._bildir('sonuc', **self.sonuc_bilgisi)
+        return success
+
+    def _sure_ekle(self, asama, baslangic):
+        """baslangic'tan (time.perf_counter) bu yana geçen süreyi aşamanın toplamına ekler."""
+        self.asama_sureleri[asama] += time.perf_counter() - baslangic
 
-    def _time_to_tuple(self, time_obj):
-        """datetime.time nesnesini (saat, dakika) tuple'ına çevirir."""
-        return (time_obj.hour, time_obj.minute)
+    def counters(self):
+        """Arama sayaçlarının (biten ve süren aramalar toplamı) anlık görüntüsünü döner."""
+        return {
+            'dugum': self.toplam_sayaclar['dugum'] + self.node_count,
+            'geri_donus': self.toplam_sayaclar['geri_donus'] + self.backtrack_count,
+            'geri_sicrama': self.toplam_sayaclar['geri_sicrama'] + self.backjump_count,
+            'yeniden_baslatma': self.toplam_sayaclar['yeniden_baslatma'] + self.restart_count,
+            'max_derinlik': self.max_derinlik,
+            'red': dict(self.red_sayilari),
+        }
+
+    def merge_counters(self, sayaclar, statik=False):
+        """Başka bir süreçte çalışan aramanın sayaçlarını (counters() çıktısı) bu çalıştırmaya ekler.
+
+        Statik ret sayıları yalnızca statik True ise alınır (bu süreç aday alanlarını derlemediyse).
+        """
+        for anahtar in self.toplam_sayaclar:
+            self.toplam_sayaclar[anahtar] += sayaclar[anahtar]
+        self.max_derinlik = max(self.max_derinlik, sayaclar['max_derinlik'])
+        for tur, sayi in sayaclar['red'].items():
+            if tur in STATIK_RED_TURLERI:
+                if statik:
+                    self.red_sayilari[tur] = sayi
+            else:
+                self.red_sayilari[tur] += sayi
+
+    def run_report(self):
+        """Çalıştırmanın ayarlarını, sayaçlarını, ret dağılımını ve aşama sürelerini JSON'a uygun sözlük olarak döner."""
+        return {
+            'ayarlar': {
+                'strategy': self.strategy,
+                'backjumping': self.backjumping,
+                'restarts': self.restarts,
+                'room_matching': self.room_matching,
+                'symmetry_breaking': self.symmetry_breaking,
+                'warm_start': self.warm_start,
+                'seed': self.seed,
+                'time_limit': self.time_limit,
+                'node_limit': self.node_limit,
+            },
+            'problem': {
+                'ders': len(self.problem.dersler) if self.problem is not None else None,
+                'blok': len(self.problem.bloklar) if self.problem is not None else None,
+                'derslik': len(self.problem.derslikler) if self.problem is not None else None,
+                'hoca': len(self.problem.hocalar) if self.problem is not None else None,
+            },
+            'sayaclar': self.counters(),
+            'asama_sureleri': {asama: round(sure, 4) for asama, sure in self.asama_sureleri.items()},
+            'darbogazlar': [darbogaz.as_dict() for darbogaz in self.darbogazlar],
+            'sonuc': self.sonuc_bilgisi,
+        }
 
     def load_data(self):
-        """Veritabanından gerekli verileri yükler ve önceliklendirir."""
+        """Derlenmiş problem örneğinden (gerekirse veritabanından derleyerek) verileri yükler ve önceliklendirir."""
         print("Veriler yükleniyor...")
+        self._bildir('asama', asama='yukleme')
+        baslangic = time.perf_counter()
+        if self.problem is None:
+            from .instance import ProblemInstance
+            self.problem = ProblemInstance.from_database()
+        problem = self.problem
         
         rektorluk_kodlari = ('ATA', 'TUR', 'DIL', 'ISG', 'BLM417', 'BLM426') # Örnek Rektörlük/Zorunlu kodları
         
-        # Dersleri çek ve Rektörlük derslerini ayır
-        tum_dersler = list(Ders.objects.prefetch_related('ogretim_uyeleri', 'bolum'))
+        # Dersleri (haftalık saatine göre bölünmüş bloklarını) al ve Rektörlük derslerini ayır
+        tum_dersler = problem.bloklar
+        if self.ders_idleri is not None:
+            ders_idleri = set(self.ders_idleri)
+            tum_dersler = [d for d in tum_dersler if d.id in ders_idleri]
+        if self.semester is not None:
+            tum_dersler = [d for d in tum_dersler if semester_name(d.donem) == self.semester]
         rektorluk_dersleri = [d for d in tum_dersler if d.ders_kodu.startswith(rektorluk_kodlari)]
         diger_dersler = [d for d in tum_dersler if not d.ders_kodu.startswith(rektorluk_kodlari)]
         
-        # Diğer dersleri kendi içinde sırala (önce lab, sonra sınıf, sonra kontenjan)
-        diger_dersler.sort(key=lambda d: (d.tip != 'LAB', d.sinif, -d.kontenjan))
+        # Diğer dersleri kendi içinde sırala (önce lab, sonra sınıf, sonra uzun bloklar, sonra kontenjan)
+        diger_dersler.sort(key=lambda d: (d.tip != 'LAB', d.sinif, -d.blok_saati, -d.kontenjan))
         
         # Öncelikli Rektörlük derslerini başa alarak son listeyi oluştur
         self.dersler_listesi = rektorluk_dersleri + diger_dersler
         
-        # Farklı çözümler bulma olasılığını artırmak için ders sırasını karıştır
-        random.shuffle(self.dersler_listesi)
+        # Farklı çözümler bulma olasılığını artırmak için ders sırasını karıştır.
+        # MRV modunda bu öncelik sırası eşitlik durumunda seçim kuralı olarak korunur.
+        if self.strategy == STRATEGY_CHRONOLOGICAL:
+            self.rng.shuffle(self.dersler_listesi)
         
-        self.derslikler = list(Derslik.objects.all())
+        self.derslikler = list(problem.derslikler)
         
-        # Öğretim Üyesi Özel Kısıtları Yükle
-        ogretim_uyesi_kisitlari = OgretimUyesiKisiti.objects.all()
+        # Öğretim Üyesi Özel ve Genel Kısıtlar (bit maskeleri örnek derlenirken hesaplanır)
         self.hoca_kisitlari.clear()
-        for kisit in ogretim_uyesi_kisitlari:
-            try: # Saat dönüşümünde hata olursa atla
-                kisit_start_tuple = self._time_to_tuple(kisit.baslangic_saati)
-                kisit_end_tuple = self._time_to_tuple(kisit.bitis_saati)
-                
-                # Tanımlı TIME_SLOTS üzerinde dönerek kısıt aralığı ile çakışanları bul
-                for slot_start, slot_end in TIME_SLOTS:
-                    slot_start_tuple = self._time_to_tuple(slot_start)
-                    slot_end_tuple = self._time_to_tuple(slot_end)
-                    
-                    # Çakışma kontrolü: (KısıtBaşlangıç < SlotBitiş) VE (KısıtBitiş > SlotBaşlangıç)
-                    # Kısıt aralığı [başlangıç, bitiş), slot aralığı [başlangıç, bitiş) olarak düşünülür.
-                    if kisit_start_tuple < slot_end_tuple and kisit_end_tuple > slot_start_tuple:
-                        # Bu saat dilimi kısıtlama ile çakışıyor, hocayı o slot için uygun değil olarak işaretle
-                        self.hoca_kisitlari[kisit.ogretim_uyesi.id].add((kisit.gun, (slot_start, slot_end)))
-            except AttributeError:
-                # Eğer başlangıç veya bitiş saati None ise (veritabanında null ise) bu hatayı alabiliriz.
-                print(f"Uyarı: Kısıt ID {kisit.id} için geçersiz saat değeri, atlanıyor.")
-                         
-        # Genel Kısıtları Yükle
-        genel_kisitlar = GlobalKisiti.objects.all()
-        self.global_kisitlari.clear()
-        for kisit in genel_kisitlar:
-            try:
-                kisit_start_tuple = self._time_to_tuple(kisit.baslangic_saati)
-                kisit_end_tuple = self._time_to_tuple(kisit.bitis_saati)
-                for slot_start, slot_end in TIME_SLOTS:
-                    slot_start_tuple = self._time_to_tuple(slot_start)
-                    slot_end_tuple = self._time_to_tuple(slot_end)
-                    if kisit_start_tuple < slot_end_tuple and kisit_end_tuple > slot_start_tuple:
-                        self.global_kisitlari.add((kisit.gun, (slot_start, slot_end)))
-            except AttributeError:
-                print(f"Uyarı: Global Kısıt ID {kisit.id} için geçersiz saat değeri, atlanıyor.")
-
-        print(f"{len(self.dersler_listesi)} ders, {len(self.derslikler)} derslik yüklendi.")
+        self.hoca_kisitlari.update(problem.hoca_kisitlari)
+        self.global_kisitlari = problem.global_kisitlari
+        self._sure_ekle('yukleme', baslangic)
+
+        ders_sayisi = len({d.ders_id for d in self.dersler_listesi})
+        print(f"{ders_sayisi} ders ({len(self.dersler_listesi)} blok), {len(self.derslikler)} derslik yüklendi.")
+        if self.ders_idleri is None:
+            saatsiz = [d for d in problem.dersler if not problem.ders_bloklari[d.id]
+                       and (self.semester is None or semester_name(d.donem) == self.semester)]
+            if saatsiz:
+                print(f"Uyarı: Haftalık saati girilmemiş {len(saatsiz)} ders atlanıyor: {', '.join(d.ders_kodu for d in saatsiz)}")
         
         # --- Kısıtlama Dağılımını Yazdır (Teşhis için) ---
+        global_kisitli = {gun: (self.global_kisitlari & DAY_MASKS[gun_no]).bit_count() for gun_no, gun in enumerate(DAYS)}
+        hoca_kisitli = {gun: sum((maske & DAY_MASKS[gun_no]).bit_count() for maske in self.hoca_kisitlari.values())
+                        for gun_no, gun in enumerate(DAYS)}
         print("\n--- Kısıtlama Analizi ---")
         # Global Kısıtlar
-        global_kisit_gun_sayac = defaultdict(int)
-        for gun, _ in self.global_kisitlari:
-            global_kisit_gun_sayac[gun] += 1
         print("Global Kısıtlı Slot Sayıları (Gün Bazında):")
         for gun in DAYS:
-            print(f"  {gun}: {global_kisit_gun_sayac[gun]}")
+            print(f"  {gun}: {global_kisitli[gun]}")
             
         # Hoca Kısıtları
-        hoca_kisit_gun_sayac = defaultdict(int)
-        for hoca_id, kisit_set in self.hoca_kisitlari.items():
-            for gun, _ in kisit_set:
-                hoca_kisit_gun_sayac[gun] += 1
         print("Hoca Özel Kısıtlı Slot Sayıları (Gün Bazında, Tüm Hocalar Toplamı):")
         for gun in DAYS:
-             print(f"  {gun}: {hoca_kisit_gun_sayac[gun]}")
+             print(f"  {gun}: {hoca_kisitli[gun]}")
         print("------------------------\n")
-        # print(f"Toplam {sum(len(v) for v in self.hoca_kisitlari.values())} özel, {len(self.global_kisitlari)} genel kısıtlı slot bulundu.")
+        self._bildir('yukleme', ders_sayisi=ders_sayisi, blok_sayisi=len(self.dersler_listesi), derslik_sayisi=len(self.derslikler),
+                     global_kisitli=global_kisitli, hoca_kisitli=hoca_kisitli)
+        # print(f"Toplam {sum(m.bit_count() for m in self.hoca_kisitlari.values())} özel, {self.global_kisitlari.bit_count()} genel kısıtlı slot bulundu.")
+
+    def compile_domains(self):
+        """Her ders (blok) için aday derslikleri ve (slot, hoca) çiftlerini bir kez hesaplar.
+
+        Ders tipi/kapasite uyumu ile genel ve hoca özel kısıtları statiktir; arama sırasında
+        tekrar kontrol edilmemeleri için burada elenir. Arama yalnızca bu adaylar üzerinde döner.
+        Aday slot, bloğun ardışık koşusunun (bkz. RUN_MASKS) ilk slotudur; kısıtlar koşunun tüm
+        slotlarına uygulanır.
+        """
+        self._bildir('asama', asama='derleme')
+        baslangic = time.perf_counter()
+        self.ders_hocalari.clear()
+        self.ders_derslikleri.clear()
+        self.ders_adaylari.clear()
+        # Öğrenilen nogood'lar ve aktivite puanları bu verilere göre geçerlidir; veri değişince sıfırlanır
+        self.tekil_nogoodlar.clear()
+        self.ikili_nogoodlar.clear()
+        self.aktivite.clear()
+        saat_sayisi = len(TIME_SLOTS)
+        red = self.red_sayilari
+        for tur in STATIK_RED_TURLERI:
+            red[tur] = 0
+
+        for ders in self.dersler_listesi:
+            hocalar = list(ders.hocalar)
+            self.ders_hocalari[ders.id] = hocalar
+            kosular = RUN_MASKS.get(ders.blok_saati, {})
+
+            self.ders_derslikleri[ders.id] = [
+                derslik for derslik in self.derslikler
+                if (ders.tip != 'LAB' or derslik.statu == 'LAB') and ders.kontenjan <= derslik.kapasite
+            ]
+            if ders.tip == 'LAB':
+                red['derslik_tipi'] += sum(1 for derslik in self.derslikler if derslik.statu != 'LAB')
+            red['kapasite'] += sum(1 for derslik in self.derslikler
+                                   if (ders.tip != 'LAB' or derslik.statu == 'LAB') and ders.kontenjan > derslik.kapasite)
+            if self.room_matching:
+                # Eşleştirmede en dar derslik önce denenir; LAB olmayan dersler LAB'ları son çare kullanır
+                self.ders_derslikleri[ders.id].sort(
+                    key=lambda d: (ders.tip != 'LAB' and d.statu == 'LAB', d.kapasite))
+
+            gunluk_adaylar = []
+            for gun_no in range(len(DAYS)):
+                adaylar = []
+                for slot_no in range(gun_no * saat_sayisi, (gun_no + 1) * saat_sayisi):
+                    kapsam = kosular.get(slot_no)
+                    if kapsam is None:
+                        continue # Bu saatten başlayan, blok süresince ardışık bir koşu yok
+                    if self.global_kisitlari & kapsam:
+                        red['global'] += 1
+                        continue
+                    uygun_hocalar = [h for h in hocalar if not self.hoca_kisitlari.get(h.id, 0) & kapsam]
+                    red['hoca_kisiti'] += len(hocalar) - len(uygun_hocalar)
+                    if uygun_hocalar:
+                        adaylar.append((slot_no, uygun_hocalar))
+                gunluk_adaylar.append(adaylar)
+            self.ders_adaylari[ders.id] = gunluk_adaylar
+
+            if hocalar and not self.ders_derslikleri[ders.id]:
+                print(f"Uyarı: {ders} için tip/kapasite açısından uygun derslik yok.")
+
+        if self.dersler_listesi:
+            ortalama_derslik = sum(len(d) for d in self.ders_derslikleri.values()) / len(self.dersler_listesi)
+            print(f"Aday alanları derlendi: ders başına ortalama {ortalama_derslik:.1f} derslik ({len(self.derslikler)} derslik içinden).")
+
+        # Eşdeğerlik sınıfları: kısıtlar slot bazında olduğundan aynı statü/kapasitedeki iki boş
+        # derslik, ya da aynı derslere atanabilen iki boş hoca, bir slot içinde yer değiştirebilir
+        self.derslik_sinifi.clear()
+        self.hoca_sinifi.clear()
+        sinif_nolari = {}
+        for derslik in self.derslikler:
+            self.derslik_sinifi[derslik.id] = sinif_nolari.setdefault((derslik.statu, derslik.kapasite), len(sinif_nolari))
+        derslik_sinif_sayisi = len(sinif_nolari)
+        hoca_ders_kumeleri = defaultdict(set)
+        for ders_id, hocalar in self.ders_hocalari.items():
+            for hoca in hocalar:
+                hoca_ders_kumeleri[hoca.id].add(ders_id)
+        sinif_nolari = {}
+        for hoca_id, ders_kumesi in hoca_ders_kumeleri.items():
+            self.hoca_sinifi[hoca_id] = sinif_nolari.setdefault(frozenset(ders_kumesi), len(sinif_nolari))
+        if self.symmetry_breaking:
+            print(f"Simetri kırma: {len(self.derslikler)} derslik {derslik_sinif_sayisi} sınıfta, "
+                  f"{len(self.hoca_sinifi)} hoca {len(sinif_nolari)} sınıfta.")
+        self._sure_ekle('derleme', baslangic)
 
-    def check_constraints(self, ders, gun, saat_tuple, derslik, hoca):
-        """Mevcut duruma göre kısıtları kontrol eder. İhlal durumunda False döner."""
-        start_time, end_time = saat_tuple
-        saat_str = f"{start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}"
-        log_prefix = f"[Kısıt İhlali | {ders.ders_kodu} @ {gun} {saat_str}]"
+    def check_constraints(self, ders, slot_no, derslik, hoca):
+        """Mevcut duruma göre kısıtları kontrol eder. İhlal durumunda False döner.
+
+        slot_no, SLOTS listesindeki (gün, saat) pozisyonu, yani bloğun koşusunun ilk slotudur; tüm doluluk
+        testleri koşunun maskesiyle (bkz. RUN_MASKS) tek bir AND işlemidir.
+        Arama döngüsü compile_domains çıktısını kullandığı için burada yalnızca dinamik kontroller
+        anlamlıdır; bu fonksiyon tek bir yerleştirmenin tam doğrulaması için korunur.
+        Ret sebebi metne çevrilmez: red_sayilari'na ve (açıksa) ret_izi'ne yazılır.
+        """
+        bit = RUN_MASKS[ders.blok_saati][slot_no]
 
         # 1. Genel Kısıt Kontrolü
-        if (gun, saat_tuple) in self.global_kisitlari:
-            # print(f"{log_prefix} Genel Kısıtlama.")
-            return False
+        if self.global_kisitlari & bit:
+            return self._reject('global', ders, slot_no)
             
         # 2. Hoca Özel Kısıt/Ders Kontrolü (Parametre olarak gelen hoca için)
-        if (gun, saat_tuple) in self.hoca_kisitlari.get(hoca.id, set()):
-            # print(f"{log_prefix} Hoca ({hoca.ad_soyad}) özel kısıtlaması var.") # Logu azaltmak için kapatılabilir
-            return False
-        if (gun, saat_tuple) in self.hoca_programi.get(hoca.id, set()): 
-            # print(f"{log_prefix} Hoca ({hoca.ad_soyad}) zaten başka derste")
-            return False
+        if self.hoca_kisitlari.get(hoca.id, 0) & bit:
+            return self._reject('hoca_kisiti', ders, slot_no, hoca.id)
+        if self.hoca_programi.get(hoca.id, 0) & bit:
+            return self._reject('hoca_dolu', ders, slot_no, hoca.id)
 
         # 3. Derslik uygun mu (Başka ders, Tip, Kapasite)?
-        if (gun, saat_tuple) in self.derslik_programi.get(derslik.id, set()):
-            # print(f"{log_prefix} Derslik ({derslik.derslik_adi}) dolu: {self.derslik_programi[derslik.id][(gun, saat_tuple)]}")
-            return False
+        if self.derslik_programi.get(derslik.id, 0) & bit:
+            return self._reject('derslik_dolu', ders, slot_no, derslik.id)
         if ders.tip == 'LAB' and derslik.statu != 'LAB':
-            print(f"{log_prefix} Ders tipi LAB ama Derslik ({derslik.derslik_adi}) LAB değil.")
-            return False
+            return self._reject('derslik_tipi', ders, slot_no, derslik.id)
         if ders.kontenjan > derslik.kapasite:
-            print(f"{log_prefix} Kontenjan ({ders.kontenjan}) > Derslik kapasitesi ({derslik.derslik_adi}: {derslik.kapasite}).")
-            return False
+            return self._reject('kapasite', ders, slot_no, derslik.id)
 
         # 4. Sınıf uygun mu (Başka ders)?
-        sinif_key = (ders.bolum.id, ders.sinif)
-        if (gun, saat_tuple) in self.sinif_programi.get(sinif_key, set()):
-            # print(f"{log_prefix} Sınıf ({ders.bolum.bolum_kodu}-{ders.sinif}) zaten başka derste: {self.sinif_programi[sinif_key][(gun, saat_tuple)]}")
-            return False
+        if self.sinif_programi.get((ders.bolum_id, ders.sinif), 0) & bit:
+            return self._reject('sinif_dolu', ders, slot_no)
+        # Aynı dersin başka bir bloğu o gün var mı?
+        if self.ders_gunleri.get(ders.ders_id, 0) & bit:
+            return self._reject('blok_gunu', ders, slot_no)
             
         # Zorunlu saat/Ortak ders/Online kontrolleri için potansiyel yer
         # Mevcut implementasyonda bu kontroller aktif değil.
 
         return True # Tüm kısıtlar sağlandı
 
-    def _solve(self, ders_index):
-        """Rekürsif backtracking fonksiyonu."""
-        # Temel durum: Tüm dersler yerleştirildi
+    def _reject(self, tur, ders, slot_no, kaynak_id=None):
+        """Reddi sayar, iz açıksa kaydeder ve False döner (metin yalnızca iz dökülürken oluşur)."""
+        self.red_sayilari[tur] += 1
+        if self.ret_izi is not None:
+            self.ret_izi.record(tur, ders.id, slot_no, kaynak_id)
+        return False
+
+    def _place(self, ders, slot_no, derslik, hoca):
+        """Yerleştirmeyi program durumuna ve doluluk maskelerine işler.
+
+        Blok, slot_no'dan başlayan koşunun tüm slotlarını doldurur. derslik None ise (eşleştirme
+        modu, yalnızca tek slotluk koşular) ders slotun derslik eşleştirmesine eklenir.
+        """
+        bit = RUN_MASKS[ders.blok_saati][slot_no]
+        gun, saat_tuple = RUN_SPANS[bit]
+        if derslik is None:
+            self._oda_ara(ders.id, slot_no, set())
+            derslik_id = self.oda_eslesmesi[slot_no][ders.id]
+        else:
+            derslik_id = derslik.id
+            self.derslik_programi[derslik_id] |= bit
+        self.program_state[ders.id] = (gun, saat_tuple, derslik_id, hoca.id)
+        self.hoca_programi[hoca.id] |= bit
+        self.sinif_programi[(ders.bolum_id, ders.sinif)] |= bit
+        self.ders_gunleri[ders.ders_id] |= DAY_MASKS[slot_no // len(TIME_SLOTS)]
+
+    def _unplace(self, ders, slot_no, derslik, hoca):
+        """_place ile yapılan yerleştirmeyi geri alır."""
+        bit = RUN_MASKS[ders.blok_saati][slot_no]
+        del self.program_state[ders.id]
+        self.ders_gunleri[ders.ders_id] ^= DAY_MASKS[slot_no // len(TIME_SLOTS)]
+        self.hoca_programi[hoca.id] ^= bit
+        if derslik is None:
+            self._oda_birak(ders.id, slot_no)
+        else:
+            self.derslik_programi[derslik.id] ^= bit
+        self.sinif_programi[(ders.bolum_id, ders.sinif)] ^= bit
+
+    def _oda_ara(self, ders_id, slot_no, ziyaret):
+        """Slotun derslik eşleştirmesinde ders için artırımlı yol arar (Kuhn); bulursa dersi eşleştirir.
+
+        Diğer dersler başka uygun dersliklere kaydırılabilir; eşleştirme her zaman geçerli kalır.
+        Eşleştirme o slottaki dersler için en büyük olduğundan, yol yoksa ders bu slota sığmaz.
+        Sabit yerleşimlerin doldurduğu derslikler (derslik_programi) kullanılmaz.
+        """
+        bit = SLOT_BITS[slot_no]
+        sahipler = self.oda_sahibi[slot_no]
+        for derslik in self.ders_derslikleri[ders_id]:
+            if derslik.id in ziyaret or self.derslik_programi.get(derslik.id, 0) & bit:
+                continue
+            ziyaret.add(derslik.id)
+            sahip = sahipler.get(derslik.id)
+            if sahip is None or self._oda_ara(sahip, slot_no, ziyaret):
+                sahipler[derslik.id] = ders_id
+                self.oda_eslesmesi[slot_no][ders_id] = derslik.id
+                return True
+        return False
+
+    def _oda_birak(self, ders_id, slot_no):
+        """Dersi slotun derslik eşleştirmesinden çıkarır."""
+        derslik_id = self.oda_eslesmesi[slot_no].pop(ders_id)
+        del self.oda_sahibi[slot_no][derslik_id]
+
+    def _oda_bosalt(self, derslik_id, kapsam):
+        """Eşleştirme modunda dersliği kapsamın slotlarındaki eşleştirmeden çıkarır (uzun bloklar dersliği sabit alır).
+
+        Dersliği kullanan tek slotluk dersler artırımlı yolla başka dersliklere kaydırılır. Kaydırılamayan
+        bir ders varsa False döner; yapılan kaydırmalar eşleştirmeyi geçerli bıraktığından geri alınmaz.
+        """
+        for slot_no in mask_slots(kapsam):
+            sahipler = self.oda_sahibi[slot_no]
+            sahip = sahipler.get(derslik_id)
+            if sahip is None:
+                continue
+            if not self._oda_ara(sahip, slot_no, {derslik_id}):
+                return False
+            del sahipler[derslik_id]
+        return True
+
+    def _add_culprits(self, catisma, tur, anahtar, cakisma):
+        """cakisma maskesindeki her slot için (tur, anahtar) kaynağını dolduran seviyeyi çatışma kümesine ekler."""
+        for slot_no in mask_slots(cakisma):
+            catisma.add(self.doluluk_sahibi.get((tur, anahtar, slot_no), -1))
+
+    def _sync_rooms(self):
+        """Eşleştirme modunda kaydırılan derslikleri program_state'e yazar."""
+        for slot_no, eslesme in self.oda_eslesmesi.items():
+            gun, saat_tuple = SLOTS[slot_no]
+            for ders_id, derslik_id in eslesme.items():
+                hoca_id = self.program_state[ders_id][3]
+                self.program_state[ders_id] = (gun, saat_tuple, derslik_id, hoca_id)
+
+    def _init_mrv(self):
+        """MRV modu için canlı alan maskelerini ve komşuluk indekslerini hazırlar."""
+        self.alan_maskeleri.clear()
+        self.budama_izi.clear()
+        self.sinif_dersleri.clear()
+        self.hoca_dersleri.clear()
+        self.derslik_gruplari.clear()
+        self.derslik_grup_indeksi.clear()
+
+        for ders in self.dersler_listesi:
+            if not self.ders_hocalari[ders.id]:
+                continue # Hocası olmayan dersler aramaya katılmaz
+            maske = 0
+            if self.ders_derslikleri[ders.id]:
+                # Sabit yerleşimlerin doldurduğu sınıf saatleriyle ve sabit kardeş blokların
+                # günleriyle çakışan koşular baştan budanır
+                kosular = RUN_MASKS[ders.blok_saati]
+                dolu = self.sinif_programi.get((ders.bolum_id, ders.sinif), 0) | self.ders_gunleri.get(ders.ders_id, 0)
+                for adaylar in self.ders_adaylari[ders.id]:
+                    for slot_no, _ in adaylar:
+                        if not dolu & kosular[slot_no]:
+                            maske |= SLOT_BITS[slot_no]
+            self.alan_maskeleri[ders.id] = maske
+
+            self.sinif_dersleri[(ders.bolum_id, ders.sinif)].append(ders)
+            for hoca in self.ders_hocalari[ders.id]:
+                self.hoca_dersleri[hoca.id].append(ders)
+            grup = tuple(derslik.id for derslik in self.ders_derslikleri[ders.id])
+            self.derslik_gruplari.setdefault(grup, []).append(ders)
+
+        for grup in self.derslik_gruplari:
+            for derslik_id in grup:
+                self.derslik_grup_indeksi[derslik_id].append(grup)
+
+    def _select_mrv(self):
+        """Atanmamış dersler içinden en az aday slotu kalanı seçer (eşitlikte öncelik sırası)."""
+        secilen = None
+        en_az = None
+        for ders in self.dersler_listesi:
+            maske = self.alan_maskeleri.get(ders.id)
+            if maske is None or ders.id in self.program_state:
+                continue
+            kalan = maske.bit_count()
+            if en_az is None or kalan < en_az:
+                secilen, en_az = ders, kalan
+                if kalan <= 1:
+                    break
+        return secilen
+
+    def _forward_check(self, ders, kapsam, derslik_id, hoca_id):
+        """Yerleştirme sonrası komşu derslerin alanlarından artık kullanamayacakları başlangıç slotlarını budar.
+
+        kapsam yerleşimin kapladığı slotların maskesidir; bir komşunun başlangıç slotu, o slottan
+        başlayan koşusu kapsamla çakışıyorsa etkilenir (bkz. RUN_COVERS). Budamalar budama_izi'ne
+        yazılır. Bir komşunun alanı tamamen boşalırsa (çıkmaz sokak) False döner; bu durumda
+        yerleştirme alt ağaca inilmeden geri alınır.
+        """
+        maskeler = self.alan_maskeleri
+        atanmis = self.program_state
+        iz = self.budama_izi
+        kapsanan = mask_slots(kapsam)
+        etkiler = {} # blok_saati -> koşusu kapsamla çakışan başlangıç slotlarının maskesi
+
+        def etki(blok_saati):
+            maske = etkiler.get(blok_saati)
+            if maske is None:
+                kapsayanlar = RUN_COVERS[blok_saati]
+                maske = 0
+                for slot_no in kapsanan:
+                    maske |= kapsayanlar[slot_no]
+                etkiler[blok_saati] = maske
+            return maske
+
+        # 1. Aynı sınıfın dersleri bu saatleri artık kullanamaz; aynı dersin diğer blokları bu günü kaybeder
+        gun_maskesi = DAY_MASKS[kapsanan[0] // len(TIME_SLOTS)]
+        for komsu in self.sinif_dersleri[(ders.bolum_id, ders.sinif)]:
+            if komsu.id in atanmis:
+                continue
+            eski = maskeler[komsu.id]
+            budanan = eski & (gun_maskesi if komsu.ders_id == ders.ders_id else etki(komsu.blok_saati))
+            if budanan:
+                iz.append((komsu.id, eski))
+                maskeler[komsu.id] = eski ^ budanan
+                if eski == budanan:
+                    return False
+
+        # 2. Aynı hocayı paylaşan dersler, başka uygun hocaları kalmadıysa bu saatlere değen koşuları kaybeder
+        for komsu in self.hoca_dersleri[hoca_id]:
+            if komsu.id in atanmis:
+                continue
+            eski = maskeler[komsu.id]
+            adaylar = eski & etki(komsu.blok_saati)
+            if not adaylar:
+                continue
+            kosular = RUN_MASKS[komsu.blok_saati]
+            budanan = 0
+            for slot_no in mask_slots(adaylar):
+                bit = kosular[slot_no]
+                if all((self.hoca_programi.get(h.id, 0) | self.hoca_kisitlari.get(h.id, 0)) & bit
+                       for h in self.ders_hocalari[komsu.id]):
+                    budanan |= SLOT_BITS[slot_no]
+            if budanan:
+                iz.append((komsu.id, eski))
+                maskeler[komsu.id] = eski ^ budanan
+                if eski == budanan:
+                    return False
+
+        # 3. Bu dersliği içeren gruplarda bir koşunun saatlerinde tüm derslikler dolduysa grubun dersleri
+        # o koşuyu kaybeder (eşleştirme modunda derslik sabit olmadığından bu budama yapılmaz)
+        for grup in self.derslik_grup_indeksi.get(derslik_id, ()):
+            dolu_mu = {} # koşu maskesi -> grubun tüm derslikleri dolu mu?
+            for komsu in self.derslik_gruplari[grup]:
+                if komsu.id in atanmis:
+                    continue
+                eski = maskeler[komsu.id]
+                adaylar = eski & etki(komsu.blok_saati)
+                if not adaylar:
+                    continue
+                kosular = RUN_MASKS[komsu.blok_saati]
+                budanan = 0
+                for slot_no in mask_slots(adaylar):
+                    bit = kosular[slot_no]
+                    dolu = dolu_mu.get(bit)
+                    if dolu is None:
+                        dolu = dolu_mu[bit] = all(self.derslik_programi.get(d_id, 0) & bit for d_id in grup)
+                    if dolu:
+                        budanan |= SLOT_BITS[slot_no]
+                if budanan:
+                    iz.append((komsu.id, eski))
+                    maskeler[komsu.id] = eski ^ budanan
+                    if eski == budanan:
+                        return False
+        return True
+
+    def _restore_domains(self, iz_uzunlugu):
+        """budama_izi'ni verilen uzunluğa kadar geri sararak alan maskelerini geri yükler."""
+        iz = self.budama_izi
+        while len(iz) > iz_uzunlugu:
+            ders_id, eski = iz.pop()
+            self.alan_maskeleri[ders_id] = eski
+
+    def _reset_search_state(self):
+        """Yerleştirmeleri ve arama yığınını temizler; öğrenilen nogood'lar ve sayaçlar korunur."""
+        self.program_state.clear()
+        self.hoca_programi.clear()
+        self.derslik_programi.clear()
+        self.sinif_programi.clear()
+        self.ders_gunleri.clear()
+        self.oda_eslesmesi.clear()
+        self.oda_sahibi.clear()
+        self.yerlesmeyen_dersler_rapor.clear()
+        for ders, slot_no, derslik, hoca in self.sabit_yerlesimler:
+            self._place(ders, slot_no, derslik, hoca)
+
+        if self.strategy == STRATEGY_MRV:
+            self._init_mrv()
+            # Hocası olmayan dersler MRV aramasına hiç girmez, baştan rapora yazılır
+            for ders in self.dersler_listesi:
+                if not self.ders_hocalari[ders.id]:
+                    self.yerlesmeyen_dersler_rapor.append(ders)
+
+        self.arama_yigini = []
+        self.arama_sonucu = None
+        self.doluluk_sahibi.clear()
+        self.aktif_yerlesimler.clear()
+
+    def start_search(self):
+        """Program durumunu temizler ve açık yığınlı arama motorunu baştan kurar."""
+        self._reset_search_state()
+        for ders in self.yerlesmeyen_dersler_rapor:
+            print(f"Uyarı: {ders} için atanabilecek hoca bulunamadı, atlanıyor.")
+
+        # Nogood'lar sabit yerleşimlere göre öğrenilir; bunlar aramadan aramaya değişebilir
+        self.tekil_nogoodlar.clear()
+        self.ikili_nogoodlar.clear()
+        # Önceki aramanın sayaçları çalıştırma toplamına aktarılır (bkz. counters)
+        self.toplam_sayaclar['dugum'] += self.node_count
+        self.toplam_sayaclar['geri_donus'] += self.backtrack_count
+        self.toplam_sayaclar['geri_sicrama'] += self.backjump_count
+        self.toplam_sayaclar['yeniden_baslatma'] += self.restart_count
+        self.node_count = 0
+        self.backjump_count = 0
+        self.backtrack_count = 0
+        self.backtrack_limit = None
+        self.restart_count = 0
+        self.en_iyi_program = dict(self.program_state) # Sabit yerleşimler her kısmi çözümde yer alır
+        self.butce_doldu = False
+        self.kismi_cozum = False
+
+    @property
+    def depth(self):
+        """Arama yığınındaki karar seviyesi sayısı."""
+        return len(self.arama_yigini)
+
+    def _restart(self):
+        """Aramayı baştan başlatır: ders sırası aktiviteye göre yeniden kurulur, gün sıraları
+        yeni kararlarda zaten yeniden karıştırılır. Nogood'lar, aktivite ve en iyi kısmi çözüm korunur.
+        """
+        self.restart_count += 1
+        # Eşitlikler rastgele kalsın diye önce karıştır, sonra (kararlı) aktiviteye göre sırala.
+        # Kronolojik modda bu doğrudan ders sırasıdır; MRV modunda eşitlik durumundaki seçim sırasıdır.
+        self.rng.shuffle(self.dersler_listesi)
+        self.dersler_listesi.sort(key=lambda d: -self.aktivite[d.id])
+        self._reset_search_state()
+        self.backtrack_limit = self.backtrack_count + luby(self.restart_count + 1) * self.restart_base
+
+    def _next_variable(self):
+        """Yerleştirilecek sıradaki dersi seçer; tüm dersler bittiyse None döner."""
+        if self.strategy == STRATEGY_MRV:
+            return self._select_mrv()
+        ders_index = len(self.arama_yigini)
         if ders_index == len(self.dersler_listesi):
+            return None
+        return self.dersler_listesi[ders_index]
+
+    def _next_value(self, karar):
+        """Kararın imlecini ilerleterek sıradaki geçerli (slot_no, derslik, hoca) üçlüsünü döner.
+
+        Döngü sırası rekürsif sürümle aynıdır: gün (karışık) > saat > derslik > hoca. slot_no bloğun
+        koşusunun ilk slotudur; doluluk testleri koşunun maskesiyle (kapsam) yapılır. Eşleştirme
+        modunda yalnızca tek slotluk koşuların dersliği eşleştirmeye bırakılır, uzun bloklar
+        derslikte dallanır. Değer kalmadıysa None döner.
+        """
+        ders = karar.ders
+        gunluk_adaylar = self.ders_adaylari[ders.id]
+        uygun_derslikler = self.ders_derslikleri[ders.id]
+        kosular = RUN_MASKS[ders.blok_saati]
+        maske = self.alan_maskeleri[ders.id] if self.strategy == STRATEGY_MRV else -1 # -1: tüm bitler açık
+        sinif_key = (ders.bolum_id, ders.sinif)
+        sinif_maskesi = self.sinif_programi.get(sinif_key, 0)
+        gun_maskesi = self.ders_gunleri.get(ders.ders_id, 0) # Aynı dersin diğer bloklarının günleri
+        dolu = sinif_maskesi | gun_maskesi
+        # Geri sıçrama açıksa her reddin sebebi olan seviye çatışma kümesine yazılır
+        catisma = karar.catisma if self.backjumping else None
+        eslestirme = self.room_matching
+        simetri = self.symmetry_breaking
+        derslik_sinifi = self.derslik_sinifi
+        hoca_sinifi = self.hoca_sinifi
+        red = self.red_sayilari
+        iz = self.ret_izi
+
+        if not karar.ipucu_denendi:
+            # Sıcak başlangıç: önceki yerleşim hâlâ geçerliyse ilk değer odur. Reddedilirse sebebi
+            # aşağıdaki sıradan denemede (çatışma kümesiyle birlikte) yeniden görülür.
+            karar.ipucu_denendi = True
+            ipucu = self.ipuclari.get(ders.id)
+            if ipucu is not None:
+                deger = self._hint_value(ders, ipucu, maske, dolu)
+                if deger is not None:
+                    return deger
+
+        while karar.gun_pos < len(karar.gunler):
+            adaylar = gunluk_adaylar[karar.gunler[karar.gun_pos]]
+            while karar.aday_pos < len(adaylar):
+                slot_no, slot_hocalari = adaylar[karar.aday_pos]
+                ilk_bit = SLOT_BITS[slot_no]
+                bit = kosular[slot_no]
+                # Budanmış slot, sınıf bu saatlerde dolu ya da dersin başka bloğu bu günde: hiçbir derslik/hoca denemeye gerek yok
+                if maske & ilk_bit and not dolu & bit and eslestirme and bit == ilk_bit:
+                    # Derslik dallanma değildir: slotta bu ders için eşleştirme yolu var mı? (slot başına bir kez)
+                    if karar.derslik_pos == 0:
+                        if self._oda_ara(ders.id, slot_no, set()):
+                            self._oda_birak(ders.id, slot_no)
+                            karar.derslik_pos = 1
+                        else:
+                            karar.derslik_pos = 2
+                            red['derslik_dolu'] += 1
+                            if iz is not None:
+                                iz.record('derslik_dolu', ders.id, slot_no)
+                            if catisma is not None:
+                                # Slottaki tüm dersler (sabitler hariç) ve dersliği dallanarak alan bloklar ortak sorumludur
+                                for diger_id in self.oda_eslesmesi[slot_no]:
+                                    catisma.add(self.aktif_yerlesimler[diger_id][1] if diger_id in self.aktif_yerlesimler else -1)
+                                for derslik in uygun_derslikler:
+                                    # Yalnızca şu an dolu derslikler: boş dersliğin sahibi kaydı eskimiş olabilir
+                                    self._add_culprits(catisma, 'd', derslik.id, self.derslik_programi.get(derslik.id, 0) & ilk_bit)
+                    if karar.derslik_pos == 1:
+                        while karar.hoca_pos < len(slot_hocalari):
+                            hoca = slot_hocalari[karar.hoca_pos]
+                            karar.hoca_pos += 1
+                            if not self.hoca_programi.get(hoca.id, 0) & bit:
+                                if simetri:
+                                    if hoca_sinifi[hoca.id] in karar.denenen_hocalar:
+                                        continue # Eşdeğer bir hoca bu slotta zaten denendi
+                                    karar.denenen_hocalar.add(hoca_sinifi[hoca.id])
+                                if catisma is None or not self._nogood_ihlali((ders.id, slot_no, None, hoca.id), catisma):
+                                    return slot_no, None, hoca
+                            else:
+                                red['hoca_dolu'] += 1
+                                if iz is not None:
+                                    iz.record('hoca_dolu', ders.id, slot_no, hoca.id)
+                                if catisma is not None:
+                                    catisma.add(self.doluluk_sahibi.get(('h', hoca.id, slot_no), -1))
+                elif maske & ilk_bit and not dolu & bit:
+                    while karar.derslik_pos < len(uygun_derslikler):
+                        derslik = uygun_derslikler[karar.derslik_pos]
+                        derslik_dolu = self.derslik_programi.get(derslik.id, 0) & bit
+                        if derslik_dolu or (eslestirme and not self._oda_bosalt(derslik.id, bit)):
+                            red['derslik_dolu'] += 1
+                            if iz is not None:
+                                iz.record('derslik_dolu', ders.id, slot_no, derslik.id)
+                            if catisma is not None:
+                                self._add_culprits(catisma, 'd', derslik.id, derslik_dolu)
+                                if not derslik_dolu:
+                                    # Dersliği eşleştirmeden boşaltamayan: koşunun slotlarındaki tüm eşleşmiş dersler
+                                    for t in mask_slots(bit):
+                                        for diger_id in self.oda_eslesmesi[t]:
+                                            catisma.add(self.aktif_yerlesimler[diger_id][1] if diger_id in self.aktif_yerlesimler else -1)
+                        elif simetri and karar.hoca_pos == 0 and derslik_sinifi[derslik.id] in karar.denenen_derslikler:
+                            pass # Eşdeğer bir derslik bu slotta zaten denendi
+                        else:
+                            if simetri:
+                                karar.denenen_derslikler.add(derslik_sinifi[derslik.id])
+                            while karar.hoca_pos < len(slot_hocalari):
+                                hoca = slot_hocalari[karar.hoca_pos]
+                                karar.hoca_pos += 1
+                                if not self.hoca_programi.get(hoca.id, 0) & bit:
+                                    if simetri:
+                                        if hoca_sinifi[hoca.id] in karar.denenen_hocalar:
+                                            continue
+                                        karar.denenen_hocalar.add(hoca_sinifi[hoca.id])
+                                    if catisma is None or not self._nogood_ihlali((ders.id, slot_no, derslik.id, hoca.id), catisma):
+                                        return slot_no, derslik, hoca
+                                else:
+                                    red['hoca_dolu'] += 1
+                                    if iz is not None:
+                                        iz.record('hoca_dolu', ders.id, slot_no, hoca.id)
+                                    if catisma is not None:
+                                        self._add_culprits(catisma, 'h', hoca.id, self.hoca_programi.get(hoca.id, 0) & bit)
+                        karar.derslik_pos += 1
+                        karar.hoca_pos = 0
+                        if simetri:
+                            karar.denenen_hocalar.clear()
+                else:
+                    # Sınıf bu saatlerde dolu, dersin başka bloğu bu günde ya da slot ileri kontrolle budanmış
+                    if sinif_maskesi & bit:
+                        tur = 'sinif_dolu'
+                    elif gun_maskesi & bit:
+                        tur = 'blok_gunu'
+                    else:
+                        tur = 'ileri_kontrol'
+                    red[tur] += 1
+                    if iz is not None:
+                        iz.record(tur, ders.id, slot_no)
+                    if catisma is not None:
+                        if tur == 'blok_gunu':
+                            catisma.add(self.doluluk_sahibi.get(('g', ders.ders_id, slot_no // len(TIME_SLOTS)), -1))
+                        else:
+                            self._add_culprits(catisma, 's', sinif_key, sinif_maskesi & bit)
+                karar.aday_pos += 1
+                karar.derslik_pos = 0
+                karar.hoca_pos = 0
+                if simetri:
+                    karar.denenen_derslikler.clear()
+                    karar.denenen_hocalar.clear()
+            karar.gun_pos += 1
+            karar.aday_pos = 0
+        return None
+
+    def _hint_value(self, ders, ipucu, maske, dolu):
+        """Önceki (slot_no, derslik_id, hoca_id) yerleşimi şu anki durumda geçerliyse değer olarak döner.
+
+        dolu, sınıfın dolu saatleri ile dersin diğer bloklarının günlerinin maskesidir.
+        """
+        slot_no, derslik_id, hoca_id = ipucu
+        bit = RUN_MASKS[ders.blok_saati].get(slot_no)
+        if bit is None or not maske & SLOT_BITS[slot_no] or dolu & bit or self.hoca_programi.get(hoca_id, 0) & bit:
+            return None
+        gun_adaylari = self.ders_adaylari[ders.id][slot_no // len(TIME_SLOTS)]
+        slot_hocalari = next((hocalar for no, hocalar in gun_adaylari if no == slot_no), ())
+        hoca = next((h for h in slot_hocalari if h.id == hoca_id), None)
+        if hoca is None:
+            return None
+        if self.room_matching and bit == SLOT_BITS[slot_no]:
+            # Derslik eşleştirmeye bırakılır; yalnızca slotta yer olup olmadığına bakılır
+            if not self._oda_ara(ders.id, slot_no, set()):
+                return None
+            self._oda_birak(ders.id, slot_no)
+            derslik = None
+        else:
+            derslik = next((d for d in self.ders_derslikleri[ders.id] if d.id == derslik_id), None)
+            if derslik is None or self.derslik_programi.get(derslik.id, 0) & bit:
+                return None
+            if self.room_matching and not self._oda_bosalt(derslik.id, bit):
+                return None
+        if self.backjumping and self._nogood_ihlali((ders.id, slot_no, derslik_id if derslik else None, hoca_id), set()):
+            return None
+        return slot_no, derslik, hoca
+
+    def _backtrack(self):
+        """Tükenen kararı yığından atar ve bir üstteki yerleştirmeyi geri alır.
+
+        Hocası olmadığı için atlanan seviyeler de geri sarılır. Yığın boşaldıysa False döner.
+        """
+        yigin = self.arama_yigini
+        yigin.pop()
+        while yigin:
+            karar = yigin[-1]
+            if karar.atlandi:
+                yigin.pop()
+                self.yerlesmeyen_dersler_rapor.remove(karar.ders)
+                continue
+            slot_no, derslik, hoca = karar.yerlesim
+            self._restore_domains(karar.iz_uzunlugu)
+            self._unplace(karar.ders, slot_no, derslik, hoca)
+            karar.yerlesim = None
             return True
+        return False
 
-        ders = self.dersler_listesi[ders_index]
-        # Potansiyel hocaları al
-        potential_hocalar = list(ders.ogretim_uyeleri.all())
-        
-        if not potential_hocalar:
-            print(f"Uyarı: {ders} için atanabilecek hoca bulunamadı, atlanıyor.")
-            self.yerlesmeyen_dersler_rapor.append(ders)
-            return self._solve(ders_index + 1)
+    def _nogood_ihlali(self, anahtar, catisma):
+        """Yerleşim öğrenilmiş bir nogood ile çelişiyorsa True döner ve suçlu seviyeyi kaydeder."""
+        if anahtar in self.tekil_nogoodlar:
+            return True
+        for es in self.ikili_nogoodlar.get(anahtar, ()):
+            aktif = self.aktif_yerlesimler.get(es[0])
+            if aktif is not None and aktif[0] == es:
+                catisma.add(aktif[1])
+                return True
+        return False
 
-        # Bu ders için tüm olası yerleştirmeleri (gün, saat, derslik, hoca) dene
-        # Günlerin deneme sırasını rastgele yapalım
-        available_days = list(DAYS)
-        random.shuffle(available_days)
-        
-        for gun in available_days: # Rastgele sıralanmış günleri dene
-            for saat_tuple in TIME_SLOTS:
-                for derslik in self.derslikler:
-                    # Bu derslik/saat için uygun bir hoca var mı?
-                    for hoca in potential_hocalar:
-                        # Kısıtları kontrol et (ders, gün, saat, derslik, hoca)
-                        if self.check_constraints(ders, gun, saat_tuple, derslik, hoca):
-                            # Geçerli yer ve HOCA bulundu, durumu güncelle ve yerleştir
-                            start_time, end_time = saat_tuple
-                            sinif_key = (ders.bolum.id, ders.sinif)
-                            
-                            self.program_state[ders.id] = (gun, saat_tuple, derslik.id, hoca.id)
-                            self.hoca_programi[hoca.id].add((gun, saat_tuple))
-                            self.derslik_programi[derslik.id].add((gun, saat_tuple))
-                            self.sinif_programi[sinif_key].add((gun, saat_tuple))
-                            
-                            # print(f"Deneniyor: {ders.ders_kodu} ({hoca.ad_soyad}) -> {gun} {start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')} @ {derslik.derslik_adi}")
-
-                            # Bir sonraki ders için rekürsif çağrı
-                            if self._solve(ders_index + 1):
-                                return True # Çözüm bulundu!
-
-                            # Geri al (Backtrack): Bu yerleştirme çözüme götürmedi
-                            # print(f"Geri Alınıyor: {ders.ders_kodu} ({hoca.ad_soyad})")
-                            del self.program_state[ders.id]
-                            self.hoca_programi[hoca.id].remove((gun, saat_tuple))
-                            self.derslik_programi[derslik.id].remove((gun, saat_tuple))
-                            self.sinif_programi[sinif_key].remove((gun, saat_tuple))
-                            
-                            # Not: Aynı ders/saat/derslik için başka hoca denemeye GEREK YOK,
-                            # çünkü bir yerleştirme yaptık ve başarısız olduysa, geri alıp
-                            # farklı bir derslik/saat/gün deneyeceğiz. Eğer ilk hoca uygunsa
-                            # o atanır ve devam edilir. (Bu, algoritmayı basitleştirir)
-                            # Eğer farklı hoca atamalarının farklı sonuçlar doğurmasını
-                            # istiyorsak (örn. hoca yükü dengeleme), buradaki mantık değişir.
-                            
-                            # Ancak, eğer mevcut hoca ile kısıt sağlanmazsa, döngü diğer hocayı dener.
-                            
-        # Bu ders için hiçbir geçerli yer (gün/saat/derslik/hoca kombinasyonu) bulunamadı
-        # print(f"Çıkmaz sokak: {ders.ders_kodu} yerleştirilemedi.")
-        # Eğer bu ders atlanmışsa (hocası yoksa) listeden çıkaralım
-        if ders in self.yerlesmeyen_dersler_rapor:
-             self.yerlesmeyen_dersler_rapor.remove(ders)
-             
-        return False # Bu seviyede çözüm yok
-
-    @transaction.atomic
-    def generate_and_save(self):
-        """Backtracking ile programı oluşturur ve veritabanına kaydeder."""
+    def _learn_nogood(self, catisma):
+        """Tükenen seviyenin çatışma kümesi en fazla iki yerleşimden oluşuyorsa nogood olarak saklar.
+
+        Çatışma kümesindeki yerleşimler birlikte bulunduğunda tükenen ders hiçbir yere
+        konamaz; bu bilgi aramanın geri kalanında (ve yeniden başlatmalarda) geçerlidir.
+        """
+        if not catisma or len(catisma) > 2:
+            return
+        yigin = self.arama_yigini
+        anahtarlar = [self.aktif_yerlesimler[yigin[seviye].ders.id][0] for seviye in catisma]
+        if len(anahtarlar) == 1:
+            self.tekil_nogoodlar.add(anahtarlar[0])
+        else:
+            a, b = anahtarlar
+            self.ikili_nogoodlar[a].add(b)
+            self.ikili_nogoodlar[b].add(a)
+
+    def _backjump(self):
+        """Tükenen seviyenin çatışma kümesindeki en derin seviyeye doğrudan geri sıçrar.
+
+        Aradaki seviyeler (sebep olmadıkları için) tek seferde geri sarılır ve tükenen
+        seviyenin çatışma kümesi hedef seviyeninkine eklenir. Küme boşsa çözüm yoktur.
+        """
+        yigin = self.arama_yigini
+        catisma = yigin[-1].catisma
+        catisma.discard(-1) # Sabit yerleşimlerden gelen redler (seviye -1) statik kısıt sayılır
+        self._learn_nogood(catisma)
+        yigin.pop()
+        if not catisma:
+            # Hiçbir yerleştirme sorumlu değil: ders statik kısıtlar yüzünden yerleşemez
+            while yigin:
+                karar = yigin.pop()
+                if karar.atlandi:
+                    self.yerlesmeyen_dersler_rapor.remove(karar.ders)
+                else:
+                    self._unplace(karar.ders, *karar.yerlesim)
+                    del self.aktif_yerlesimler[karar.ders.id]
+            return False
+
+        hedef = max(catisma)
+        if hedef < len(yigin) - 1:
+            self.backjump_count += 1
+        while len(yigin) > hedef + 1:
+            karar = yigin.pop()
+            if karar.atlandi:
+                self.yerlesmeyen_dersler_rapor.remove(karar.ders)
+            else:
+                self._unplace(karar.ders, *karar.yerlesim)
+                del self.aktif_yerlesimler[karar.ders.id]
+
+        karar = yigin[-1]
+        catisma.discard(hedef)
+        karar.catisma |= catisma
+        self._unplace(karar.ders, *karar.yerlesim)
+        del self.aktif_yerlesimler[karar.ders.id]
+        karar.yerlesim = None
+        return True
+
+    def run(self, max_nodes=None):
+        """Aramayı kaldığı yerden sürdürür.
+
+        Çözüm bulunursa True, arama uzayı tükenirse False döner. max_nodes verilirse bu kadar
+        düğüm (yerleştirme denemesi) sonra arama askıya alınır ve None döner; run() tekrar
+        çağrılarak aynı noktadan devam edilir.
+        """
+        if self.arama_sonucu is not None:
+            return self.arama_sonucu
+        limit = None if max_nodes is None else self.node_count + max_nodes
+        yigin = self.arama_yigini
+        mrv = self.strategy == STRATEGY_MRV
+        anytime = self.anytime
+
+        while True:
+            karar = yigin[-1] if yigin else None
+
+            # Tepedeki karar bir yerleştirme yaptıysa (veya atlandıysa) bir sonraki derse in
+            if karar is None or karar.yerlesim is not None or karar.atlandi:
+                ders = self._next_variable()
+                if ders is None:
+                    if self.room_matching:
+                        self._sync_rooms()
+                    self.arama_sonucu = True
+                    return True
+                karar = _Karar(ders)
+                yigin.append(karar)
+                if len(yigin) > self.max_derinlik:
+                    self.max_derinlik = len(yigin)
+                if not self.ders_hocalari[ders.id]:
+                    print(f"Uyarı: {ders} için atanabilecek hoca bulunamadı, atlanıyor.")
+                    self.yerlesmeyen_dersler_rapor.append(ders)
+                    karar.atlandi = True
+                else:
+                    # Günlerin deneme sırasını rastgele yapalım
+                    self.rng.shuffle(karar.gunler)
+                    ipucu = self.ipuclari.get(ders.id)
+                    if ipucu is not None:
+                        # Sıcak başlangıç: önceki yerleşimin günü önce denenir
+                        karar.gunler.remove(ipucu[0] // len(TIME_SLOTS))
+                        karar.gunler.insert(0, ipucu[0] // len(TIME_SLOTS))
+                continue
+
+            if limit is not None and self.node_count >= limit:
+                return None # Askıya al; run() ile devam edilebilir
+
+            deger = self._next_value(karar)
+            if deger is None:
+                # Bu ders için hiçbir geçerli yer kalmadı: geri dön (veya çatışma kaynağına sıçra)
+                self.backtrack_count += 1
+                self.aktivite[karar.ders.id] += 1
+                if not (self._backjump() if self.backjumping else self._backtrack()):
+                    self.arama_sonucu = False
+                    return False
+                if self.backtrack_limit is not None and self.backtrack_count >= self.backtrack_limit:
+                    return None # Yeniden başlatma sınırı; run_with_budget karar verir
+                continue
+
+            slot_no, derslik, hoca = deger
+            self.node_count += 1
+            self._place(karar.ders, slot_no, derslik, hoca)
+            derslik_id = derslik.id if derslik is not None else None # Eşleştirme modunda None
+            kapsam = RUN_MASKS[karar.ders.blok_saati][slot_no]
+            if self.backjumping:
+                seviye = len(yigin) - 1
+                ders = karar.ders
+                sahipler = self.doluluk_sahibi
+                for t in mask_slots(kapsam):
+                    sahipler[('s', (ders.bolum_id, ders.sinif), t)] = seviye
+                    if derslik is not None:
+                        sahipler[('d', derslik_id, t)] = seviye
+                    sahipler[('h', hoca.id, t)] = seviye
+                sahipler[('g', ders.ders_id, slot_no // len(TIME_SLOTS))] = seviye
+                self.aktif_yerlesimler[ders.id] = ((ders.id, slot_no, derslik_id, hoca.id), seviye)
+            karar.iz_uzunlugu = len(self.budama_izi)
+            if mrv and not self._forward_check(karar.ders, kapsam, derslik_id, hoca.id):
+                # Çıkmaz sokak alt ağaca inmeden yakalandı
+                self.red_sayilari['ileri_kontrol'] += 1
+                self._restore_domains(karar.iz_uzunlugu)
+                self._unplace(karar.ders, slot_no, derslik, hoca)
+                continue
+            karar.yerlesim = deger
+            if anytime and len(self.program_state) > len(self.en_iyi_program):
+                if self.room_matching:
+                    self._sync_rooms()
+                self.en_iyi_program = dict(self.program_state)
+
+    def run_with_budget(self):
+        """Aramayı time_limit/node_limit bütçesi ve (açıksa) yeniden başlatma planı ile çalıştırır.
+
+        Bütçe, yeniden başlatma ve ilerleme bildirimi yoksa run() ile aynıdır. Yeniden başlatmada her çalıştırma
+        luby(i) * restart_base geri dönüşten sonra kesilip baştan başlatılır. Her çalıştırma tam
+        arama olduğundan False sonucu yine çözümsüzlüğün kanıtıdır. Bütçe dolarsa butce_doldu
+        işaretlenir ve None döner.
+        """
+        if not self.anytime and not self.restarts and self.progress_callback is None:
+            return self.run()
+        if self.restarts:
+            self.backtrack_limit = self.backtrack_count + luby(1) * self.restart_base
+        baslangic = time.monotonic()
+        while True:
+            adim = 2048 # Zaman kontrolleri arasındaki düğüm sayısı
+            if self.node_limit is not None:
+                kalan = self.node_limit - self.node_count
+                if kalan <= 0:
+                    break
+                adim = min(adim, kalan)
+            sonuc = self.run(max_nodes=adim)
+            self._ilerleme()
+            if sonuc is not None:
+                return sonuc
+            if self.time_limit is not None and time.monotonic() - baslangic >= self.time_limit:
+                break
+            if self.backtrack_limit is not None and self.backtrack_count >= self.backtrack_limit:
+                self._restart()
+        self.butce_doldu = True
+        return None
+
+    def _apply_best_partial(self):
+        """program_state'i aramada görülen en kapsamlı atamayla değiştirir ve yerleşmeyenleri raporlar.
+
+        Not: Doluluk maskeleri arama durumunu göstermeye devam eder; kayıt yalnızca
+        program_state'i kullanır.
+        """
+        self.program_state = dict(self.en_iyi_program)
+        self.yerlesmeyen_dersler_rapor = [d for d in self.dersler_listesi if d.id not in self.program_state]
+        self.kismi_cozum = True
+
+    def solve(self):
+        """Verileri yükler ve backtracking aramasını çalıştırır. Çözüm bulunursa True döner."""
         self.load_data()
+        self.compile_domains()
+        if self.warm_start:
+            self.load_hints()
+        if self.precheck and not self.run_precheck():
+            return False
+        return self.search()
+
+    def run_precheck(self):
+        """Derlenmiş veriler üzerinde uygulanabilirlik sınırlarını kontrol eder; aramaya devam edilecekse True döner.
+
+        Darboğaz bulunursa yazdırılır. Bütçe yoksa arama yapılmaz (False): darboğazdaki dersler
+        yerleşmeyenler raporuna yazılır. Bütçe varsa en iyi kısmi program için arama yine yapılır.
+        """
+        from .feasibility import find_bottlenecks
+        self._bildir('asama', asama='on_kontrol')
+        baslangic = time.perf_counter()
+        self.darbogazlar = find_bottlenecks(self)
+        self._sure_ekle('on_kontrol', baslangic)
+        if not self.darbogazlar:
+            return True
+        print(f"Uyarı: Ön kontrol {len(self.darbogazlar)} darboğaz buldu, tüm dersleri yerleştiren bir program yok:")
+        for darbogaz in self.darbogazlar:
+            print(f"- {darbogaz}")
+        if self.anytime:
+            return True
+        self.yerlesmeyen_dersler_rapor = list({ders.id: ders for darbogaz in self.darbogazlar
+                                               for ders in darbogaz.dersler}.values())
+        return False
+
+    def search(self):
+        """Yüklenmiş veriler (ve varsa sabit yerleşimler) üzerinde aramayı çalıştırır. Çözüm bulunursa True döner."""
         print("Backtracking ile ders programı oluşturuluyor...")
+        self._bildir('asama', asama='arama')
+        baslangic = time.perf_counter()
         
-        # Program durumunu temizle
+        # Program durumunu temizle ve algoritmayı başlat
+        self.start_search()
+        success = self.run_with_budget()
+        self._sure_ekle('arama', baslangic)
+        print(f"Arama tamamlandı: {self.node_count} düğüm denendi.")
+        if self.restarts:
+            print(f"Yeniden başlatma: {self.restart_count}, toplam geri dönüş: {self.backtrack_count}")
+        if self.backjumping:
+            nogood_sayisi = len(self.tekil_nogoodlar) + sum(len(v) for v in self.ikili_nogoodlar.values()) // 2
+            print(f"Geri sıçrama: {self.backjump_count}, öğrenilen nogood: {nogood_sayisi}")
+        if self.butce_doldu:
+            print("Uyarı: Arama bütçesi doldu, tam çözüm bulunamadı.")
+        if success is not True and self.anytime:
+            # Anytime mod: tam çözüm yoksa en kapsamlı kısmi atama kaydedilmek üzere seçilir
+            self._apply_best_partial()
+            yerlesen = len(self.dersler_listesi) - len(self.yerlesmeyen_dersler_rapor)
+            print(f"En iyi kısmi çözüm: {yerlesen}/{len(self.dersler_listesi)} ders yerleşti.")
+        return success is True
+
+    def subproblem_settings(self):
+        """Aynı ayarlarla (ör. tek bir dönem için) yeni bir çözücü kurmak üzere kurucu argümanlarını döner."""
+        return {
+            'strategy': self.strategy,
+            'backjumping': self.backjumping,
+            'seed': self.seed,
+            'time_limit': self.time_limit,
+            'node_limit': self.node_limit,
+            'restarts': self.restarts,
+            'restart_base': self.restart_base,
+            'room_matching': self.room_matching,
+            'symmetry_breaking': self.symmetry_breaking,
+            'warm_start': self.warm_start,
+            'problem': self.problem,
+            'progress_callback': self.progress_callback,
+            'trace_size': self.ret_izi.kayitlar.maxlen if self.ret_izi is not None else 0,
+            'trace_sample': self.ret_izi.ornekleme if self.ret_izi is not None else 1,
+            'precheck': self.precheck,
+            'academic_year': self.academic_year,
+        }
+
+    def _saved_rows(self, eskimis=False):
+        """Bu çözücünün kapsamındaki (dönem/akademik yıl) kayıtlı DersProgramiSlotu satırları.
+
+        Dersin dönemi değiştiyse eski dönemdeki (manuel ayarlanmamış) satırı o dönemin çözücüsüne
+        ait olmadığı halde kaynakları doldururdu: bu satırlar okunmaz, program kaydedilirken aynı
+        transaction'da silinir. eskimis True ise yalnızca bu satırlar döner.
+        """
+        satirlar = DersProgramiSlotu.objects.all()
+        if self.academic_year is not None:
+            satirlar = satirlar.filter(academic_year=self.academic_year)
+        if self.semester is None:
+            return satirlar.none() if eskimis else satirlar
+        satirlar = satirlar.filter(semester=self.semester)
+        baska_donem = Q(is_manually_adjusted=False,
+                        ders_id__in=[ders.id for ders in self.problem.dersler if semester_name(ders.donem) != self.semester])
+        return satirlar.filter(baska_donem) if eskimis else satirlar.exclude(baska_donem)
+
+    def _slot_rows(self, ders, placement, academic_year=None):
+        """Bloğun yerleşimini, koşusunun her saat dilimi için kaydedilmemiş bir DersProgramiSlotu nesnesine çevirir.
+
+        Yabancı anahtarlar id ile verilir; ızgara satır başına tek slot olduğundan 2 saatlik bir
+        blok (ör. 09:00-11:00) iki satır olarak yazılır.
+        """
+        gun, saat_tuple, derslik_id, hoca_id = placement
+        if academic_year is None:
+            academic_year = self.academic_year or DEFAULT_ACADEMIC_YEAR
+        return [
+            DersProgramiSlotu(
+                ders_id=ders.ders_id,
+                ogretim_uyesi_id=hoca_id,
+                derslik_id=derslik_id,
+                gun=gun,
+                baslangic_saati=SLOTS[slot_no][1][0],
+                bitis_saati=SLOTS[slot_no][1][1],
+                bolum_id=ders.bolum_id,
+                sinif=ders.sinif,
+                academic_year=academic_year,
+                semester=semester_name(ders.donem),
+                is_manually_adjusted=False, # Manuel ayarlanmadığı için False
+            )
+            for slot_no in mask_slots(RUN_INDEX[(gun, saat_tuple)][1])
+        ]
+
+    def save_solution(self):
+        """program_state içindeki çözümü DersProgramiSlotu tablosuna yazar (kapsamdaki eski program silinir).
+
+        Satırlar yabancı anahtarları problem örneğinden çözülerek bellekte hazırlanır; yazma
+        işlemi yalnızca silme ve toplu eklemeden (bulk_create) oluşan kısa bir transaction'dır.
+        Sıcak başlangıçta manuel ayarlanan satırlar sabit tutulduğu için silinmez. semester
+        verilmişse yalnızca o dönemin satırları değişir (bkz. _saved_rows).
+        """
+        self._bildir('asama', asama='kayit')
+        baslangic = time.perf_counter()
+        blok_map = self.problem.blok_map
+        eski_satirlar = self._saved_rows()
+        sabit_idler = set()
+        if self.warm_start:
+            # Manuel satırı olan derslerin tüm satırları sabit tutulur (bkz. load_hints)
+            sabit_idler = set(eski_satirlar.filter(is_manually_adjusted=True).values_list('ders_id', flat=True))
+            eski_satirlar = eski_satirlar.exclude(ders_id__in=sabit_idler)
+
+        # Sabit yerleşimler (ders_id anahtarlı) zaten kayıtlıdır; yalnızca blokların satırları yazılır
+        yeni_satirlar = [satir for blok_id, placement in self.program_state.items()
+                         if blok_id in blok_map and blok_map[blok_id].ders_id not in sabit_idler
+                         for satir in self._slot_rows(blok_map[blok_id], placement)]
+        with transaction.atomic():
+            # Önce eski programı temizle, sonra bulunan çözümü toplu olarak kaydet
+            eski_satirlar.delete()
+            self._saved_rows(eskimis=True).delete()
+            DersProgramiSlotu.objects.bulk_create(yeni_satirlar, batch_size=KAYIT_PARTI_BOYUTU)
+        self._sure_ekle('kayit', baslangic)
+
+    def _row_placement(self, satir, slot_no):
+        """DersProgramiSlotu satırını problem kayıtlarıyla (ders, slot_no, derslik, hoca) yerleşimine çevirir."""
+        problem = self.problem
+        return (problem.ders_map[satir.ders_id], slot_no,
+                problem.derslik_map[satir.derslik_id], problem.hoca_map[satir.ogretim_uyesi_id])
+
+    def _saved_runs(self):
+        """Kayıtlı satırları ızgaradaki slotlarıyla okur: ({ders_id: [(slot_no, satır)]}, [(slot_no, satır)] manuel)."""
+        ders_satirlari = defaultdict(list)
+        manuel = []
+        for satir in self._saved_rows():
+            slot_no = SLOT_INDEX.get((satir.gun, (satir.baslangic_saati, satir.bitis_saati)))
+            if slot_no is None:
+                print(f"Uyarı: {satir} saat ızgarası dışında, yok sayılıyor.")
+            elif satir.is_manually_adjusted:
+                manuel.append((slot_no, satir))
+            else:
+                ders_satirlari[satir.ders_id].append((slot_no, satir))
+        return ders_satirlari, manuel
+
+    def load_hints(self):
+        """Kayıtlı DersProgramiSlotu satırlarını sıcak başlangıç için yükler (load_data/compile_domains sonrası).
+
+        Manuel ayarlanan satırı olan derslerin tüm satırları sabit_yerlesimler'e eklenir ve bu
+        dersler aramadan çıkarılır. Diğer satırlar ardışık koşulara ayrılıp dersin bloklarıyla eşleştirilir (bkz. match_saved_runs);
+        eşleşen koşu ilgili bloğun ilk denenecek değeri (ipucu) olur. İpucu artık geçerli değilse
+        arama her zamanki sırayla devam eder.
+        """
+        self.ipuclari = {}
+        self.sabit_yerlesimler = []
+        ders_satirlari, manuel = self._saved_runs()
+        sabitlenenler = set()
+        for slot_no, satir in manuel:
+            self.sabit_yerlesimler.append(self._row_placement(satir, slot_no))
+            sabitlenenler.add(satir.ders_id)
+        for ders_id in sabitlenenler:
+            self.sabit_yerlesimler += [self._row_placement(satir, slot_no) for slot_no, satir in ders_satirlari.pop(ders_id, [])]
+        self.dersler_listesi = [ders for ders in self.dersler_listesi if ders.ders_id not in sabitlenenler]
+
+        ders_bloklari = defaultdict(list)
+        for ders in self.dersler_listesi:
+            ders_bloklari[ders.ders_id].append(ders)
+        for ders_id, satirlar in ders_satirlari.items():
+            if ders_id in ders_bloklari:
+                eslesme, _ = match_saved_runs(ders_bloklari[ders_id], satirlar)
+                for blok_id, (slot_no, kosu_satirlari) in eslesme.items():
+                    self.ipuclari[blok_id] = (slot_no, kosu_satirlari[0].derslik_id, kosu_satirlari[0].ogretim_uyesi_id)
+        ipucu_sayisi = sum(1 for ders in self.dersler_listesi if ders.id in self.ipuclari)
+        print(f"Sıcak başlangıç: {ipucu_sayisi} blok için önceki yerleşim, {len(self.sabit_yerlesimler)} slot sabit (manuel ayarlanan dersler).")
+
+    def load_saved_program(self):
+        """Kayıtlı DersProgramiSlotu satırlarını program_state'e yükler (load_data/compile_domains sonrası).
+
+        Bir dersin satırları ardışık koşulara ayrılıp bloklarıyla eşleştirilir (bkz. match_saved_runs).
+        Manuel ayarlanan satırı olan dersler ile yüklenmemiş derslerin satırları yerinden oynatılmamak
+        üzere sabit_yerlesimler'e eklenir ve blokları aramadan çıkarılır. Satırları blok düzenine
+        uymayan dersler (ör. haftalık saati değişti) hiç yerleşmemiş sayılır. Saat ızgarası dışındaki
+        satırlar yok sayılır. Taşınabilir satırlar blok id -> [satırlar] (blok düzenine uymayanlar
+        ders_id -> [satırlar]) sözlüğü olarak döner (bkz. save_program_changes).
+        """
         self.program_state.clear()
-        self.hoca_programi.clear()
-        self.derslik_programi.clear()
-        self.sinif_programi.clear()
-        self.yerlesmeyen_dersler_rapor.clear()
+        self.sabit_yerlesimler = []
+        ders_satirlari, manuel = self._saved_runs()
+        for slot_no, satir in manuel:
+            ders_satirlari[satir.ders_id].append((slot_no, satir))
+
+        ders_bloklari = defaultdict(list)
+        for ders in self.dersler_listesi:
+            ders_bloklari[ders.ders_id].append(ders)
+        sabitlenenler = set()
+        tasinabilir = {}
+        for ders_id, satirlar in ders_satirlari.items():
+            if ders_id not in ders_bloklari or any(satir.is_manually_adjusted for _, satir in satirlar):
+                self.sabit_yerlesimler.extend(self._row_placement(satir, slot_no) for slot_no, satir in satirlar)
+                sabitlenenler.add(ders_id)
+                continue
+            eslesme, tam = match_saved_runs(ders_bloklari[ders_id], satirlar)
+            if not tam:
+                tasinabilir[ders_id] = [satir for _, satir in satirlar]
+                continue
+            for blok_id, (slot_no, kosu_satirlari) in eslesme.items():
+                gun, saat_tuple = RUN_SPANS[RUN_MASKS[self.problem.blok_map[blok_id].blok_saati][slot_no]]
+                self.program_state[blok_id] = (gun, saat_tuple, kosu_satirlari[0].derslik_id,
+                                               kosu_satirlari[0].ogretim_uyesi_id)
+                tasinabilir[blok_id] = kosu_satirlari
+        self.dersler_listesi = [ders for ders in self.dersler_listesi if ders.ders_id not in sabitlenenler]
+        print(f"Kayıtlı program yüklendi: {len(self.program_state)} taşınabilir blok, {len(self.sabit_yerlesimler)} sabit slot.")
+        return tasinabilir
+
+    def drop_invalid_placements(self):
+        """Aday alanına uymayan veya çakışan yerleşimleri program_state'ten çıkarır (compile_domains sonrası).
+
+        Kısıt, derslik veya hoca ataması değiştiyse kayıtlı yerleşimler geçersizleşebilir. Sabit
+        yerleşimler olduğu gibi kabul edilir ve önce işlenir; çakışmalarda önce gelen yerleşim
+        korunur. Çıkarılan ders_id listesi döner.
+        """
+        sabit_idler = {ders.id for ders, _, _, _ in self.sabit_yerlesimler}
+        ders_map = {ders.id: ders for ders in self.dersler_listesi}
+        saat_sayisi = len(TIME_SLOTS)
+        sinif_programi = defaultdict(int)
+        hoca_programi = defaultdict(int)
+        derslik_programi = defaultdict(int)
+        ders_gunleri = defaultdict(int) # Aynı dersin blokları farklı günlerde olmalı
+        for ders, slot_no, derslik, hoca in self.sabit_yerlesimler:
+            bit = RUN_MASKS[ders.blok_saati][slot_no]
+            sinif_programi[(ders.bolum_id, ders.sinif)] |= bit
+            hoca_programi[hoca.id] |= bit
+            derslik_programi[derslik.id] |= bit
+            ders_gunleri[ders.ders_id] |= DAY_MASKS[slot_no // saat_sayisi]
+
+        atilanlar = []
+        for ders_id, (gun, saat_tuple, derslik_id, hoca_id) in list(self.program_state.items()):
+            if ders_id in sabit_idler:
+                continue
+            ders = ders_map.get(ders_id)
+            slot_no, bit = RUN_INDEX.get((gun, saat_tuple), (None, 0))
+            # Koşu bloğun süresine uymalı (ör. haftalık saat değiştiyse eski koşu geçersizdir)
+            gecerli = ders is not None and slot_no is not None and RUN_MASKS[ders.blok_saati].get(slot_no) == bit
+            if gecerli:
+                sinif_key = (ders.bolum_id, ders.sinif)
+                aday_hocalar = next((hocalar for no, hocalar in self.ders_adaylari[ders_id][slot_no // saat_sayisi]
+                                     if no == slot_no), ())
+                gecerli = (any(h.id == hoca_id for h in aday_hocalar)
+                           and any(d.id == derslik_id for d in self.ders_derslikleri[ders_id])
+                           and not (sinif_programi[sinif_key] | hoca_programi[hoca_id] | derslik_programi[derslik_id]
+                                    | ders_gunleri[ders.ders_id]) & bit)
+            if not gecerli:
+                del self.program_state[ders_id]
+                atilanlar.append(ders_id)
+                continue
+            sinif_programi[sinif_key] |= bit
+            hoca_programi[hoca_id] |= bit
+            derslik_programi[derslik_id] |= bit
+            ders_gunleri[ders.ders_id] |= DAY_MASKS[slot_no // saat_sayisi]
+        if atilanlar:
+            print(f"{len(atilanlar)} geçersiz veya çakışan yerleşim kaldırıldı.")
+        return atilanlar
+
+    def save_program_changes(self, satirlar):
+        """program_state'i load_saved_program ile yüklenen satırlara göre yalnızca farkları yazarak kaydeder.
+
+        Değişen veya artık yerleşmeyen blokların satırları ile blok düzenine uymayan eski satırlar
+        silinir, değişen ve yeni yerleşen bloklar için satır eklenir. Sabit yerleşimlere (ör. manuel
+        ayarlananlar) dokunulmaz. Değişen blok sayısını döner.
+        """
+        self._bildir('asama', asama='kayit')
+        baslangic = time.perf_counter()
+        sabit_idler = {ders.id for ders, _, _, _ in self.sabit_yerlesimler}
+        blok_map = self.problem.blok_map
+        silinecekler = set()
+        for anahtar, eski_satirlar in satirlar.items():
+            ilk, son = eski_satirlar[0], eski_satirlar[-1]
+            if anahtar not in blok_map or self.program_state.get(anahtar) != (
+                    ilk.gun, (ilk.baslangic_saati, son.bitis_saati), ilk.derslik_id, ilk.ogretim_uyesi_id):
+                silinecekler.add(anahtar)
+        yeni_satirlar = []
+        degisenler = set(silinecekler)
+        for ders_id, placement in self.program_state.items():
+            if ders_id in sabit_idler:
+                continue
+            eski = satirlar.get(ders_id)
+            if eski is None:
+                yeni_satirlar += self._slot_rows(blok_map[ders_id], placement)
+                degisenler.add(ders_id)
+            elif ders_id in silinecekler:
+                yeni_satirlar += self._slot_rows(blok_map[ders_id], placement, academic_year=eski[0].academic_year)
+
+        with transaction.atomic():
+            # Satırlar yer değiştirebildiği için unique_together ihlali olmaması adına önce silinip sonra yazılır
+            DersProgramiSlotu.objects.filter(
+                id__in=[satir.id for anahtar in silinecekler for satir in satirlar[anahtar]]).delete()
+            self._saved_rows(eskimis=True).delete()
+            DersProgramiSlotu.objects.bulk_create(yeni_satirlar, batch_size=KAYIT_PARTI_BOYUTU)
+        self._sure_ekle('kayit', baslangic)
+        return len(degisenler)
+
+    def reschedule_and_save(self, node_limit=20000, lns_time=10.0, by_semester=True):
+        """Kayıtlı programı yalnızca değişiklikten etkilenen dersleri yeniden yerleştirerek günceller.
+
+        Yeni kısıtlar, silinen derslikler veya değişen hoca atamaları yüzünden geçersizleşen
+        yerleşimler ile hiç kaydı olmayan dersler yeniden aranır; diğer tüm satırlar (özellikle
+        is_manually_adjusted olanlar) sabit kalır ve veritabanında yalnızca farklar yazılır.
+        Etkilenen dersler node_limit düğümde yerleşemezse geri kalanlar lns_time saniye LNS ile
+        onarılır (bkz. lns.ScheduleRepairer); bu adım başka dersleri de taşıyabilir.
+        semester verilmemişse ve by_semester True ise her dönem sırayla ayrı güncellenir.
+        Tüm dersler yerleştiyse True döner.
+        """
+        if by_semester and self.semester is None:
+            from .semesters import reschedule_by_semester
+            return self._sonuc(reschedule_by_semester(self, node_limit=node_limit, lns_time=lns_time))
+        self.load_data()
+        self.compile_domains()
+        satirlar = self.load_saved_program()
+        self.drop_invalid_placements()
 
-        # Algoritmayı başlat
-        success = self._solve(0)
+        sabitler = list(self.sabit_yerlesimler)
+        sabit_idler = {ders.id for ders, _, _, _ in sabitler}
+        etkilenenler = [ders for ders in self.dersler_listesi
+                        if ders.id not in self.program_state and ders.id not in sabit_idler]
+        if not etkilenenler:
+            print("Program güncel: yeniden yerleştirilecek ders yok.")
+            return self._sonuc(True)
+        print(f"{len(etkilenenler)} blok etkilendi, diğer {len(self.program_state)} blok sabitken yeniden yerleştiriliyor...")
+
+        tum_dersler = self.dersler_listesi
+        ders_map = {ders.id: ders for ders in tum_dersler}
+        hoca_map = {hoca.id: hoca for hocalar in self.ders_hocalari.values() for hoca in hocalar}
+        derslik_map = {derslik.id: derslik for derslik in self.derslikler}
+        self.sabit_yerlesimler = sabitler + [
+            (ders_map[ders_id], RUN_INDEX[(gun, saat_tuple)][0], derslik_map[derslik_id], hoca_map[hoca_id])
+            for ders_id, (gun, saat_tuple, derslik_id, hoca_id) in self.program_state.items()
+        ]
+        self.dersler_listesi = etkilenenler
+        ayarlar = (self.anytime, self.node_limit)
+        # Sabitlerle çözümsüz olabilecek küçük bir alt problem: tam arama yerine bütçeli arama
+        self.anytime, self.node_limit = True, node_limit
+        try:
+            success = self.search()
+        finally:
+            self.sabit_yerlesimler = sabitler
+            self.dersler_listesi = tum_dersler
+            self.anytime, self.node_limit = ayarlar
+
+        if not success:
+            self.kismi_cozum = True
+            if lns_time:
+                self._bildir('asama', asama='onarim')
+                baslangic = time.perf_counter()
+                from .lns import ScheduleRepairer
+                success = ScheduleRepairer(self, time_limit=lns_time, seed=self.seed).repair()
+                self._sure_ekle('onarim', baslangic)
+            else:
+                self.yerlesmeyen_dersler_rapor = [ders for ders in tum_dersler
+                                                  if ders.id not in self.program_state and ders.id not in sabit_idler]
+
+        degisen_sayisi = self.save_program_changes(satirlar)
+        print(f"Artımlı güncelleme kaydedildi: {degisen_sayisi} blok değişti.")
+        if not success:
+            print(f"Uyarı: {len(self.yerlesmeyen_dersler_rapor)} ders yerleşmedi:")
+            for d in self.yerlesmeyen_dersler_rapor:
+                print(f"- {d.ders_kodu} ({d.ders_adi})")
+        return self._sonuc(success)
+
+    def generate_and_save(self, workers=1, decompose=False, optimize_time=None, lns_time=None, by_semester=True):
+        """Backtracking ile programı oluşturur ve veritabanına kaydeder.
+
+        workers > 1 ise farklı tohum/stratejilerle paralel bir çözücü portföyü çalıştırılır
+        (bkz. portfolio.solve_portfolio) ve yalnızca ilk biten çözüm kaydedilir.
+        decompose True ise dersler çatışma grafiğinin bağımsız bileşenlerine ayrılıp
+        workers süreçte ayrı ayrı çözülür (bkz. decomposition.solve_decomposed).
+        optimize_time verilirse bulunan program kaydedilmeden önce bu kadar saniye yerel
+        aramayla iyileştirilir (bkz. optimizer.ScheduleOptimizer).
+        lns_time verilirse ve arama kısmi bir programla biterse eksik dersler bu kadar saniye
+        LNS ile yerleştirilmeye çalışılır (bkz. lns.ScheduleRepairer).
+        semester verilmemişse ve by_semester True ise her dönemin (Güz/Bahar) dersleri ayrı bir
+        problem olarak paralel süreçlerde çözülüp kaydedilir (bkz. semesters.generate_by_semester).
+        Arama, yazma işleminin transaction'ı dışında yapılır.
+        Bütçe (time_limit/node_limit) verilmişse ve tam çözüm bulunamazsa en iyi kısmi
+        program kaydedilir; bu durumda False döner ve kismi_cozum True olur.
+        """
+        if by_semester and self.semester is None:
+            from .semesters import generate_by_semester
+            return self._sonuc(generate_by_semester(self, workers=workers, decompose=decompose,
+                                                    optimize_time=optimize_time, lns_time=lns_time))
+        if decompose or workers > 1:
+            # Paralel aramanın süresi, ana süreçte yapılan yükleme/derleme hariç 'arama' olarak sayılır
+            baslangic = time.perf_counter()
+            onceki = self.asama_sureleri['yukleme'] + self.asama_sureleri['derleme'] + self.asama_sureleri['arama']
+            if decompose:
+                from .decomposition import solve_decomposed
+                success = solve_decomposed(self, workers)
+            else:
+                from .portfolio import solve_portfolio
+                success = solve_portfolio(self, workers, time_limit=self.time_limit, node_limit=self.node_limit)
+            sonraki = self.asama_sureleri['yukleme'] + self.asama_sureleri['derleme'] + self.asama_sureleri['arama']
+            self.asama_sureleri['arama'] += time.perf_counter() - baslangic - (sonraki - onceki)
+        else:
+            success = self.solve()
+
+        if lns_time and self.kismi_cozum:
+            self._bildir('asama', asama='onarim')
+            baslangic = time.perf_counter()
+            from .lns import ScheduleRepairer
+            success = ScheduleRepairer(self, time_limit=lns_time, seed=self.seed).repair()
+            self._sure_ekle('onarim', baslangic)
+
+        if optimize_time and (success or self.kismi_cozum):
+            self._bildir('asama', asama='iyilestirme')
+            baslangic = time.perf_counter()
+            from .optimizer import ScheduleOptimizer
+            ScheduleOptimizer(self, time_limit=optimize_time, seed=self.seed).optimize()
+            self._sure_ekle('iyilestirme', baslangic)
 
         if success:
             print("Çözüm bulundu! Veritabanına kaydediliyor...")
-            # Önce eski programı temizle
-            DersProgramiSlotu.objects.all().delete()
-            
-            # Bulunan çözümü DersProgramiSlotu modeline kaydet
-            for ders_id, placement in self.program_state.items():
-                gun, saat_tuple, derslik_id, hoca_id = placement
-                start_time, end_time = saat_tuple
-                ders = Ders.objects.get(id=ders_id)
-                hoca = OgretimUyesi.objects.get(id=hoca_id)
-                derslik = Derslik.objects.get(id=derslik_id)
-                
-                # Dönem bilgisinden semester string'ini belirle
-                semester_str = "Bilinmiyor"
-                if ders.donem:
-                    semester_str = "Güz" if ders.donem % 2 != 0 else "Bahar"
-                
-                DersProgramiSlotu.objects.create(
-                    ders=ders,
-                    ogretim_uyesi=hoca,
-                    derslik=derslik,
-                    gun=gun,
-                    baslangic_saati=start_time,
-                    bitis_saati=end_time,
-                    bolum=ders.bolum,
-                    sinif=ders.sinif,
-                    academic_year="DEFAULT_YEAR", # TODO: Bu değer dinamik olmalı
-                    semester=semester_str, # Semester değeri eklendi
-                    is_manually_adjusted=False # Manuel ayarlanmadığı için False
-                )
+            self.save_solution()
             print("Ders programı başarıyla veritabanına kaydedildi.")
-            return True
+            return self._sonuc(True)
+        elif self.kismi_cozum:
+            # Bütçe doldu: en iyi kısmi atamayı kaydet, yerleşmeyenleri listele
+            print("Uyarı: Tam program bulunamadı, en iyi kısmi program kaydediliyor...")
+            self.save_solution()
+            print(f"{len(self.program_state)} ders kaydedildi, {len(self.yerlesmeyen_dersler_rapor)} ders yerleşmedi:")
+            for d in self.yerlesmeyen_dersler_rapor:
+                print(f"- {d.ders_kodu} ({d.ders_adi})")
+            return self._sonuc(False)
         else:
             print("Uyarı: Tüm dersler için geçerli bir program bulunamadı!")
             if self.yerlesmeyen_dersler_rapor:
                  print("Yerleşemeyen (veya hocası olmayan) Dersler:")
                  for d in self.yerlesmeyen_dersler_rapor:
                       print(f"- {d.ders_kodu} ({d.ders_adi})")
-            return False
+            return self._sonuc(False)
 
 # Kullanım örneği (management command içinde çağrılacak)
 # scheduler = BacktrackingScheduler()
@@ -0,0 +1,213 @@
+# schedule/semesters.py
+
+# Dönemlere göre ayrıştırma: Güz ve Bahar dersleri hiçbir zaman aynı anda yapılmadığı için
+# derslik, hoca ve sınıf saatleri için birbirleriyle yarışmazlar. Her dönemin dersleri kendi
+# problem örneğinde (semester=...) çözülür; birden fazla dönem varsa her biri ayrı bir süreçte
+# paralel çalışır ve kendi semester/academic_year değeriyle yalnızca kendi satırlarını yazar.
+
+import multiprocessing
+import queue
+import time
+
+from django.db import connections
+
+from .scheduler import SEMESTERS, STATIK_RED_TURLERI, semester_name
+
+def semester_names(problem):
+    """Problemdeki derslerin dönem adlarını SEMESTERS sırasıyla döner."""
+    donemler = {semester_name(ders.donem) for ders in problem.dersler}
+    return [donem for donem in SEMESTERS if donem in donemler]
+
+def _ozet(scheduler, success):
+    """Dönem çözücüsünün sonucunu ana sürece aktarılabilir bir sözlük olarak döner."""
+    return {
+        'semester': scheduler.semester,
+        'success': success,
+        'kismi_cozum': scheduler.kismi_cozum,
+        'node_count': scheduler.counters()['dugum'],
+        'program_state': scheduler.program_state,
+        'yerlesmeyen_ders_idleri': [d.id for d in scheduler.yerlesmeyen_dersler_rapor],
+        'darbogazlar': scheduler.darbogazlar,
+        'sayaclar': scheduler.counters(),
+        'asama_sureleri': dict(scheduler.asama_sureleri),
+        'ret_izi': (scheduler.ret_izi.gorulen, list(scheduler.ret_izi.kayitlar)) if scheduler.ret_izi is not None else None,
+    }
+
+BILDIRIM_ARALIGI = 0.5 # saniye: dönem süreçlerinin ana sürece 'ilerleme' gönderme aralığı
+
+class _DonemBildirici:
+    """Dönem sürecinin ilerleme olaylarını ana sürece kuyrukla iletir ('sonuc' ana süreçte bildirilir)."""
+
+    def __init__(self, donem, kuyruk):
+        self.donem = donem
+        self.kuyruk = kuyruk
+        self.son_gonderim = 0.0
+
+    def __call__(self, olay, bilgi):
+        if olay == 'sonuc':
+            return
+        if olay == 'ilerleme':
+            simdi = time.monotonic()
+            if simdi - self.son_gonderim < BILDIRIM_ARALIGI:
+                return
+            self.son_gonderim = simdi
+        self.kuyruk.put((self.donem, olay, bilgi))
+
+class _IlerlemeBirlestirici:
+    """Paralel dönemlerin ilerlemesini birleştirip ana çözücünün progress_callback'ine bildirir.
+
+    Her dönemin son 'ilerleme' ve 'yukleme' bilgisi saklanır; düğüm, yerleşen ve toplam ders
+    sayıları dönemlerin toplamı, derinlik en derin dönemindir. Aşama olayları olduğu gibi iletilir.
+    """
+
+    def __init__(self, progress_callback):
+        self.progress_callback = progress_callback
+        self.ilerlemeler = {}
+        self.yuklemeler = {}
+
+    def __call__(self, donem, olay, bilgi):
+        if olay == 'ilerleme':
+            self.ilerlemeler[donem] = bilgi
+            degerler = self.ilerlemeler.values()
+            bilgi = {alan: sum(d[alan] for d in degerler) for alan in ('node_count', 'yerlesen', 'toplam')}
+            bilgi['derinlik'] = max(d['derinlik'] for d in degerler)
+        elif olay == 'yukleme':
+            # Derslikler ve kısıtlar dönemler arasında ortaktır; yalnızca ders sayıları toplanır
+            self.yuklemeler[donem] = bilgi
+            bilgi = dict(bilgi, **{alan: sum(d[alan] for d in self.yuklemeler.values())
+                                   for alan in ('ders_sayisi', 'blok_sayisi')})
+        self.progress_callback(olay, bilgi)
+
+def _semester_worker(sinif, ayarlar, generate_ayarlari, sonuc_kuyrugu):
+    """Tek bir dönemi ayrı bir süreçte oluşturup kaydeder ve özetini kuyruğa yazar."""
+    import django
+    from django.apps import apps
+    if not apps.ready: # 'spawn' ile başlatılan süreçlerde Django henüz kurulmamıştır
+        django.setup()
+
+    try:
+        scheduler = sinif(**ayarlar)
+        success = scheduler.generate_and_save(by_semester=False, **generate_ayarlari)
+        sonuc_kuyrugu.put(_ozet(scheduler, success))
+    except Exception as e:
+        sonuc_kuyrugu.put({'semester': ayarlar['semester'], 'success': False, 'error': str(e)})
+    finally:
+        connections.close_all()
+
+def _aktar(scheduler, sonuclar):
+    """Dönem sonuçlarını ana çözücüye aktarır; tüm dönemler tam çözüldüyse True döner.
+
+    program_state dönemlerin birleşimidir (farklı dönemlerin yerleşimleri aynı saatte olabilir),
+    yalnızca raporlama içindir. Dönemler paralel çalıştığından aşama süreleri en uzun dönemin süresidir.
+    """
+    blok_map = scheduler.problem.blok_map
+    scheduler.program_state = {}
+    scheduler.yerlesmeyen_dersler_rapor = []
+    scheduler.darbogazlar = []
+    scheduler.kismi_cozum = False
+    scheduler.node_count = 0
+    basarili = True
+    for sonuc in sonuclar:
+        if sonuc.get('error'):
+            print(f"Uyarı: {sonuc['semester']} dönemi hata verdi: {sonuc['error']}")
+            basarili = False
+            continue
+        scheduler.program_state.update(sonuc['program_state'])
+        scheduler.yerlesmeyen_dersler_rapor += [blok_map[i] for i in sonuc['yerlesmeyen_ders_idleri'] if i in blok_map]
+        scheduler.darbogazlar += sonuc['darbogazlar']
+        scheduler.kismi_cozum = scheduler.kismi_cozum or sonuc['kismi_cozum']
+        basarili = basarili and sonuc['success']
+        scheduler.node_count += sonuc['node_count']
+        # Düğümler node_count'a aktarıldı; statik elemeler her dönemin kendi aday alanlarında sayıldı
+        scheduler.merge_counters(dict(sonuc['sayaclar'], dugum=0))
+        for tur in STATIK_RED_TURLERI:
+            scheduler.red_sayilari[tur] += sonuc['sayaclar']['red'][tur]
+        if scheduler.ret_izi is not None and sonuc['ret_izi'] is not None:
+            scheduler.ret_izi.merge(*sonuc['ret_izi'])
+        for asama, sure in sonuc['asama_sureleri'].items():
+            scheduler.asama_sureleri[asama] = max(scheduler.asama_sureleri[asama], sure)
+        print(f"{sonuc['semester']} dönemi: {'tamamlandı' if sonuc['success'] else 'tamamlanamadı'}, "
+              f"{len(sonuc['program_state'])} blok yerleşti.")
+    scheduler.kismi_cozum = scheduler.kismi_cozum and not basarili
+    return basarili
+
+def _prepare(scheduler):
+    """Problemi derler ve dönemleri döner.
+
+    Dönemi dersin dönemiyle uyuşmayan satırlar burada silinmez; her dönem çözücüsü bunları
+    okumaz ve programını kaydederken aynı transaction'da siler (bkz. BacktrackingScheduler._saved_rows).
+    """
+    from .instance import ProblemInstance
+
+    if scheduler.problem is None:
+        # Veritabanı bir kez okunur; dönem çözücüleri derlenmiş örneği sorgu yapmadan kullanır
+        scheduler.problem = ProblemInstance.from_database()
+    return semester_names(scheduler.problem)
+
+def generate_by_semester(scheduler, **generate_ayarlari):
+    """Her dönemi ayrı bir problem olarak oluşturup kaydeder; sonuçları scheduler'a aktarır.
+
+    Birden fazla dönem varsa her dönem kendi sürecinde çalışır (generate_ayarlari her döneme
+    aynen uygulanır, ör. workers dönem başına portföy süreci sayısıdır). Tüm dönemler tam
+    çözüldüyse True döner.
+    """
+    donemler = _prepare(scheduler)
+    print(f"Dönemlere göre çözülüyor: {', '.join(donemler) or '-'}.")
+    sinif = type(scheduler)
+    if len(donemler) <= 1:
+        sonuclar = []
+        for donem in donemler:
+            cozucu = sinif(**scheduler.subproblem_settings(), semester=donem)
+            sonuclar.append(_ozet(cozucu, cozucu.generate_and_save(by_semester=False, **generate_ayarlari)))
+        return _aktar(scheduler, sonuclar)
+
+    # Süreçler ana sürecin veritabanı bağlantısını paylaşmamalı
+    connections.close_all()
+    sonuc_kuyrugu = multiprocessing.Queue()
+    # Dönemler aynı işin ilerlemesini birbirinin üzerine yazmasın: olaylar ana süreçte birleştirilir
+    ilerleme_kuyrugu = multiprocessing.Queue() if scheduler.progress_callback is not None else None
+    birlestirici = _IlerlemeBirlestirici(scheduler.progress_callback) if ilerleme_kuyrugu is not None else None
+    surecler = []
+    for donem in donemler:
+        ayarlar = dict(scheduler.subproblem_settings(), semester=donem,
+                       progress_callback=_DonemBildirici(donem, ilerleme_kuyrugu) if birlestirici else None)
+        surec = multiprocessing.Process(target=_semester_worker,
+                                        args=(sinif, ayarlar, generate_ayarlari, sonuc_kuyrugu))
+        surec.start()
+        surecler.append(surec)
+
+    def ilerlemeleri_aktar():
+        while birlestirici is not None:
+            try:
+                birlestirici(*ilerleme_kuyrugu.get_nowait())
+            except queue.Empty:
+                return
+
+    sonuclar = []
+    try:
+        while len(sonuclar) < len(surecler):
+            ilerlemeleri_aktar()
+            try:
+                sonuclar.append(sonuc_kuyrugu.get(timeout=BILDIRIM_ARALIGI))
+            except queue.Empty:
+                # Kuyruğa yazamadan ölen süreçleri say
+                if not any(surec.is_alive() for surec in surecler) and sonuc_kuyrugu.empty():
+                    break
+        ilerlemeleri_aktar()
+    finally:
+        for surec in surecler:
+            surec.join()
+    biten = {sonuc['semester'] for sonuc in sonuclar}
+    sonuclar += [{'semester': donem, 'success': False, 'error': "süreç sonuç yazmadan sonlandı"}
+                 for donem in donemler if donem not in biten]
+    return _aktar(scheduler, sonuclar)
+
+def reschedule_by_semester(scheduler, **reschedule_ayarlari):
+    """Kayıtlı programı her dönem için sırayla artımlı günceller (bkz. reschedule_and_save)."""
+    donemler = _prepare(scheduler)
+    sonuclar = []
+    for donem in donemler:
+        cozucu = type(scheduler)(**scheduler.subproblem_settings(), semester=donem)
+        print(f"--- {donem} dönemi ---")
+        sonuclar.append(_ozet(cozucu, cozucu.reschedule_and_save(by_semester=False, **reschedule_ayarlari)))
+    return _aktar(scheduler, sonuclar)
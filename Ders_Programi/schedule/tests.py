@@ -1,3 +1,566 @@
-from django.test import TestCase
+import contextlib
+import datetime
+import io
+import json
+import os
+import random
+import tempfile
+from collections import defaultdict
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .instance import DerslikKaydi, DersKaydi, HocaKaydi, ProblemInstance
+from .jobs import ILERLEME_ARALIGI, claim_next_job, enqueue_job, iter_job_events, job_status, run_job
+from .lns import ScheduleRepairer
+from .models import (Bolum, Ders, DersProgramiSlotu, Derslik, GenerationJob, GlobalKisiti, OgretimUyesi,
+                     OgretimUyesiKisiti)
+from .scheduler import (RUN_INDEX, RUN_MASKS, RUN_SPANS, SLOT_BITS, TIME_SLOTS, BacktrackingScheduler,
+                        RejectionTrace, luby, semester_name, split_blocks)
+
+try:
+    import ortools
+except ImportError:
+    ortools = None
+
+def sessiz(fonksiyon, *args, **kwargs):
+    """Çözücünün konsol çıktısını bastırarak fonksiyonu çalıştırır."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fonksiyon(*args, **kwargs)
+
+def saat_farki(satir):
+    """Satırın süresi (saat)."""
+    return (satir.bitis_saati.hour * 60 + satir.bitis_saati.minute
+            - satir.baslangic_saati.hour * 60 - satir.baslangic_saati.minute) / 60
+
+def sik_problem(tohum):
+    """Veritabanı kullanmayan, günde iki açık saatli sıkışık bir problem; bir kısmı çözümsüzdür."""
+    r = random.Random(tohum)
+    hocalar = [HocaKaydi(i, f'H{i}') for i in range(3)]
+    derslikler = [DerslikKaydi(i, f'D{i}', 'NORMAL', 30 if i else 50) for i in range(2)]
+    dersler = [DersKaydi(i + 1, f'C{i}', f'Ders {i}', 'TEORIK', r.choice([30, 50]), 1, 'B', r.randint(1, 3), 1,
+                         r.choice([1, 2, 3]), (r.choice(hocalar),)) for i in range(7)]
+    kapali = 0
+    for slot_no, bit in enumerate(SLOT_BITS):
+        if not 2 <= slot_no % len(TIME_SLOTS) < 4: # Yalnızca 10-12 açık
+            kapali |= bit
+    return ProblemInstance(dersler, derslikler, hocalar, {}, kapali)
+
+def ara(problem, sinif=BacktrackingScheduler, **ayarlar):
+    """Problem örneğini (None ise veritabanını) ön kontrolsüz arar; (sonuç, scheduler) döner."""
+    scheduler = sinif(problem=problem, precheck=False, **ayarlar)
+    sessiz(scheduler.load_data)
+    sessiz(scheduler.compile_domains)
+    return sessiz(scheduler.search), scheduler
+
+class ProgramVerisiMixin:
+    """Tek dönemlik (Güz) küçük bir problem: iki sınıf, teorik ve LAB dersleri, öğle arası ve hoca kısıtı."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bolum = Bolum.objects.create(bolum_kodu='BLM', bolum_adi='Bilgisayar')
+        cls.hocalar = [OgretimUyesi.objects.create(user=User.objects.create(username=f'hoca{i}'), ad_soyad=f'Hoca {i}')
+                       for i in range(4)]
+        for i in range(4):
+            Derslik.objects.create(derslik_adi=f'D{i}', kapasite=60, statu='NORMAL')
+        Derslik.objects.create(derslik_adi='LAB1', kapasite=40, statu='LAB')
+        cls.dersler = []
+        for i, (sinif, saat, tip) in enumerate([(1, 2, 'TEORIK'), (1, 3, 'TEORIK'), (1, 4, 'TEORIK'), (1, 2, 'LAB'),
+                                                (3, 3, 'TEORIK'), (3, 2, 'TEORIK'), (3, 4, 'TEORIK'), (3, 1, 'TEORIK')]):
+            ders = Ders.objects.create(ders_kodu=f'BLM{i:03d}', ders_adi=f'Ders {i}', bolum=cls.bolum, sinif=sinif,
+                                       haftalik_saat=saat, tip=tip, kontenjan=30 if tip == 'LAB' else 50, donem=sinif * 2 - 1)
+            ders.ogretim_uyeleri.set([cls.hocalar[i % len(cls.hocalar)]])
+            cls.dersler.append(ders)
+        for gun in ('Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma'):
+            GlobalKisiti.objects.create(gun=gun, baslangic_saati=datetime.time(12, 0),
+                                        bitis_saati=datetime.time(13, 0), aciklama='Öğle Arası')
+        OgretimUyesiKisiti.objects.create(ogretim_uyesi=cls.hocalar[0], gun='Pazartesi',
+                                          baslangic_saati=datetime.time(8, 0), bitis_saati=datetime.time(17, 0))
+
+    def assertGecerliProgram(self):
+        """Kayıtlı programda çakışma ve kısıt ihlali yoktur; her dersin toplam süresi haftalik_saat kadardır
+        ve blokları farklı günlerdedir."""
+        satirlar = list(DersProgramiSlotu.objects.select_related('ders', 'derslik'))
+        for satir in satirlar:
+            self.assertFalse(GlobalKisiti.objects.filter(gun=satir.gun, baslangic_saati__lt=satir.bitis_saati,
+                                                         bitis_saati__gt=satir.baslangic_saati).exists(), "genel kısıt")
+            self.assertFalse(OgretimUyesiKisiti.objects.filter(
+                ogretim_uyesi_id=satir.ogretim_uyesi_id, gun=satir.gun, baslangic_saati__lt=satir.bitis_saati,
+                bitis_saati__gt=satir.baslangic_saati).exists(), "hoca kısıtı")
+            self.assertTrue(satir.ders.ogretim_uyeleri.filter(id=satir.ogretim_uyesi_id).exists())
+            self.assertGreaterEqual(satir.derslik.kapasite, satir.ders.kontenjan)
+            self.assertEqual(satir.derslik.statu == 'LAB', satir.ders.tip == 'LAB')
+        for alan in ('derslik_id', 'ogretim_uyesi_id'):
+            anahtarlar = [(getattr(satir, alan), satir.gun, satir.baslangic_saati) for satir in satirlar]
+            self.assertEqual(len(anahtarlar), len(set(anahtarlar)), f"{alan} çakışması")
+        sinif_anahtarlari = [(satir.bolum_id, satir.sinif, satir.gun, satir.baslangic_saati) for satir in satirlar]
+        self.assertEqual(len(sinif_anahtarlari), len(set(sinif_anahtarlari)), "sınıf çakışması")
+        sureler = defaultdict(float)
+        for satir in satirlar:
+            sureler[satir.ders_id] += saat_farki(satir)
+        self.assertEqual(dict(sureler), {ders.id: ders.haftalik_saat for ders in Ders.objects.filter(haftalik_saat__gt=0)})
+        gunler = defaultdict(set)
+        for satir in satirlar:
+            gunler[satir.ders_id].add(satir.gun)
+        for ders_id, ders_gunleri in gunler.items():
+            self.assertEqual(len(ders_gunleri), len(split_blocks(Ders.objects.get(id=ders_id).haftalik_saat)))
+
+class BlockTests(TestCase):
+    def test_split_blocks(self):
+        self.assertEqual(split_blocks(0), [])
+        self.assertEqual(split_blocks(None), [])
+        self.assertEqual(split_blocks(1), [1])
+        self.assertEqual(split_blocks(3), [2, 1])
+        self.assertEqual(split_blocks(4), [2, 2])
+        self.assertEqual(split_blocks(11), [3, 3, 3, 2])
+
+    def test_runs_last_exactly_block_hours(self):
+        for blok_saati, kosular in RUN_MASKS.items():
+            if not blok_saati:
+                continue
+            for maske in kosular.values():
+                _, (baslangic, bitis) = RUN_SPANS[maske]
+                self.assertEqual(bitis.hour - baslangic.hour, blok_saati)
+        # 17-19 iki saattir: tek saatlik blok oraya yerleşemez
+        self.assertEqual(len(RUN_MASKS[1]), 45)
+
+class LubyTests(TestCase):
+    def test_luby_sequence(self):
+        self.assertEqual([luby(i) for i in range(1, 16)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+        # Her 2^k - 1. eleman 2^(k-1)'dir ve dizi bir sonraki bloğa kendini tekrarlayarak başlar
+        for k in range(1, 12):
+            self.assertEqual(luby((1 << k) - 1), 1 << (k - 1))
+            self.assertEqual([luby((1 << k) - 1 + i) for i in range(1, (1 << k))],
+                             [luby(i) for i in range(1, (1 << k))])
+
+class RejectionTraceTests(TestCase):
+    def test_ring_buffer_keeps_last_sampled_rejections(self):
+        iz = RejectionTrace(3, ornekleme=2)
+        for i in range(10):
+            iz.record('sinif_dolu', 1, i)
+        # Her 2. ret örneklenir, tampon son 3 örneği tutar; görülen sayısı örneklemeden bağımsızdır
+        self.assertEqual(iz.gorulen, 10)
+        self.assertEqual([slot_no for _, _, slot_no, _ in iz.kayitlar], [5, 7, 9])
+
+        iz.merge(4, [('hoca_dolu', 2, 0, 7)])
+        self.assertEqual(iz.gorulen, 14)
+        self.assertEqual(len(iz.kayitlar), 3)
+        self.assertEqual(iz.kayitlar[-1], ('hoca_dolu', 2, 0, 7))
+
+    def test_dump_formats_course_slot_and_source(self):
+        iz = RejectionTrace(5)
+        iz.record('hoca_dolu', 2, 0, 7)
+        iz.record('global', 99, len(TIME_SLOTS) + 1)
+        ders = DersKaydi(2, 'BLM101', 'Ders', 'TEORIK', 30, 1, 'BLM', 1, 1, 2, ())
+        self.assertEqual(iz.dump({2: ders}), ["[Kısıt İhlali | BLM101 @ Pazartesi 08:00-09:00] hoca_dolu (#7)",
+                                             "[Kısıt İhlali | Ders #99 @ Salı 09:00-10:00] global"])
+
+    def test_search_fills_trace(self):
+        _, scheduler = ara(sik_problem(2), seed=2, trace_size=4, trace_sample=3)
+        self.assertGreater(scheduler.ret_izi.gorulen, 12)
+        self.assertEqual(len(scheduler.ret_izi.kayitlar), 4)
+        self.assertIsNone(ara(sik_problem(2), seed=2)[1].ret_izi)
+
+class YerlesimMixin:
+    def assertGecerliYerlesim(self, problem, program_state, tam=True):
+        """Bellekteki programda çakışma ve kısıt ihlali yoktur; bloklar tam süresince ve dersin farklı
+        günlerine yerleşir. tam ise her blok yerleşmiştir."""
+        if tam:
+            self.assertEqual(set(program_state), set(problem.blok_map))
+        doluluk = defaultdict(int)
+        gunler = defaultdict(list)
+        for blok_id, (gun, saat_tuple, derslik_id, hoca_id) in program_state.items():
+            blok = problem.blok_map[blok_id]
+            slot_no, bit = RUN_INDEX[(gun, saat_tuple)]
+            self.assertEqual(RUN_MASKS[blok.blok_saati].get(slot_no), bit)
+            self.assertFalse(bit & problem.global_kisitlari, "genel kısıt")
+            self.assertFalse(bit & problem.hoca_kisitlari.get(hoca_id, 0), "hoca kısıtı")
+            self.assertIn(problem.hoca_map[hoca_id], blok.hocalar)
+            self.assertGreaterEqual(problem.derslik_map[derslik_id].kapasite, blok.kontenjan)
+            self.assertEqual(problem.derslik_map[derslik_id].statu == 'LAB', blok.tip == 'LAB')
+            for anahtar in (('d', derslik_id), ('h', hoca_id), ('s', blok.bolum_id, blok.sinif)):
+                self.assertFalse(doluluk[anahtar] & bit, f"{anahtar} çakışması")
+                doluluk[anahtar] |= bit
+            gunler[blok.ders_id].append(gun)
+        for ders_gunleri in gunler.values():
+            self.assertEqual(len(set(ders_gunleri)), len(ders_gunleri))
+
+class SearchVerdictTests(YerlesimMixin, TestCase):
+    @skipUnless(ortools, "ortools kurulu değil")
+    def test_backjumping_with_room_matching_agrees_with_cpsat(self):
+        from .cpsat import CpSatScheduler
+        # 33: derslik eşleştirmesi başarısız olduğunda boş dersliklerin eski sahipleri suçlanıyordu
+        for tohum in (0, 20, 25, 33):
+            with self.subTest(tohum=tohum):
+                sonuc, scheduler = ara(sik_problem(tohum), backjumping=True, room_matching=True, seed=tohum)
+                beklenen, _ = ara(sik_problem(tohum), CpSatScheduler, threads=1, seed=tohum)
+                self.assertEqual(sonuc, beklenen)
+                if sonuc:
+                    self.assertGecerliYerlesim(scheduler.problem, scheduler.program_state)
+
+    def test_backjumping_agrees_with_chronological_search(self):
+        geri_sicrama = 0
+        for tohum in (0, 2, 20, 27, 38):
+            with self.subTest(tohum=tohum):
+                sonuc, scheduler = ara(sik_problem(tohum), backjumping=True, seed=tohum)
+                beklenen, kronolojik = ara(sik_problem(tohum), seed=tohum)
+                self.assertEqual(sonuc, beklenen)
+                # Aynı sırayla geri sıçrama yalnızca kronolojik aramanın ağacından budar
+                self.assertLessEqual(scheduler.node_count, kronolojik.node_count)
+                if sonuc:
+                    self.assertGecerliYerlesim(scheduler.problem, scheduler.program_state)
+                geri_sicrama += scheduler.counters()['geri_sicrama']
+        self.assertGreater(geri_sicrama, 0)
+
+    def test_backjumping_with_room_matching_over_blocks(self):
+        # Derslik eşleştirmesi ve geri sıçrama birlikte: sonuç ya geçerli bir programdır
+        # ya da kronolojik aramayla aynı çözümsüzlük kararıdır
+        for tohum in (2, 20, 27, 38):
+            with self.subTest(tohum=tohum):
+                problem = sik_problem(tohum)
+                self.assertTrue(any(blok.blok_saati > 1 for blok in problem.bloklar))
+                sonuc, scheduler = ara(problem, backjumping=True, room_matching=True, seed=tohum)
+                self.assertEqual(sonuc, ara(sik_problem(tohum), seed=tohum)[0])
+                if sonuc:
+                    self.assertGecerliYerlesim(problem, scheduler.program_state)
+                else:
+                    self.assertFalse(scheduler.kismi_cozum)
+
+class GenerateTests(ProgramVerisiMixin, TestCase):
+    def test_hours_match_haftalik_saat(self):
+        saatsiz = Ders.objects.create(ders_kodu='BLM099', ders_adi='Saatsiz', bolum=self.bolum, sinif=1,
+                                      haftalik_saat=0, donem=1)
+        saatsiz.ogretim_uyeleri.set([self.hocalar[0]])
+        for ayarlar in ({}, {'strategy': 'mrv'}, {'strategy': 'mrv', 'room_matching': True}, {'backjumping': True},
+                        {'backjumping': True, 'room_matching': True}, {'restarts': True, 'restart_base': 5}, {'strategy': 'mrv', 'symmetry_breaking': True}):
+            with self.subTest(**ayarlar):
+                self.assertTrue(sessiz(BacktrackingScheduler(**ayarlar).generate_and_save))
+                self.assertFalse(DersProgramiSlotu.objects.filter(ders=saatsiz).exists())
+                self.assertGecerliProgram()
+
+    def test_optimize_and_decompose(self):
+        self.assertTrue(sessiz(BacktrackingScheduler(strategy='mrv').generate_and_save, optimize_time=0.2))
+        self.assertGecerliProgram()
+        self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save, decompose=True))
+        self.assertGecerliProgram()
+
+    @skipUnless(ortools, "ortools kurulu değil")
+    def test_cpsat(self):
+        from .cpsat import CpSatScheduler
+        self.assertTrue(sessiz(CpSatScheduler(time_limit=30).generate_and_save))
+        self.assertGecerliProgram()
+
+    def test_command_writes_report(self):
+        cikti = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            call_command('generate_schedule', '--strategy', 'mrv', '--report', '-', stdout=cikti)
+        self.assertIn('"dugum"', cikti.getvalue())
+        self.assertGecerliProgram()
+
+    def test_command_keeps_report_by_default(self):
+        with tempfile.TemporaryDirectory() as dizin, override_settings(RUN_REPORT_DIR=dizin):
+            cikti = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()):
+                call_command('generate_schedule', '--strategy', 'mrv', stdout=cikti)
+            raporlar = os.listdir(dizin)
+            self.assertEqual(len(raporlar), 1)
+            self.assertIn(raporlar[0], cikti.getvalue())
+            with open(os.path.join(dizin, raporlar[0]), encoding='utf-8') as f:
+                self.assertTrue(json.load(f)['sonuc']['basarili'])
+
+    def test_portfolio_workers_keep_search_options(self):
+        ayarlar = []
+
+        class AyniSurec:
+            """Portföy sürecini ayrı süreç açmadan çalıştırır ve kurucu ayarlarını kaydeder."""
+            def __init__(self, target, args, daemon=None):
+                self.target, self.args = target, args
+
+            def start(self):
+                ayarlar.append(self.args[1])
+                self.target(*self.args)
+
+            def is_alive(self):
+                return False
+
+            def join(self):
+                pass
+
+        scheduler = BacktrackingScheduler(room_matching=True, symmetry_breaking=True, restart_base=50, trace_size=5)
+        with mock.patch('schedule.portfolio.multiprocessing.Process', AyniSurec):
+            self.assertTrue(sessiz(scheduler.generate_and_save, workers=2))
+        self.assertGecerliProgram()
+        self.assertEqual([a['strategy'] for a in ayarlar], ['mrv', 'chronological'])
+        for a in ayarlar:
+            self.assertTrue(a['room_matching'] and a['symmetry_breaking'])
+            self.assertEqual((a['restart_base'], a['trace_size']), (50, 5))
+
+    def test_decomposed_components_keep_search_options(self):
+        # Ayrı hocası olan başka bir bölümün dersi ikinci bir bileşen oluşturur
+        bolum = Bolum.objects.create(bolum_kodu='MAT', bolum_adi='Matematik')
+        hoca = OgretimUyesi.objects.create(user=User.objects.create(username='mat'), ad_soyad='Mat Hoca')
+        ders = Ders.objects.create(ders_kodu='MAT101', ders_adi='Analiz', bolum=bolum, sinif=1, haftalik_saat=3, donem=1)
+        ders.ogretim_uyeleri.set([hoca])
+        gorevler = []
+
+        class AyniHavuz:
+            """Bileşenleri havuz açmadan çalıştırır ve görevlerini kaydeder."""
+            def __init__(self, processes, initializer, initargs):
+                initializer(*initargs)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *hata):
+                return False
+
+            def imap_unordered(self, fonksiyon, isler):
+                for is_ in isler:
+                    gorevler.append(is_)
+                    yield fonksiyon(is_)
+
+        scheduler = BacktrackingScheduler(room_matching=True, symmetry_breaking=True, restarts=True, restart_base=50,
+                                          trace_size=5, trace_sample=2)
+        with mock.patch('schedule.decomposition.multiprocessing.Pool', AyniHavuz):
+            self.assertTrue(sessiz(scheduler.generate_and_save, decompose=True, workers=2))
+        self.assertGecerliProgram()
+        self.assertEqual(len(gorevler), 2)
+        for _, _, a in gorevler:
+            self.assertTrue(a['room_matching'] and a['symmetry_breaking'] and a['restarts'])
+            self.assertEqual((a['restart_base'], a['trace_size'], a['trace_sample']), (50, 5, 2))
+        self.assertGreater(scheduler.ret_izi.gorulen, 0)
+
+class PrecheckTests(ProgramVerisiMixin, TestCase):
+    def test_course_without_room_is_reported_once(self):
+        ders = Ders.objects.create(ders_kodu='BLM900', ders_adi='Kalabalık', bolum=self.bolum, sinif=1, haftalik_saat=4,
+                                   kontenjan=500, donem=1)
+        ders.ogretim_uyeleri.set([self.hocalar[1]])
+        scheduler = BacktrackingScheduler()
+        with mock.patch.object(BacktrackingScheduler, 'search') as search:
+            self.assertFalse(sessiz(scheduler.generate_and_save))
+        search.assert_not_called()
+        # İki bloğu olan ders tek darboğaz olarak raporlanır
+        self.assertEqual([darbogaz.ders_kodlari() for darbogaz in scheduler.darbogazlar], [['BLM900']])
+        self.assertEqual(scheduler.darbogazlar[0].ihtiyac, 2)
+        self.assertFalse(DersProgramiSlotu.objects.exists())
+
+class RepairTests(YerlesimMixin, ProgramVerisiMixin, TestCase):
+    def onar(self, scheduler):
+        """Onarım öncesi ve sonrası yerleşmeyen blok sayılarını döner."""
+        once = len(scheduler.problem.blok_map) - len(scheduler.program_state)
+        sessiz(ScheduleRepairer(scheduler, time_limit=0.5, seed=0).repair)
+        self.assertGecerliYerlesim(scheduler.problem, scheduler.program_state, tam=False)
+        self.assertEqual(len(scheduler.yerlesmeyen_dersler_rapor),
+                         len(scheduler.problem.blok_map) - len(scheduler.program_state))
+        return once, len(scheduler.yerlesmeyen_dersler_rapor)
+
+    def test_repair_completes_degraded_program(self):
+        sonuc, scheduler = ara(None, seed=0)
+        self.assertTrue(sonuc)
+        # Üç blok çıkarılır, bir blok da başka bir bloğun derslik/saatine taşınır (geçersiz yerleşim)
+        bloklar = sorted(scheduler.program_state)
+        for blok_id in bloklar[:3]:
+            del scheduler.program_state[blok_id]
+        gun, saat_tuple, derslik_id, _ = scheduler.program_state[bloklar[4]]
+        scheduler.program_state[bloklar[3]] = (gun, saat_tuple, derslik_id, scheduler.program_state[bloklar[3]][3])
+        self.assertEqual(self.onar(scheduler), (3, 0))
+        self.assertGecerliYerlesim(scheduler.problem, scheduler.program_state)
+
+    def test_repair_never_places_fewer_blocks(self):
+        # Çözümsüz sıkışık örnekler: bütçeli aramanın en iyi kısmi programı başlangıçtır
+        for tohum in (2, 33, 38):
+            with self.subTest(tohum=tohum):
+                _, scheduler = ara(sik_problem(tohum), seed=tohum, node_limit=300)
+                self.assertTrue(scheduler.kismi_cozum)
+                once, sonra = self.onar(scheduler)
+                self.assertLessEqual(sonra, once)
+
+class AyniSurec:
+    """multiprocessing.Process yerine hedefi ayrı süreç açmadan start() içinde çalıştırır."""
+    def __init__(self, target, args, daemon=None):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+    def is_alive(self):
+        return False
+
+    def join(self):
+        pass
+
+class SemesterTests(ProgramVerisiMixin, TestCase):
+    def bahara_al(self, ders):
+        ders.donem = 2
+        ders.save()
+
+    def test_stale_semester_rows_are_removed_only_with_new_program(self):
+        self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save))
+        ders = self.dersler[7]
+        eski = set(DersProgramiSlotu.objects.filter(ders=ders).values_list('id', 'semester'))
+        self.assertEqual({semester for _, semester in eski}, {semester_name(1)})
+        self.bahara_al(ders)
+
+        # Arama başarısız olursa eski dönemin satırları silinmez
+        with mock.patch('schedule.semesters.multiprocessing.Process', AyniSurec), \
+                mock.patch.object(BacktrackingScheduler, 'search', return_value=False):
+            self.assertFalse(sessiz(BacktrackingScheduler(precheck=False).generate_and_save))
+        self.assertEqual(set(DersProgramiSlotu.objects.filter(ders=ders).values_list('id', 'semester')), eski)
+
+        with mock.patch('schedule.semesters.multiprocessing.Process', AyniSurec):
+            self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save))
+        satirlar = DersProgramiSlotu.objects.filter(ders=ders)
+        self.assertEqual(set(satirlar.values_list('semester', flat=True)), {semester_name(2)})
+        self.assertEqual(sum(saat_farki(satir) for satir in satirlar), ders.haftalik_saat)
+
+    def test_parallel_semesters_report_combined_progress(self):
+        self.bahara_al(self.dersler[7])
+        olaylar = []
+        scheduler = BacktrackingScheduler(progress_callback=lambda olay, bilgi: olaylar.append((olay, bilgi)))
+        with mock.patch('schedule.semesters.multiprocessing.Process', AyniSurec):
+            self.assertTrue(sessiz(scheduler.generate_and_save))
+        # İlerleme tüm dönemlerin toplamıdır; sonuç yalnızca ana çözücüden bir kez gelir
+        blok_sayisi = sum(len(split_blocks(ders.haftalik_saat)) for ders in self.dersler)
+        self.assertEqual(max(bilgi['toplam'] for olay, bilgi in olaylar if olay == 'ilerleme'), blok_sayisi)
+        yukleme = [bilgi for olay, bilgi in olaylar if olay == 'yukleme']
+        self.assertEqual((yukleme[-1]['ders_sayisi'], yukleme[-1]['blok_sayisi']), (len(self.dersler), blok_sayisi))
+        self.assertEqual([olay for olay, _ in olaylar].count('sonuc'), 1)
+
+class WarmStartTests(ProgramVerisiMixin, TestCase):
+    def test_manual_row_keeps_course_fixed(self):
+        self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save))
+        ders = self.dersler[1]
+        manuel = DersProgramiSlotu.objects.filter(ders=ders).order_by('gun', 'baslangic_saati').first()
+        manuel.is_manually_adjusted = True
+        manuel.save()
+        eski = set(DersProgramiSlotu.objects.filter(ders=ders).values_list('id', flat=True))
+
+        self.assertTrue(sessiz(BacktrackingScheduler(warm_start=True).generate_and_save))
+        # Manuel satırı olan dersin tüm satırları yerinde kalır
+        self.assertEqual(set(DersProgramiSlotu.objects.filter(ders=ders).values_list('id', flat=True)), eski)
+        self.assertGecerliProgram()
+
+class IncrementalTests(ProgramVerisiMixin, TestCase):
+    def satirlar(self):
+        return {satir.id: satir.ders_id for satir in DersProgramiSlotu.objects.all()}
+
+    def test_reschedule_touches_only_affected_rows(self):
+        self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save))
+        onceki = self.satirlar()
+        # Değişiklik yoksa hiçbir satır yeniden yazılmaz
+        self.assertTrue(sessiz(BacktrackingScheduler().reschedule_and_save))
+        self.assertEqual(self.satirlar(), onceki)
+
+        # Bir satırın saatini kapatan yeni genel kısıt yalnızca o saatteki derslerin yerleşimini bozar
+        hedef = DersProgramiSlotu.objects.filter(ders=self.dersler[2]).first()
+        GlobalKisiti.objects.create(gun=hedef.gun, baslangic_saati=hedef.baslangic_saati,
+                                    bitis_saati=hedef.bitis_saati, aciklama='Toplantı')
+        etkilenen = set(DersProgramiSlotu.objects.filter(gun=hedef.gun, baslangic_saati=hedef.baslangic_saati)
+                        .values_list('ders_id', flat=True))
+        self.assertTrue(sessiz(BacktrackingScheduler().reschedule_and_save))
+        sonraki = self.satirlar()
+        degisen = {ders_id for satir_id, ders_id in onceki.items() if satir_id not in sonraki}
+        degisen |= {ders_id for satir_id, ders_id in sonraki.items() if satir_id not in onceki}
+        self.assertEqual(degisen, etkilenen)
+        self.assertGecerliProgram()
+
+    def test_reschedule_follows_changed_hours(self):
+        self.assertTrue(sessiz(BacktrackingScheduler().generate_and_save))
+        onceki = self.satirlar()
+        ders = self.dersler[1]
+        ders.haftalik_saat = 4
+        ders.save()
+        self.assertTrue(sessiz(BacktrackingScheduler().reschedule_and_save))
+        sonraki = self.satirlar()
+        self.assertEqual({d for i, d in onceki.items() if i not in sonraki}, {ders.id})
+        self.assertEqual({d for i, d in onceki.items() if i in sonraki}, {d.id for d in self.dersler} - {ders.id})
+        self.assertGecerliProgram()
+
+class JobTests(ProgramVerisiMixin, TestCase):
+    def test_claim_next_job_takes_oldest_waiting_job_once(self):
+        self.assertIsNone(claim_next_job())
+        calisan = GenerationJob.objects.create(durum='CALISIYOR')
+        ilk = enqueue_job(workers=1)
+        ikinci = enqueue_job(incremental=True)
+        alinan = claim_next_job()
+        self.assertEqual(alinan.id, ilk.id)
+        self.assertEqual(alinan.durum, 'CALISIYOR')
+        self.assertIsNotNone(alinan.baslangic)
+        self.assertEqual(claim_next_job().id, ikinci.id)
+        self.assertIsNone(claim_next_job())
+        calisan.refresh_from_db()
+        self.assertIsNone(calisan.baslangic)
+
+    def test_run_job_saves_program_and_status(self):
+        enqueue_job(time_limit=30)
+        job = claim_next_job()
+        self.assertEqual(sessiz(run_job, job), 'TAMAMLANDI')
+        job.refresh_from_db()
+        self.assertTrue(job.bitti)
+        self.assertEqual(job.yerlesen_ders, job.toplam_ders)
+        self.assertGreater(job.toplam_ders, 0)
+        self.assertEqual(job.yukleme_istatistikleri['ders_sayisi'], len(self.dersler))
+        durum = job_status(job)
+        self.assertEqual((durum['durum'], durum['bitti'], durum['butce_kalan_saniye']), ('TAMAMLANDI', True, None))
+        self.assertGecerliProgram()
+
+class JobEventTests(TestCase):
+    def test_stream_ends_after_lifetime(self):
+        job = GenerationJob.objects.create(durum='CALISIYOR', asama='arama', node_count=10)
+        olaylar = [olay for olay, _ in iter_job_events(job.id, aralik=0.01, omur=0.05)]
+        # Bitmemiş işin akışı sonuc olayı olmadan kapanır; yeniden bağlanan istemci durumu baştan alır
+        self.assertEqual(olaylar, ['asama', 'ilerleme'])
+
+    def test_stream_ends_with_result(self):
+        job = GenerationJob.objects.create(durum='TAMAMLANDI', mesaj='Bitti')
+        self.assertEqual([olay for olay, _ in iter_job_events(job.id, aralik=0.01)], ['asama', 'sonuc'])
+
+class JobEventViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.yonetici = User.objects.create(username='yonetici', is_staff=True)
+
+    def akis(self, job_id):
+        return self.client.get(reverse('schedule:generation_job_events', args=[job_id]))
+
+    def test_staff_only_and_missing_job(self):
+        job = GenerationJob.objects.create(durum='TAMAMLANDI')
+        self.assertEqual(self.akis(job.id).status_code, 302) # Yönetici girişine yönlendirilir
+        self.client.force_login(self.yonetici)
+        self.assertEqual(self.akis(job.id + 1).status_code, 404)
+
+    def test_finished_job_streams_result(self):
+        job = GenerationJob.objects.create(durum='TAMAMLANDI', mesaj='Bitti')
+        self.client.force_login(self.yonetici)
+        response = self.akis(job.id)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        olaylar = b''.join(response.streaming_content).decode().split('\n\n')
+        self.assertEqual(olaylar[0], f"retry: {int(ILERLEME_ARALIGI * 1000)}")
+        self.assertEqual([olay.split('\n')[0] for olay in olaylar[1:-1]], ['event: asama', 'event: sonuc'])
+        sonuc = json.loads(olaylar[2].split('\n')[1].removeprefix('data: '))
+        self.assertEqual((sonuc['durum'], sonuc['mesaj']), ('TAMAMLANDI', 'Bitti'))
+
+    def test_running_job_stream_closes_after_lifetime(self):
+        job = GenerationJob.objects.create(durum='CALISIYOR', asama='arama')
+        self.client.force_login(self.yonetici)
+        with mock.patch('schedule.views.AKIS_OMRU', 0.0):
+            icerik = b''.join(self.akis(job.id).streaming_content).decode()
+        self.assertIn('event: ilerleme', icerik)
+        self.assertNotIn('event: sonuc', icerik)
+
+class JobStatusTests(TestCase):
+    def test_budget_countdown_only_for_running_jobs_with_time_limit(self):
+        job = GenerationJob.objects.create(durum='CALISIYOR', ayarlar={'time_limit': 60},
+                                           baslangic=timezone.now() - datetime.timedelta(seconds=20))
+        self.assertAlmostEqual(job_status(job)['butce_kalan_saniye'], 40, delta=1)
+        job.ayarlar = {}
+        self.assertIsNone(job_status(job)['butce_kalan_saniye'])
+        job.ayarlar, job.durum = {'time_limit': 60}, 'TAMAMLANDI'
+        self.assertIsNone(job_status(job)['butce_kalan_saniye'])
+        job.durum, job.baslangic = 'CALISIYOR', timezone.now() - datetime.timedelta(seconds=90)
+        self.assertEqual(job_status(job)['butce_kalan_saniye'], 0.0)
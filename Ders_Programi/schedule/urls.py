@@ -8,6 +8,8 @@ urlpatterns = [
     path('export/excel/', views.export_schedule_excel, name='export_excel'),
     path('import/courses/', views.import_courses_view, name='import_courses'),
     path('generate/', views.trigger_schedule_generation, name='generate_schedule'),
+    path('generate/jobs/<int:job_id>/status/', views.generation_job_status, name='generation_job_status'), # İş durumu (JSON)
+    path('generate/jobs/<int:job_id>/events/', views.generation_job_events, name='generation_job_events'), # İlerleme akışı (SSE)
     path('update-slot-position/', views.update_slot_position, name='update_slot_position'), # AJAX için yeni URL
     # Diğer schedule URL'leri buraya eklenecek
 ] 
\ No newline at end of file
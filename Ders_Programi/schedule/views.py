@@ -1,9 +1,9 @@
 from django.shortcuts import render, redirect
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
-from .models import DersProgramiSlotu, Bolum, Ders, OgretimUyesi, Derslik
+from .models import DersProgramiSlotu, Bolum, Ders, OgretimUyesi, Derslik, GenerationJob
 import openpyxl
 from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
@@ -11,11 +11,12 @@ from collections import defaultdict
 import datetime
 import pandas as pd # Pandas'ı import edelim
 from django.db import IntegrityError
-from .scheduler import BacktrackingScheduler # Scheduler'ı import et
+from .jobs import AKIS_OMRU, ILERLEME_ARALIGI, enqueue_job, job_status, iter_job_events
 from django.core.management import call_command
 import logging
 import json
 from django.views.decorators.http import require_POST
+from django.conf import settings
 
 # Logger'ı modül seviyesinde tanımla
 logger = logging.getLogger(__name__)
@@ -392,27 +393,52 @@ def import_courses_view(request):
 @staff_member_required # Sadece admin/staff erişebilsin
 def trigger_schedule_generation(request):
     if request.method == 'POST': # Sadece POST isteğiyle tetiklensin
-        messages.info(request, "Ders programı oluşturma işlemi başlatıldı... Bu işlem uzun sürebilir.")
-        
+        # Arama isteği bekletmesin diye iş kuyruğa alınır; run_generation_jobs komutu çalıştırır
         try:
-            scheduler = BacktrackingScheduler()
-            success = scheduler.generate_and_save() # Algoritmayı çalıştır
-            
-            if success:
-                messages.success(request, "Ders programı başarıyla oluşturuldu ve kaydedildi!")
-            else:
-                messages.error(request, "Ders programı oluşturulamadı veya tamamlanamadı. Detaylar için sunucu loglarına bakın.")
-        except Exception as e:
-            messages.error(request, f"Program oluşturma sırasında beklenmedik bir hata oluştu: {e}")
-            
-        # İşlem bittikten sonra admin ana sayfasına veya slot listesine yönlendir
-        # Slot listesi daha mantıklı olabilir
-        return redirect(reverse('admin:schedule_dersprogramislotu_changelist')) 
+            workers = max(1, int(request.POST.get('workers', 1)))
+        except ValueError:
+            workers = 1
+        # Arama yine bir süre bütçesiyle çalıştırılır
+        time_limit = getattr(settings, 'SCHEDULE_GENERATION_TIME_LIMIT', None)
+        job = enqueue_job(workers=workers, time_limit=time_limit, incremental=bool(request.POST.get('incremental')))
+        messages.info(request, f"Ders programı oluşturma işi #{job.id} kuyruğa alındı. "
+                               f"İlerleme bu sayfada gösterilir (run_generation_jobs işçisi çalışıyor olmalı).")
+        return redirect(reverse('admin:schedule_dersprogramislotu_changelist'))
     else:
         # GET isteğiyle doğrudan gelinirse (veya POST değilse)
         # Belki bir onay sayfası gösterilebilir veya direkt ana sayfaya yönlendirilebilir
         return redirect(reverse('admin:index'))
 
+@staff_member_required
+def generation_job_status(request, job_id):
+    """Program oluşturma işinin durumunu JSON olarak döner (admin sayfası bunu yoklar)."""
+    try:
+        job = GenerationJob.objects.get(id=job_id)
+    except GenerationJob.DoesNotExist:
+        return JsonResponse({'error': 'İş bulunamadı.'}, status=404)
+    return JsonResponse(job_status(job))
+
+@staff_member_required
+def generation_job_events(request, job_id):
+    """Program oluşturma işinin ilerlemesini Server-Sent Events (text/event-stream) olarak yayınlar.
+
+    Akış iş bitince 'sonuc' olayıyla kapanır. Bağlantı açık kaldıkça bir sunucu iş parçacığını
+    meşgul ettiği için akış en fazla AKIS_OMRU saniye sürer; iş bitmemişse tarayıcının
+    EventSource'u retry süresi sonra yeniden bağlanır.
+    """
+    if not GenerationJob.objects.filter(id=job_id).exists():
+        return JsonResponse({'error': 'İş bulunamadı.'}, status=404)
+
+    def olay_akisi():
+        yield f"retry: {int(ILERLEME_ARALIGI * 1000)}\n\n"
+        for olay, veri in iter_job_events(job_id, omur=AKIS_OMRU):
+            yield f"event: {olay}\ndata: {json.dumps(veri, ensure_ascii=False)}\n\n"
+
+    response = StreamingHttpResponse(olay_akisi(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # nginx arkasında olayların tamponlanmaması için
+    return response
+
 @staff_member_required
 def view_schedule(request):
     # GET parametrelerinden filtreleri al
@@ -204,27 +204,33 @@ class DersProgramiOlusturucu:
         if not ogretim_elemani_bilgisi:
             return True  # Verisi yoksa müsait kabul et
         
+        # Bu fonksiyon her deneme için çağrılır: mesajlar yalnızca DEBUG açıksa biçimlenir
+        # (%-argümanlı logger çağrıları), INFO seviyesinde hiçbir şey yazılmaz.
         # Programda zaten varsa müsait değil (başka bir dersi var)
         if time_slot in ogretim_elemani_bilgisi['schedule'][day]:
-            logger.info(f"Öğretim üyesi {ogretim_elemani_bilgisi['name']} {day} günü {time_slot} saatinde başka bir ders veriyor.")
+            logger.debug("Öğretim üyesi %s %s günü %s saatinde başka bir ders veriyor.",
+                         ogretim_elemani_bilgisi['name'], day, time_slot)
             return False
         
         # Uygunluk bilgisi varsa kontrol et
-        if ogretim_elemani_bilgisi['availability']:
+        uygunluk = ogretim_elemani_bilgisi['availability']
+        if uygunluk:
             # Gün için uygunluk bilgisi yoksa, müsait kabul et
-            if day not in ogretim_elemani_bilgisi['availability']:
-                logger.info(f"Öğretim üyesi {ogretim_elemani_bilgisi['name']} için {day} günü uygunluk bilgisi yok, müsait kabul ediliyor.")
+            if day not in uygunluk:
+                logger.debug("Öğretim üyesi %s için %s günü uygunluk bilgisi yok, müsait kabul ediliyor.",
+                             ogretim_elemani_bilgisi['name'], day)
                 return True
             
             # Gün için uygunluk listesi boşsa (hiç müsait değil)
-            if not ogretim_elemani_bilgisi['availability'][day]:
-                logger.info(f"Öğretim üyesi {ogretim_elemani_bilgisi['name']} {day} günü hiç müsait değil.")
+            if not uygunluk[day]:
+                logger.debug("Öğretim üyesi %s %s günü hiç müsait değil.", ogretim_elemani_bilgisi['name'], day)
                 return False
             
             # Belirli saat dilimi için uygunluk kontrolü
-            musait_mi = time_slot in ogretim_elemani_bilgisi['availability'][day]
+            musait_mi = time_slot in uygunluk[day]
             if not musait_mi:
-                logger.info(f"Öğretim üyesi {ogretim_elemani_bilgisi['name']} {day} günü {time_slot} saatinde müsait değil.")
+                logger.debug("Öğretim üyesi %s %s günü %s saatinde müsait değil.",
+                             ogretim_elemani_bilgisi['name'], day, time_slot)
             
             return musait_mi
         